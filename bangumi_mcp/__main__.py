@@ -3,9 +3,22 @@
 
 import asyncio
 import argparse
-from bangumi_mcp.mcp_server import sse
-from bangumi_mcp.mcp_server import stdio
-from bangumi_mcp.mcp_server import streamableHTTP
+import os
+
+
+# Command line options that override the server's environment configuration.
+ENV_OPTIONS = {
+    "max_connections": "BANGUMI_HTTP_MAX_CONNECTIONS",
+    "max_keepalive_connections": "BANGUMI_HTTP_MAX_KEEPALIVE",
+    "keepalive_expiry": "BANGUMI_HTTP_KEEPALIVE_EXPIRY",
+    "connect_timeout": "BANGUMI_HTTP_CONNECT_TIMEOUT",
+    "read_timeout": "BANGUMI_HTTP_READ_TIMEOUT",
+    "pool_timeout": "BANGUMI_HTTP_POOL_TIMEOUT",
+    "http2": "BANGUMI_HTTP2",
+    "warmup": "BANGUMI_HTTP_WARMUP",
+    "compact_tools": "BANGUMI_COMPACT_TOOLS",
+}
+
 
 def main():
     """Main entry point for the Bangumi MCP server."""
@@ -13,7 +26,28 @@ def main():
     parser.add_argument('--host', default='localhost', help='Host to bind to')
     parser.add_argument('--port', type=int, default=18080, help='Port to listen on')
     parser.add_argument('--mode', choices=['stdio', 'sse', 'streamable_http'], default='stdio', help='Mode to run the server in')
+    parser.add_argument('--max-connections', type=int, help='Maximum number of connections to the Bangumi API')
+    parser.add_argument('--max-keepalive-connections', type=int, help='Maximum number of idle keep-alive connections')
+    parser.add_argument('--keepalive-expiry', type=float, help='Seconds an idle connection is kept alive')
+    parser.add_argument('--connect-timeout', type=float, help='Connect timeout in seconds')
+    parser.add_argument('--read-timeout', type=float, help='Read timeout in seconds')
+    parser.add_argument('--pool-timeout', type=float, help='Seconds to wait for a free connection from the pool')
+    parser.add_argument('--http2', action='store_true', default=None, help='Use HTTP/2 (requires the h2 package)')
+    parser.add_argument('--warmup', type=int, help='Number of connections opened at startup, 0 to disable')
+    parser.add_argument('--compact-tools', action='store_true', default=None, help='Serve tool schemas with shared $defs and without examples')
     args = parser.parse_args()
+
+    # The server and client read their configuration from the environment, so
+    # options are exported before the server is loaded.
+    for option, env in ENV_OPTIONS.items():
+        value = getattr(args, option)
+        if value is not None:
+            os.environ[env] = str(value)
+
+    from bangumi_mcp.mcp_server import sse
+    from bangumi_mcp.mcp_server import stdio
+    from bangumi_mcp.mcp_server import streamableHTTP
+
     if args.mode == 'stdio':
         asyncio.run(stdio())
     elif args.mode == 'sse':
@@ -24,4 +58,4 @@ def main():
         raise ValueError(f"Unknown mode: {args.mode}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,26 +1,282 @@
 """Bangumi API client for interacting with the Bangumi API."""
 
+import asyncio
+import hashlib
+import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 import httpx
 from dotenv import load_dotenv
 
+from bangumi_mcp import jsonlib, typed
+from bangumi_mcp.cache import CacheEntry, ResponseCache, SQLiteCache, make_key
+from bangumi_mcp.entities import EntityStore
+from bangumi_mcp.ratelimit import RateLimiter, parse_retry_after
+from bangumi_mcp.refresh import BackgroundRefresher
+from bangumi_mcp.retry import RETRYABLE_STATUS, CircuitBreaker, CircuitOpenError, RetryPolicy, remaining_time
+from bangumi_mcp.singleflight import SingleFlight
+from bangumi_mcp.ttl import AirStatusTTL
+from bangumi_mcp.utils import compile_fields, env_bool, env_float, env_int, loads_without_nulls, project
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fetches one page of a paged endpoint given its query parameters.
+PageFetcher = Callable[[Dict[str, Any]], Awaitable[tuple[int, Dict[str, Any]]]]
+
+# Fetches one entity given its ID.
+EntityFetcher = Callable[[Any], Awaitable[tuple[int, Any]]]
+
+# Dependency tag carried by every cached collection response.
+COLLECTIONS_TAG = "collections"
+
+
+def collection_tags(username: str, scope: str) -> tuple[str, ...]:
+    """Get the dependency tags of a collection response.
+
+    Usernames are case-insensitive upstream, so they are casefolded.
+
+    Args:
+        username: Owner of the collection, "-" for the current user's episode collections.
+        scope: Part of the collection, such as "subjects" for the list or "subject:12" for one entry.
+    Returns:
+        Tags of all collections, of the user's collections and of the scope.
+    """
+    owner = username.casefold()
+    return COLLECTIONS_TAG, f"collections:{owner}", f"collections:{owner}:{scope}"
+
+
+def auth_scoped(path: str) -> bool:
+    """Return whether the response of a GET request depends on the token sent with it.
+
+    The current user, and collections, whose private entries only their owner
+    sees, are answered differently for different tokens.
+    """
+    return path == "/v0/me" or (path.startswith("/v0/users/") and "/collections" in path)
+
+
+def error_detail(status_code: int, detail: Any) -> Dict[str, Any]:
+    """Describe an error response as an ErrorDetail.
+
+    Error bodies are usually ErrorDetail objects already, but some are empty or
+    shaped differently; those are described by their status code.
+
+    Args:
+        status_code: HTTP status code of the response.
+        detail: Decoded body of the response.
+    Returns:
+        The body if it is an ErrorDetail, otherwise an ErrorDetail wrapping it.
+    """
+    if isinstance(detail, dict) and isinstance(detail.get("title"), str) and isinstance(detail.get("description"), str):
+        return detail
+    result = {"title": httpx.codes.get_reason_phrase(status_code) or "Error", "description": f"HTTP {status_code}"}
+    if detail and isinstance(detail, (str, dict)):
+        result["details"] = detail
+    return result
+
+
+class BangumiAPIError(Exception):
+    """Raised when the Bangumi API answers with an error status where no status can be returned."""
+
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"Bangumi API returned {status_code}: {detail}")
+
 
 class BangumiClient:
     """Client for interacting with the Bangumi API."""
     
     BASE_URL = "https://api.bgm.tv"
+
+    # Sections of get_subject_full, in the order they are returned.
+    SUBJECT_SECTIONS = ("subject", "persons", "characters", "relations", "episodes")
+
+    # Default cache lifetime in seconds per endpoint family, 0 disables caching.
+    # Each value can be overridden with BANGUMI_CACHE_TTL_<FAMILY>.
+    CACHE_TTLS = {
+        "calendar": 3600,
+        "browse": 600,
+        "subject": 3600,
+        "episode": 3600,
+        "character": 86400,
+        "person": 86400,
+        "user": 600,
+        "collection": 60,
+    }
+
+    # Upstream statuses that are cached as failures: unknown IDs and invalid parameters.
+    NEGATIVE_CACHE_STATUS = frozenset({400, 404})
+
+    # Maximum number of episodes updated by one PATCH of episode collections.
+    EPISODE_BATCH_SIZE = 200
+
+    # Seconds an expired response is still served while it is refreshed in the
+    # background, per endpoint family. Overridden with BANGUMI_CACHE_SWR_<FAMILY>.
+    STALE_WHILE_REVALIDATE = {
+        "calendar": 3600,
+        "browse": 600,
+        "subject": 3600,
+    }
+
+    # Seconds an expired response is served when the API fails, per endpoint
+    # family. Overridden with BANGUMI_CACHE_STALE_IF_ERROR_<FAMILY>.
+    STALE_IF_ERROR = {
+        "calendar": 86400,
+        "browse": 3600,
+        "subject": 86400,
+    }
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        disk_cache: Optional[SQLiteCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        entity_store: Optional[EntityStore] = None,
+        ttl_policy: Optional[AirStatusTTL] = None,
+        negative_cache: Optional[ResponseCache] = None,
+    ):
         """Initialize the Bangumi client.
         
         Args:
             token: Bangumi API token. If not provided, will try to load from .env file.
+            cache: Response cache to use. If not provided, one is created from the
+                BANGUMI_CACHE_* environment variables.
+            cache_ttls: Per-family cache TTL overrides in seconds.
+            disk_cache: Persistent cache shared between processes, consulted after
+                the in-memory cache. If not provided, one is opened at the path given
+                by BANGUMI_CACHE_DB, if set.
+            rate_limiter: Limiter shared by all requests of this client. If not
+                provided, one is created from BANGUMI_RATE_LIMIT and
+                BANGUMI_RATE_BURST; a rate of 0 disables limiting.
+            retry_policy: Retry policy for idempotent requests. If not provided, one
+                is created from the BANGUMI_RETRY_* environment variables.
+            entity_store: Store of entities harvested from embedded objects. If not
+                provided, one is created unless BANGUMI_ENTITY_STORE is disabled.
+            ttl_policy: Policy deriving the lifetime of calendar, subject and episode
+                responses from their content. If not provided, one is created from
+                BANGUMI_CACHE_TTL_AIRING and BANGUMI_CACHE_TTL_FINISHED unless
+                BANGUMI_ADAPTIVE_TTL is disabled.
+            negative_cache: Cache of 400 and 404 responses, separate from the
+                response cache so that failures cannot evict successful responses.
+                If not provided, one is created from the BANGUMI_NEGATIVE_CACHE_*
+                environment variables.
         """
         load_dotenv()
         self.token = token or os.getenv("BANGUMI_API_TOKEN")
         if not self.token:
             self.token = None
+        # Cache keys of responses that depend on the token carry its fingerprint,
+        # so processes with different tokens sharing BANGUMI_CACHE_DB keep them apart.
+        self.token_fingerprint = hashlib.sha256(self.token.encode()).hexdigest()[:16] if self.token else None
+
+        self.cache_ttls = {
+            family: env_float(f"BANGUMI_CACHE_TTL_{family.upper()}", ttl)
+            for family, ttl in self.CACHE_TTLS.items()
+        }
+        if cache_ttls:
+            self.cache_ttls.update(cache_ttls)
+        self.stale_while_revalidate = {
+            family: env_float(f"BANGUMI_CACHE_SWR_{family.upper()}", window)
+            for family, window in self.STALE_WHILE_REVALIDATE.items()
+        }
+        self.stale_if_error = {
+            family: env_float(f"BANGUMI_CACHE_STALE_IF_ERROR_{family.upper()}", window)
+            for family, window in self.STALE_IF_ERROR.items()
+        }
+        self.refresher = BackgroundRefresher(
+            max_workers=env_int("BANGUMI_REFRESH_WORKERS", 2),
+            max_pending=env_int("BANGUMI_REFRESH_QUEUE", 64),
+        )
+        self.stale_served = {"while_revalidating": 0, "on_error": 0}
+        # Invalidation count per dependency tag, so that a read that started
+        # before a write neither caches nor shares its outdated response.
+        self.tag_versions: Dict[str, int] = {}
+        self._username: Optional[str] = None
+        if ttl_policy is None and env_bool("BANGUMI_ADAPTIVE_TTL", True):
+            ttl_policy = AirStatusTTL(
+                airing_ttl=env_float("BANGUMI_CACHE_TTL_AIRING", 3600),
+                finished_ttl=env_float("BANGUMI_CACHE_TTL_FINISHED", 7 * 86400),
+            )
+        self.ttl_policy = ttl_policy
+        if cache is None and env_bool("BANGUMI_CACHE", True):
+            cache = ResponseCache(
+                max_entries=env_int("BANGUMI_CACHE_MAX_ENTRIES", 2048),
+                max_bytes=env_int("BANGUMI_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+            )
+        self.cache = cache
+        if negative_cache is None and env_bool("BANGUMI_NEGATIVE_CACHE", True):
+            negative_cache = ResponseCache(
+                max_entries=env_int("BANGUMI_NEGATIVE_CACHE_MAX_ENTRIES", 1024),
+                max_bytes=env_int("BANGUMI_NEGATIVE_CACHE_MAX_BYTES", 1024 * 1024),
+            )
+        self.negative_cache = negative_cache
+        self.negative_ttl = env_float("BANGUMI_NEGATIVE_CACHE_TTL", 120)
+        if entity_store is None and env_bool("BANGUMI_ENTITY_STORE", True):
+            entity_store = EntityStore(max_entries=env_int("BANGUMI_ENTITY_STORE_MAX_ENTRIES", 10000))
+        self.entities = entity_store
+
+        cache_db = os.getenv("BANGUMI_CACHE_DB")
+        if disk_cache is None and cache_db:
+            try:
+                disk_cache = SQLiteCache(cache_db)
+            except Exception as e:
+                logger.warning(f"Failed to open cache database {cache_db}: {e}")
+        self.disk_cache = disk_cache
+        # Conditional request counters per endpoint family.
+        self.revalidations: Dict[str, Dict[str, float]] = {}
+        self.inflight = SingleFlight()
+
+        rate = env_float("BANGUMI_RATE_LIMIT", 5.0)
+        if rate_limiter is None and rate > 0:
+            rate_limiter = RateLimiter(rate=rate, burst=env_int("BANGUMI_RATE_BURST", 10))
+        self.rate_limiter = rate_limiter
+        self.max_throttle_retries = env_int("BANGUMI_RATE_LIMIT_RETRIES", 3)
+
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=env_int("BANGUMI_RETRY_ATTEMPTS", 3),
+            base_delay=env_float("BANGUMI_RETRY_BASE_DELAY", 0.2),
+            max_delay=env_float("BANGUMI_RETRY_MAX_DELAY", 5.0),
+            deadline=env_float("BANGUMI_RETRY_DEADLINE", 20.0),
+        )
+        self.breaker_threshold = env_int("BANGUMI_BREAKER_THRESHOLD", 5)
+        self.breaker_recovery = env_float("BANGUMI_BREAKER_RECOVERY", 30.0)
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+        limits = httpx.Limits(
+            max_connections=env_int("BANGUMI_HTTP_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=env_int("BANGUMI_HTTP_MAX_KEEPALIVE", 20),
+            keepalive_expiry=env_float("BANGUMI_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        )
+        timeout = httpx.Timeout(
+            connect=env_float("BANGUMI_HTTP_CONNECT_TIMEOUT", 5.0),
+            read=env_float("BANGUMI_HTTP_READ_TIMEOUT", 15.0),
+            write=env_float("BANGUMI_HTTP_WRITE_TIMEOUT", 10.0),
+            pool=env_float("BANGUMI_HTTP_POOL_TIMEOUT", 10.0),
+        )
+        http2 = env_bool("BANGUMI_HTTP2", False)
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+        self.warmup_connections = env_int("BANGUMI_HTTP_WARMUP", 2)
+        self.prefetch_pages = env_int("BANGUMI_PREFETCH_PAGES", 2)
+        self.batch_concurrency = env_int("BANGUMI_BATCH_CONCURRENCY", 8)
+        typed_decode = env_bool("BANGUMI_TYPED_DECODE", False)
+        if typed_decode and not typed.available():
+            logger.warning("Typed decoding requested but the msgspec package is not installed")
+            typed_decode = False
+        self.typed_decode = typed_decode
+        self.typed_fallbacks = 0
         
         self.client = httpx.AsyncClient(
             base_url=self.BASE_URL,
@@ -29,12 +285,49 @@ class BangumiClient:
                 "User-Agent": "https://github.com/etherwindy/Bangumi-MCP",
                 "Content-Type": "application/json",
                 "accept": "*/*",
-            }
+            },
+            limits=limits,
+            timeout=timeout,
+            http2=http2,
         )
     
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Cancel background refreshes and close the HTTP client."""
+        await self.refresher.close()
         await self.client.aclose()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+    
+    async def warm_up(self, connections: Optional[int] = None) -> int:
+        """Open connections to the API ahead of the first request.
+
+        Sends concurrent HEAD requests so that DNS lookup, TCP connect and TLS
+        handshake are done before the first tool call. With HTTP/2 a single
+        connection is opened, since requests are multiplexed over it.
+
+        Args:
+            connections: Number of connections to open. Defaults to
+                BANGUMI_HTTP_WARMUP.
+        Returns:
+            Number of connections that were opened successfully.
+        """
+        if connections is None:
+            connections = self.warmup_connections
+        if connections <= 0:
+            return 0
+        if self.http2:
+            connections = 1
+
+        async def probe() -> bool:
+            try:
+                await self.client.head("/")
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"Connection warm-up failed: {type(e).__name__}: {e}")
+                return False
+
+        results = await asyncio.gather(*(probe() for _ in range(connections)))
+        return sum(results)
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -44,50 +337,733 @@ class BangumiClient:
         """Async context manager exit."""
         await self.close()
 
+    def stats(self) -> Dict[str, Any]:
+        """Get runtime counters of the client.
+
+        Returns:
+            Dictionary of counters, keyed by component.
+        """
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "negative_cache": self.negative_cache.stats() if self.negative_cache is not None else None,
+            "disk_cache": self.disk_cache.stats() if self.disk_cache is not None else None,
+            "entities": self.entities.stats() if self.entities is not None else None,
+            "revalidation": {family: dict(counters) for family, counters in self.revalidations.items()},
+            "stale": {**self.stale_served, "refresh": self.refresher.stats()},
+            "adaptive_ttl": self.ttl_policy.stats() if self.ttl_policy is not None else None,
+            "inflight": self.inflight.stats(),
+            "rate_limiter": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+            "breakers": {host: breaker.stats() for host, breaker in self.breakers.items()},
+            "typed_decode": {"enabled": self.typed_decode, "fallbacks": self.typed_fallbacks},
+        }
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        """Get the circuit breaker of the host a request goes to."""
+        host = httpx.URL(url).host or self.client.base_url.host
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self.breaker_threshold, self.breaker_recovery)
+            self.breakers[host] = breaker
+        return breaker
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request through the circuit breaker, rate limiter and retry policy.
+
+        A 429 response means the request was rejected without being processed, so
+        it is queued again after the delay given by Retry-After, up to
+        max_throttle_retries times, unless the delay does not fit in the
+        deadline, in which case the 429 response is returned at once. Transient failures (transport errors and 5xx
+        responses) are retried with backoff only for idempotent requests, within
+        the policy's deadline. Writes are never retried, since the server may
+        already have applied them.
+
+        Args:
+            method: HTTP method.
+            url: Request path.
+            idempotent: Whether the request may be retried. Defaults to True for GET
+                and HEAD.
+            **kwargs: Extra arguments passed to httpx.AsyncClient.request.
+        Returns:
+            The HTTP response.
+        Raises:
+            CircuitOpenError: If the upstream host is considered down.
+            httpx.TransportError: If the request failed and could not be retried.
+        """
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        policy = self.retry_policy
+        breaker = self._breaker(url)
+        started = time.monotonic()
+        attempt = 0
+        throttled = 0
+        while True:
+            breaker.before_request()
+            if self.rate_limiter is not None:
+                try:
+                    await self.rate_limiter.acquire()
+                except BaseException:
+                    # A probe cancelled while queued must give its slot back.
+                    breaker.abandon()
+                    raise
+            attempt += 1
+            timeout = remaining_time(started, policy.deadline) if idempotent and policy.deadline else None
+            if timeout is not None and timeout <= 0:
+                # The deadline ran out here, not at the host, so the breaker does not count it.
+                breaker.abandon()
+                raise httpx.TimeoutException(f"Deadline of {policy.deadline}s exceeded for {method} {url}")
+            try:
+                if timeout is not None:
+                    response = await asyncio.wait_for(self.client.request(method, url, **kwargs), timeout)
+                else:
+                    response = await self.client.request(method, url, **kwargs)
+            except asyncio.TimeoutError:
+                breaker.abandon()
+                raise httpx.TimeoutException(f"Deadline of {policy.deadline}s exceeded for {method} {url}")
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                error = e
+                if not idempotent or attempt >= policy.max_attempts:
+                    raise error
+                response = None
+                failure = f"{type(error).__name__}: {error}"
+            except BaseException:
+                breaker.abandon()
+                raise
+            else:
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    breaker.record_success()
+                    delay = self.rate_limiter.on_throttled(parse_retry_after(response.headers.get("Retry-After")))
+                    if throttled >= self.max_throttle_retries:
+                        return response
+                    if timeout is not None and delay >= remaining_time(started, policy.deadline):
+                        # Waiting would use up the deadline before the request is sent again.
+                        logger.warning(f"Throttled on {method} {url} for {delay:.1f}s, beyond the deadline")
+                        return response
+                    throttled += 1
+                    attempt -= 1
+                    logger.warning(f"Throttled on {method} {url}, retrying in {delay:.1f}s")
+                    continue
+                if response.status_code not in RETRYABLE_STATUS:
+                    breaker.record_success()
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.on_success()
+                    return response
+                breaker.record_failure()
+                if not idempotent or attempt >= policy.max_attempts:
+                    return response
+                failure = f"HTTP {response.status_code}"
+
+            delay = policy.backoff(attempt)
+            if delay >= remaining_time(started, policy.deadline):
+                logger.warning(f"Giving up on {method} {url} after {attempt} attempts: {failure}")
+                if response is None:
+                    raise error
+                return response
+            logger.warning(f"{method} {url} failed ({failure}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _decode(self, response: httpx.Response, model: Optional[str] = None) -> Any:
+        """Decode a JSON response body without null items, treating an empty body as an empty object.
+
+        Args:
+            response: Response to decode.
+            model: Name of the model in bangumi_mcp.models that a successful
+                response is decoded into when typed decoding is enabled.
+        Returns:
+            Decoded body.
+        """
+        if response.content == b'':
+            return {}
+        if model is not None and response.status_code == 200:
+            return self._loads(response.content, model)
+        return loads_without_nulls(response.content)
+
+    def _loads(self, body: bytes, model: Optional[str]) -> Any:
+        """Decode a successful response body, typed if enabled and possible."""
+        if model is not None and self.typed_decode:
+            try:
+                return typed.loads_typed(body, model)
+            except ValueError as e:
+                # The API sent something dist.json does not describe, keep the response as is.
+                self.typed_fallbacks += 1
+                logger.debug(f"Typed decoding as {model} failed: {e}")
+        return loads_without_nulls(body)
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        family: Optional[str] = None,
+        model: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        paged: bool = False,
+        embeds: Optional[str] = None,
+        entity: Optional[tuple[str, Any]] = None,
+        tags: tuple[str, ...] = (),
+    ) -> tuple[int, Any]:
+        """Send a GET request, serving it from the cache when possible.
+
+        Lookups go to the in-memory cache first and then to the persistent cache,
+        whose hits are promoted into memory for their remaining lifetime. Only
+        successful responses are cached, for the TTL configured for the endpoint
+        family; 400 and 404 responses are kept in the negative cache for a
+        shorter TTL, so that a guessed ID costs one upstream request per window.
+        Expired responses with an ETag or Last-Modified are revalidated
+        with a conditional request instead of being downloaded again, see _load.
+        Concurrent misses for the same request share a single upstream call.
+
+        In families with a stale-while-revalidate window, a response that expired
+        less than that window ago is returned at once and refreshed in the
+        background. Within the stale-if-error window, an expired response is
+        returned when the API fails.
+
+        Args:
+            path: Request path.
+            params: Query parameters.
+            family: Endpoint family used to pick the cache TTL. None disables caching.
+            model: Name of the model in bangumi_mcp.models the response is decoded
+                into when typed decoding is enabled.
+            fields: Fields to keep in a successful response, see _project. The
+                projected response is cached under its own key.
+            paged: Whether the response is a page, whose items the fields apply to.
+            embeds: Name of the objects embedded in the response that are harvested
+                into the entity store, a key of entities.EMBEDS.
+            entity: Type and ID of the entity the response describes. Projected
+                requests for it are answered from the entity store when possible.
+            tags: Dependency tags of the response, which writes invalidate, see
+                _invalidate.
+        Returns:
+            Status code and decoded JSON body, with null items removed.
+        """
+        ttl = self.cache_ttls.get(family, 0) if family else 0
+        key = self._cache_key(path, params)
+        if fields:
+            return await self._get_projected(key, path, params, family, model, fields, paged, ttl, entity, tags)
+        stale = None
+        if self.cache is not None and ttl > 0:
+            cached = self.cache.get(key, family)
+            if cached is not None:
+                return cached
+            stale = self.cache.peek(key)
+        if self.negative_cache is not None and ttl > 0:
+            failed = self.negative_cache.get(key, family)
+            if failed is not None:
+                return failed
+
+        versions = tuple(self.tag_versions.get(tag, 0) for tag in tags)
+        flight = f"{key}@{versions}" if any(versions) else key
+
+        def load() -> Awaitable[tuple[int, Any]]:
+            return self.inflight.do(flight, lambda: self._load(key, path, params, family, ttl, model, embeds, tags))
+
+        if stale is not None and stale.staleness() < self.stale_while_revalidate.get(family, 0):
+            self.refresher.submit(key, load)
+            self.stale_served["while_revalidating"] += 1
+            return stale.value
+        try:
+            result = await load()
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            if not self._serve_stale_on_error(stale, family, path, f"{type(e).__name__}: {e}"):
+                raise
+            return stale.value
+        if result[0] == 429 or result[0] in RETRYABLE_STATUS:
+            if self._serve_stale_on_error(stale, family, path, f"HTTP {result[0]}"):
+                return stale.value
+        return result
+
+    def _cache_key(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Get the cache key of a GET request, scoped to the token if the response depends on it."""
+        key = make_key("GET", path, params)
+        if self.token_fingerprint is not None and auth_scoped(path):
+            key = f"{key}@token={self.token_fingerprint}"
+        return key
+
+    def _serve_stale_on_error(self, stale: Optional[CacheEntry], family: Optional[str], path: str, failure: str) -> bool:
+        """Decide whether an expired response is served in place of a failed request."""
+        if stale is None or stale.staleness() >= self.stale_if_error.get(family, 0):
+            return False
+        self.stale_served["on_error"] += 1
+        logger.warning(f"GET {path} failed ({failure}), serving a response expired {stale.staleness():.0f}s ago")
+        return True
+
+    def _keep_stale(self, family: Optional[str]) -> float:
+        """Seconds an expired response of a family is kept to be served stale."""
+        return max(self.stale_while_revalidate.get(family, 0), self.stale_if_error.get(family, 0))
+
+    async def _get_projected(
+        self,
+        key: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        family: Optional[str],
+        model: Optional[str],
+        fields: List[str],
+        paged: bool,
+        ttl: float,
+        entity: Optional[tuple[str, Any]] = None,
+        tags: tuple[str, ...] = (),
+    ) -> tuple[int, Any]:
+        """Serve a GET request trimmed to some fields, from the caches when possible.
+
+        A record of the entity harvested from other responses answers the request
+        if it covers the fields. Otherwise the projection is built from the full
+        response, which is cached as usual, and kept no longer than the full response.
+        """
+        projected_key = f"{key}#fields={','.join(sorted(set(fields)))}"
+        if self.cache is not None and ttl > 0:
+            cached = self.cache.get(projected_key, family)
+            if cached is not None:
+                return cached
+        # A cached full response is at least as fresh and complete as a harvested record.
+        full_cached = self.cache is not None and key in self.cache
+        if entity is not None and self.entities is not None and not full_cached:
+            known = self.entities.get(*entity, fields)
+            if known is not None:
+                return 200, known
+
+        status_code, data = await self._get(path, params, family, model, tags=tags)
+        if status_code != 200:
+            return status_code, data
+        result = (status_code, self._project(data, fields, paged))
+        if self.cache is not None and ttl > 0:
+            remaining = self.cache.remaining(key)
+            if remaining > 0:
+                size = len(jsonlib.dumps(result[1]))
+                self.cache.set(projected_key, result, min(ttl, remaining), size, family, tags=tags)
+        return result
+
+    @staticmethod
+    def _project(data: Any, fields: List[str], paged: bool = False) -> Any:
+        """Trim a response to some fields.
+
+        Args:
+            data: Decoded response.
+            fields: Dotted field paths to keep, such as "rating.score".
+            paged: Whether data is a page, whose items the fields apply to.
+        Returns:
+            Projected response, sharing the kept values with data.
+        """
+        tree = compile_fields(fields)
+        if paged and isinstance(data, dict) and isinstance(data.get("data"), list):
+            return {**data, "data": project(data["data"], tree)}
+        return project(data, tree)
+
+    async def _load(
+        self,
+        key: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        family: Optional[str],
+        ttl: float,
+        model: Optional[str] = None,
+        embeds: Optional[str] = None,
+        tags: tuple[str, ...] = (),
+    ) -> tuple[int, Any]:
+        """Load a GET response from the persistent cache or upstream, cache it and harvest its embedded objects.
+
+        An expired copy with validators, from memory or from the persistent cache,
+        is revalidated with a conditional request. A 304 answer extends its
+        lifetime without transferring or decoding the body again. A response is
+        not cached if one of its tags was invalidated while it was loading.
+        """
+        versions = tuple(self.tag_versions.get(tag, 0) for tag in tags)
+        stale = self.cache.peek(key) if self.cache is not None and ttl > 0 else None
+        if stale is not None and not stale.revalidatable:
+            stale = None
+        stale_row = None
+        if self.disk_cache is not None and ttl > 0:
+            try:
+                row = await asyncio.to_thread(self.disk_cache.get, key, stale is None)
+            except Exception as e:
+                logger.warning(f"Cache database read failed: {e}")
+                row = None
+            if row is not None:
+                status_code, body, etag, last_modified, remaining = row
+                if remaining > 0:
+                    started = time.perf_counter()
+                    result = (status_code, self._loads(body, model) if status_code == 200 else loads_without_nulls(body))
+                    lifetime = min(self._adaptive_ttl(family, model, params, result, ttl), remaining)
+                    if self.cache is not None:
+                        self.cache.set(
+                            key, result, lifetime, len(body), family, etag, last_modified,
+                            time.perf_counter() - started, self._keep_stale(family), tags,
+                        )
+                    self._harvest(embeds, result)
+                    return result
+                if etag is not None or last_modified is not None:
+                    stale_row = row
+
+        headers = {}
+        if stale is not None:
+            etag, last_modified = stale.etag, stale.last_modified
+        elif stale_row is not None:
+            etag, last_modified = stale_row[2], stale_row[3]
+        else:
+            etag = last_modified = None
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        if headers:
+            self._revalidation_stats(family)["requests"] += 1
+
+        response = await self._send("GET", path, params=params, headers=headers or None)
+        if response.status_code == 304 and headers:
+            return await self._revalidated(key, params, family, ttl, model, embeds, stale, stale_row, tags, versions)
+
+        started = time.perf_counter()
+        result = (response.status_code, self._decode(response, model))
+        decode_time = time.perf_counter() - started
+        outdated = versions != tuple(self.tag_versions.get(tag, 0) for tag in tags)
+        if response.status_code == 200 and ttl > 0 and not outdated:
+            ttl = self._adaptive_ttl(family, model, params, result, ttl)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if self.cache is not None:
+                self.cache.set(
+                    key, result, ttl, len(response.content), family, etag, last_modified, decode_time,
+                    self._keep_stale(family), tags,
+                )
+            if self.disk_cache is not None:
+                try:
+                    await asyncio.to_thread(
+                        self.disk_cache.set, key, response.status_code, response.content, ttl, etag, last_modified,
+                        tags,
+                    )
+                except Exception as e:
+                    logger.warning(f"Cache database write failed: {e}")
+        elif response.status_code in self.NEGATIVE_CACHE_STATUS and ttl > 0 and not outdated:
+            if self.negative_cache is not None:
+                lifetime = min(ttl, self.negative_ttl)
+                self.negative_cache.set(key, result, lifetime, len(response.content), family, tags=tags)
+        self._harvest(embeds, result)
+        return result
+
+    async def _revalidated(
+        self,
+        key: str,
+        params: Optional[Dict[str, Any]],
+        family: Optional[str],
+        ttl: float,
+        model: Optional[str],
+        embeds: Optional[str],
+        stale: Optional[CacheEntry],
+        stale_row: Optional[tuple],
+        tags: tuple[str, ...] = (),
+        versions: tuple[int, ...] = (),
+    ) -> tuple[int, Any]:
+        """Serve a response confirmed unchanged by a 304 and extend its lifetime in both caches.
+
+        The lifetime is not extended if one of the tags was invalidated while the
+        conditional request was in flight, since the copy predates the write.
+
+        Args:
+            key: Cache key.
+            params: Query parameters of the request.
+            family: Endpoint family.
+            ttl: Lifetime configured for the endpoint family, see _adaptive_ttl.
+            model: Name of the model the body is decoded into, see _get.
+            embeds: Name of the objects embedded in the response, see _get.
+            stale: Expired in-memory entry that was revalidated, if any.
+            stale_row: Expired persistent cache row that was revalidated, used
+                when there is no in-memory entry.
+            tags: Dependency tags of the response.
+            versions: Versions of the tags when the request started.
+        Returns:
+            Status code and decoded body of the cached response.
+        """
+        counters = self._revalidation_stats(family)
+        counters["not_modified"] += 1
+        outdated = versions != tuple(self.tag_versions.get(tag, 0) for tag in tags)
+        if stale is not None:
+            result = stale.value
+            counters["bytes_saved"] += stale.size
+            counters["decode_time_saved"] += stale.decode_time
+            ttl = self._adaptive_ttl(family, model, params, result, ttl)
+            if not outdated:
+                self.cache.refresh(key, ttl)
+        else:
+            status_code, body, etag, last_modified, _ = stale_row
+            started = time.perf_counter()
+            result = (status_code, self._loads(body, model))
+            counters["bytes_saved"] += len(body)
+            ttl = self._adaptive_ttl(family, model, params, result, ttl)
+            if self.cache is not None and not outdated:
+                self.cache.set(
+                    key, result, ttl, len(body), family, etag, last_modified, time.perf_counter() - started,
+                    self._keep_stale(family), tags,
+                )
+        if self.disk_cache is not None and not outdated:
+            try:
+                await asyncio.to_thread(self.disk_cache.refresh, key, ttl)
+            except Exception as e:
+                logger.warning(f"Cache database write failed: {e}")
+        self._harvest(embeds, result)
+        return result
+
+    def _adaptive_ttl(
+        self,
+        family: Optional[str],
+        model: Optional[str],
+        params: Optional[Dict[str, Any]],
+        result: tuple[int, Any],
+        ttl: float,
+    ) -> float:
+        """Get the lifetime of a response from its content.
+
+        The calendar lives until the next midnight in Japan and also tells which
+        subjects are on air. Subjects and pages of episodes get a long lifetime
+        once finished and a short one while airing, see ttl.AirStatusTTL.
+
+        Args:
+            family: Endpoint family.
+            model: Name of the model of the response, which identifies subjects
+                and pages of episodes.
+            params: Query parameters of the request.
+            result: Status code and decoded body.
+            ttl: Lifetime configured for the endpoint family.
+        Returns:
+            Lifetime in seconds.
+        """
+        if self.ttl_policy is None or result[0] != 200:
+            return ttl
+        if family == "calendar":
+            self.ttl_policy.on_calendar(result[1])
+            return self.ttl_policy.calendar_ttl(ttl)
+        if model == "Subject":
+            return self.ttl_policy.subject_ttl(result[1], ttl)
+        if model == "Paged_Episode":
+            subject_id = (params or {}).get("subject_id")
+            subject = None
+            if self.cache is not None and subject_id is not None:
+                entry = self.cache.peek(make_key("GET", f"/v0/subjects/{subject_id}"))
+                if entry is not None and entry.value[0] == 200:
+                    subject = entry.value[1]
+            return self.ttl_policy.episodes_ttl(result[1], ttl, subject_id, subject)
+        return ttl
+
+    def _revalidation_stats(self, family: Optional[str]) -> Dict[str, float]:
+        """Get the revalidation counters of an endpoint family."""
+        counters = self.revalidations.get(family or "other")
+        if counters is None:
+            counters = {"requests": 0, "not_modified": 0, "bytes_saved": 0, "decode_time_saved": 0.0}
+            self.revalidations[family or "other"] = counters
+        return counters
+
+    def _harvest(self, embeds: Optional[str], result: tuple[int, Any]) -> None:
+        """Harvest the embedded objects of a successful response into the entity store."""
+        if embeds is not None and self.entities is not None and result[0] == 200:
+            self.entities.harvest_response(embeds, result[1], self.cache_ttls)
+
+    async def _invalidate(self, tags: List[str]) -> None:
+        """Drop the cached responses carrying any of the tags, in memory and on disk.
+
+        Other server processes sharing the persistent cache keep their in-memory
+        copies until they expire.
+        """
+        for tag in tags:
+            self.tag_versions[tag] = self.tag_versions.get(tag, 0) + 1
+        if self.cache is not None:
+            self.cache.invalidate(tags)
+        if self.negative_cache is not None:
+            self.negative_cache.invalidate(tags)
+        if self.disk_cache is not None:
+            try:
+                await asyncio.to_thread(self.disk_cache.invalidate, tags)
+            except Exception as e:
+                logger.warning(f"Cache database write failed: {e}")
+
+    async def _send_write(self, method: str, path: str, tags: List[str], **kwargs: Any) -> httpx.Response:
+        """Send a write request and invalidate the responses depending on it, even if it failed.
+
+        A failed write may still have been applied, so the invalidation does not
+        depend on the outcome.
+
+        Args:
+            method: HTTP method.
+            path: Request path.
+            tags: Dependency tags of the cached responses the write affects.
+            **kwargs: Extra arguments passed to _send.
+        Returns:
+            The HTTP response.
+        """
+        try:
+            return await self._send(method, path, **kwargs)
+        finally:
+            await self._invalidate(tags)
+
+    async def _my_username(self) -> Optional[str]:
+        """Get the casefolded username of the token's owner, looked up once, or None if unknown."""
+        if self._username is None:
+            try:
+                status_code, me = await self.get_me_info()
+            except (httpx.HTTPError, CircuitOpenError):
+                return None
+            if status_code == 200 and isinstance(me, dict):
+                self._username = (me.get("username") or "").casefold() or None
+        return self._username
+
+    async def _my_collection_tags(self, *scopes: str) -> List[str]:
+        """Get the tags of scopes of the current user's collections, or the tag of all if the user is unknown."""
+        username = await self._my_username()
+        if username is None:
+            return [COLLECTIONS_TAG]
+        return [f"collections:{username}:{scope}" for scope in scopes]
+
+    async def _subject_collection_tags(self, subject_id: Any, episode_ids: Iterable[Any] = ()) -> List[str]:
+        """Get the tags a write to the collection of a subject, and some of its episodes, affects.
+
+        The subject's entry and the collection list change with its status or
+        progress, and so do its episode collections.
+        """
+        tags = await self._my_collection_tags("subjects", f"subject:{subject_id}")
+        tags.append(f"collections:-:episodes:{subject_id}")
+        tags.extend(f"collections:-:episode:{episode_id}" for episode_id in episode_ids)
+        return tags
+
+    async def _episode_collection_tags(self, episode_id: Any) -> List[str]:
+        """Get the tags a write to the collection of an episode affects.
+
+        The subject of the episode is looked up, usually in the cache. If it is
+        unknown, all collections of the current user are invalidated.
+        """
+        try:
+            status_code, episode = await self.get_episode_info(episode_id)
+        except (httpx.HTTPError, CircuitOpenError):
+            status_code, episode = None, None
+        subject_id = episode.get("subject_id") if status_code == 200 and isinstance(episode, dict) else None
+        if subject_id is None:
+            username = await self._my_username()
+            tags = [COLLECTIONS_TAG] if username is None else [f"collections:{username}"]
+            return tags + ["collections:-"]
+        return await self._subject_collection_tags(subject_id, [episode_id])
+
+    async def _search(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        fields: Optional[List[str]] = None,
+    ) -> tuple[int, Dict[str, Any]]:
+        """Send a search request.
+
+        The search endpoints take the keyword and filters as JSON body, and the
+        paging parameters limit and offset as query parameters.
+
+        Args:
+            path: Search endpoint path.
+            params: Search parameters including paging parameters.
+            fields: Fields to keep in each result, see _project.
+        Returns:
+            Status code and search results.
+        """
+        body = dict(params or {})
+        query = {name: body.pop(name) for name in ("limit", "offset") if body.get(name) is not None}
+        response = await self._send("POST", path, idempotent=True, params=query, json=body)
+
+        data = self._decode(response)
+        if fields and response.status_code == 200:
+            data = self._project(data, fields, paged=True)
+        return response.status_code, data
+
+    async def _get_many(
+        self,
+        fetch: EntityFetcher,
+        ids: List[Any],
+        concurrency: Optional[int] = None,
+    ) -> List[tuple[Any, Optional[int], Any]]:
+        """Fetch several entities concurrently.
+
+        Requests run under a semaphore and go through the cache like single
+        lookups. A failed request does not fail the batch: transport errors are
+        reported in place of the response.
+
+        Args:
+            fetch: Function fetching one entity, such as get_subject_info.
+            ids: Entity IDs. Duplicates are fetched once.
+            concurrency: Maximum number of concurrent requests. Defaults to
+                BANGUMI_BATCH_CONCURRENCY.
+        Returns:
+            List of (ID, status code, body) in the order of first appearance. The
+            status code is None if no response was received.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.batch_concurrency))
+
+        async def fetch_one(entity_id: Any) -> tuple[Any, Optional[int], Any]:
+            async with semaphore:
+                try:
+                    status_code, data = await fetch(entity_id)
+                except (httpx.HTTPError, CircuitOpenError) as e:
+                    return entity_id, None, {"title": type(e).__name__, "description": str(e)}
+            return entity_id, status_code, data
+
+        unique_ids = list(dict.fromkeys(ids))
+        return await asyncio.gather(*(fetch_one(entity_id) for entity_id in unique_ids))
+
     async def get_calendar(self) -> tuple[int, Union[Dict[str, Any], List[Dict[str, Any]]]]:
         """
         Get calendar information (currently airing anime).
         """
-        response = await self.client.get("/calendar")
-        
-        return response.status_code, response.json()
+        return await self._get("/calendar", family="calendar", embeds="calendar")
 
-    async def search_subjects(self, params) -> tuple[int, Dict[str, Any]]:
+    async def search_subjects(self, params, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Search for subjects (anime, manga, etc.).
 
         Args:
             params: Search parameters including keyword, type, limit, etc.
+            fields: Fields to keep in each result, such as "rating.score".
         Returns:
             Search results as a dictionary.
         """
-        response = await self.client.post("/v0/search/subjects", json=params)
-        
-        return response.status_code, response.json()
+        return await self._search("/v0/search/subjects", params, fields)
 
-    async def get_subjects(self, params) -> tuple[int, Dict[str, Any]]:
+    async def get_subjects(self, params, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Browse subjects (anime, manga, etc.).
 
         Args:
             params: Parameters for filtering subjects, including type, category, series, platform, sort,
             limit, and offset.
+            fields: Fields to keep in each subject, such as "rating.score".
         Returns:
             List of subjects matching the criteria.
         """
-        response = await self.client.get("/v0/subjects", params=params)
-        
-        return response.status_code, response.json()
+        return await self._get(
+            "/v0/subjects", params=params, family="browse", model="Paged_Subject", fields=fields, paged=True
+        )
 
-    async def get_subject_info(self, subject_id: int) -> tuple[int, Dict[str, Any]]:
+    async def get_subject_info(self, subject_id: int, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Get detailed information about a subject.
         
         Args:
             subject_id: Subject ID
+            fields: Fields to keep, such as "rating.score"
         Returns:
             Subject information
         """
-        response = await self.client.get(f"/v0/subjects/{subject_id}")
-        
-        return response.status_code, response.json()
+        return await self._get(
+            f"/v0/subjects/{subject_id}", family="subject", model="Subject", fields=fields,
+            entity=("subject", subject_id),
+        )
+
+    async def get_subjects_info_many(
+        self,
+        subject_ids: List[int],
+        concurrency: Optional[int] = None,
+    ) -> List[tuple[int, Optional[int], Dict[str, Any]]]:
+        """Get detailed information about several subjects concurrently.
+
+        Args:
+            subject_ids: Subject IDs
+            concurrency: Maximum number of concurrent requests
+        Returns:
+            List of (subject ID, status code, subject information or error)
+        """
+        return await self._get_many(self.get_subject_info, subject_ids, concurrency)
 
     async def get_subject_image(self, subject_id: int, params: Dict[str, Any]) -> tuple[int, Dict[str, Any]]:
         """Get images for a subject.
@@ -97,14 +1073,14 @@ class BangumiClient:
         Returns:
             List of images for the subject
         """
-        response = await self.client.get(f"/v0/subjects/{subject_id}/image", params=params)
+        response = await self._send("GET", f"/v0/subjects/{subject_id}/image", params=params)
         # get header for image URLs
         if response.status_code == 302:
             url = response.headers.get("Location", "")
             return response.status_code, {"url": url}
         else:
             
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
 
     async def get_subject_persons(self, subject_id: int) -> tuple[int, Union[List[Dict[str, Any]], Dict[str, Any]]]:
         """Get persons (staff) for a subject.
@@ -114,9 +1090,7 @@ class BangumiClient:
         Returns:
             List of persons/staff
         """
-        response = await self.client.get(f"/v0/subjects/{subject_id}/persons")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/subjects/{subject_id}/persons", family="subject", embeds="subject_persons")
 
     async def get_subject_characters(self, subject_id: int) -> tuple[int, Union[List[Dict[str, Any]], Dict[str, Any]]]:
         """Get characters for a subject.
@@ -126,9 +1100,7 @@ class BangumiClient:
         Returns:
             List of characters
         """
-        response = await self.client.get(f"/v0/subjects/{subject_id}/characters")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/subjects/{subject_id}/characters", family="subject", embeds="subject_characters")
 
     async def get_subject_relations(self, subject_id: int) -> tuple[int, Union[List[Dict[str, Any]], Dict[str, Any]]]:
         """Get related subjects for a subject.
@@ -138,57 +1110,121 @@ class BangumiClient:
         Returns:
             List of related subjects
         """
-        response = await self.client.get(f"/v0/subjects/{subject_id}/subjects")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/subjects/{subject_id}/subjects", family="subject", embeds="subject_relations")
+
+    async def get_subject_full(
+        self,
+        subject_id: int,
+        sections: Optional[List[str]] = None,
+    ) -> tuple[int, Dict[str, Any]]:
+        """Get a subject together with its persons, characters, relations and episodes.
+
+        All sections are requested concurrently, so the call takes about as long
+        as the slowest of them.
 
-    async def get_episodes(self, params) -> tuple[int, Dict[str, Any]]:
+        Args:
+            subject_id: Subject ID
+            sections: Sections to include, any of SUBJECT_SECTIONS. Defaults to all.
+        Returns:
+            Merged document keyed by section. Sections that failed are left out and
+            reported under errors. If the subject itself is requested and fails,
+            its status code and error are returned instead.
+        Raises:
+            httpx.HTTPError: If the subject request failed without a response.
+            CircuitOpenError: If the API is considered down.
+        """
+        requests = {
+            "subject": lambda: self.get_subject_info(subject_id),
+            "persons": lambda: self.get_subject_persons(subject_id),
+            "characters": lambda: self.get_subject_characters(subject_id),
+            "relations": lambda: self.get_subject_relations(subject_id),
+            "episodes": lambda: self.get_episodes({"subject_id": subject_id}),
+        }
+        selected = [name for name in self.SUBJECT_SECTIONS if sections is None or name in sections]
+        results = await asyncio.gather(*(requests[name]() for name in selected), return_exceptions=True)
+
+        document: Dict[str, Any] = {}
+        errors: Dict[str, Any] = {}
+        for name, result in zip(selected, results):
+            if isinstance(result, (httpx.HTTPError, CircuitOpenError)) and name != "subject":
+                errors[name] = {"title": type(result).__name__, "description": str(result)}
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            status_code, data = result
+            if status_code >= 400:
+                if name == "subject":
+                    return status_code, data
+                errors[name] = data
+            else:
+                document[name] = data
+        if errors:
+            document["errors"] = errors
+        return 200, document
+
+    async def get_episodes(self, params, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Get episodes for a subject.
 
         Args:
             params: Parameters including subject_id and episode_type.
+            fields: Fields to keep in each episode, such as "airdate".
         Returns:
             List of episodes for the subject.
         """
-        response = await self.client.get(f"/v0/episodes", params=params)
-        
-        return response.status_code, response.json()
+        return await self._get(
+            "/v0/episodes", params=params, family="episode", model="Paged_Episode", fields=fields, paged=True
+        )
 
-    async def get_episode_info(self, episode_id: int) -> tuple[int, Dict[str, Any]]:
+    async def get_episode_info(self, episode_id: int, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Get detailed information about an episode.
         
         Args:
             episode_id: Episode ID
+            fields: Fields to keep, such as "airdate"
         Returns:
             Episode information
         """
-        response = await self.client.get(f"/v0/episodes/{episode_id}")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/episodes/{episode_id}", family="episode", model="EpisodeDetail", fields=fields)
 
-    async def search_characters(self, params) -> tuple[int, Dict[str, Any]]:
+    async def search_characters(self, params, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Search for characters.
         
         Args:
             params: Search parameters including keyword, limit, and offset.
+            fields: Fields to keep in each result, such as "images.small".
         Returns:
             Search results as a dictionary.
         """
-        response = await self.client.post("/v0/search/characters", json=params)
-        
-        return response.status_code, response.json()
+        return await self._search("/v0/search/characters", params, fields)
 
-    async def get_character_info(self, character_id: int) -> tuple[int, Dict[str, Any]]:
+    async def get_character_info(self, character_id: int, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Get character information.
         
         Args:
             character_id: Character ID
+            fields: Fields to keep, such as "images.small"
         Returns:
             Character information
         """
-        response = await self.client.get(f"/v0/characters/{character_id}")
-        
-        return response.status_code, response.json()
+        return await self._get(
+            f"/v0/characters/{character_id}", family="character", model="Character", fields=fields,
+            entity=("character", character_id),
+        )
+
+    async def get_characters_info_many(
+        self,
+        character_ids: List[int],
+        concurrency: Optional[int] = None,
+    ) -> List[tuple[int, Optional[int], Dict[str, Any]]]:
+        """Get detailed information about several characters concurrently.
+
+        Args:
+            character_ids: Character IDs
+            concurrency: Maximum number of concurrent requests
+        Returns:
+            List of (character ID, status code, character information or error)
+        """
+        return await self._get_many(self.get_character_info, character_ids, concurrency)
 
     async def get_character_subjects(self, character_id: int) -> tuple[int, Union[List[Dict[str, Any]], Dict[str, Any]]]:
         """
@@ -199,9 +1235,7 @@ class BangumiClient:
         Returns:
             List of related subjects
         """
-        response = await self.client.get(f"/v0/characters/{character_id}/subjects")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/characters/{character_id}/subjects", family="character", embeds="related_subjects")
 
     async def get_character_persons(self, character_id: int) -> tuple[int, Union[List[Dict[str, Any]], Dict[str, Any]]]:
         """
@@ -212,9 +1246,7 @@ class BangumiClient:
         Returns:
             List of related persons
         """
-        response = await self.client.get(f"/v0/characters/{character_id}/persons")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/characters/{character_id}/persons", family="character")
 
     async def post_character_collection(self, character_id: int) -> tuple[int, Dict[str, Any]]:
         """Collect a character.
@@ -224,14 +1256,15 @@ class BangumiClient:
         Returns:
             Collection result
         """
-        response = await self.client.post(f"/v0/characters/{character_id}/collect")
+        tags = await self._my_collection_tags("characters", f"character:{character_id}")
+        response = await self._send_write("POST", f"/v0/characters/{character_id}/collect", tags)
         
 
         status_code = response.status_code
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
 
     async def delete_character_collection(self, character_id: int) -> tuple[int, Dict[str, Any]]:
         """Uncollect a character.
@@ -241,37 +1274,54 @@ class BangumiClient:
         Returns:
             Uncollection result
         """
-        response = await self.client.delete(f"/v0/characters/{character_id}/collect")
+        tags = await self._my_collection_tags("characters", f"character:{character_id}")
+        response = await self._send_write("DELETE", f"/v0/characters/{character_id}/collect", tags)
         
 
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
 
-    async def search_persons(self, params) -> tuple[int, Dict[str, Any]]:
+    async def search_persons(self, params, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Search for persons (staff).
         
         Args:
             params: Search parameters including keyword, limit, and offset.
+            fields: Fields to keep in each result, such as "career".
         Returns:
             Search results as a dictionary.
         """
-        response = await self.client.post("/v0/search/persons", json=params)
-        
-        return response.status_code, response.json()
+        return await self._search("/v0/search/persons", params, fields)
     
-    async def get_person_info(self, person_id: int) -> tuple[int, Dict[str, Any]]:
+    async def get_person_info(self, person_id: int, fields: Optional[List[str]] = None) -> tuple[int, Dict[str, Any]]:
         """Get detailed information about a person.
         
         Args:
             person_id: Person ID
+            fields: Fields to keep, such as "career"
         Returns:
             Person information
         """
-        response = await self.client.get(f"/v0/persons/{person_id}")
-        
-        return response.status_code, response.json()
+        return await self._get(
+            f"/v0/persons/{person_id}", family="person", model="PersonDetail", fields=fields,
+            entity=("person", person_id),
+        )
+
+    async def get_persons_info_many(
+        self,
+        person_ids: List[int],
+        concurrency: Optional[int] = None,
+    ) -> List[tuple[int, Optional[int], Dict[str, Any]]]:
+        """Get detailed information about several persons concurrently.
+
+        Args:
+            person_ids: Person IDs
+            concurrency: Maximum number of concurrent requests
+        Returns:
+            List of (person ID, status code, person information or error)
+        """
+        return await self._get_many(self.get_person_info, person_ids, concurrency)
 
     async def get_person_subjects(self, person_id: int) -> tuple[int, Union[List[Dict[str, Any]], Dict[str, Any]]]:
         """Get subjects related to a person.
@@ -281,9 +1331,7 @@ class BangumiClient:
         Returns:
             List of related subjects
         """
-        response = await self.client.get(f"/v0/persons/{person_id}/subjects")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/persons/{person_id}/subjects", family="person", embeds="related_subjects")
 
     async def get_person_characters(self, person_id: int) -> tuple[int, Union[List[Dict[str, Any]], Dict[str, Any]]]:
         """Get characters related to a person.
@@ -293,9 +1341,7 @@ class BangumiClient:
         Returns:
             List of related characters
         """
-        response = await self.client.get(f"/v0/persons/{person_id}/characters")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/persons/{person_id}/characters", family="person")
     
     async def post_person_collection(self, person_id: int) -> tuple[int, Dict[str, Any]]:
         """Collect a person.
@@ -305,13 +1351,14 @@ class BangumiClient:
         Returns:
             Collection result
         """
-        response = await self.client.post(f"/v0/persons/{person_id}/collect")
+        tags = await self._my_collection_tags("persons", f"person:{person_id}")
+        response = await self._send_write("POST", f"/v0/persons/{person_id}/collect", tags)
         
 
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
 
     async def delete_person_collection(self, person_id: int) -> tuple[int, Dict[str, Any]]:
         """Uncollect a person.
@@ -321,30 +1368,28 @@ class BangumiClient:
         Returns:
             Uncollection result
         """
-        response = await self.client.delete(f"/v0/persons/{person_id}/collect")
+        tags = await self._my_collection_tags("persons", f"person:{person_id}")
+        response = await self._send_write("DELETE", f"/v0/persons/{person_id}/collect", tags)
         
 
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
 
     async def get_user_info(self, username: str) -> tuple[int, Dict[str, Any]]:
         """Get user information by username."""
-        response = await self.client.get(f"/v0/users/{username}")
-        
-        return response.status_code, response.json()
+        return await self._get(f"/v0/users/{username}", family="user", model="User")
     
     async def get_me_info(self) -> tuple[int, Dict[str, Any]]:
         """Get current user's information."""
-        response = await self.client.get("/v0/me")
-        
-        return response.status_code, response.json()
+        return await self._get("/v0/me")
 
     async def get_user_collections(
         self, 
         username: str,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
     ) -> tuple[int, Dict[str, Any]]:
         """Get user's collection.
         
@@ -353,6 +1398,7 @@ class BangumiClient:
             subject_type: Subject type filter
             limit: Number of results to return
             offset: Offset for pagination
+            fields: Fields to keep in each collection, such as "subject.name"
         Returns:
             User collection
         """
@@ -361,26 +1407,30 @@ class BangumiClient:
         else:
             raise ValueError("Username must be provided to get collections")
 
-        response = await self.client.get(url, params=params)
-        
-        return response.status_code, response.json()
+        return await self._get(
+            url, params=params, family="collection", model="Paged_UserCollection", fields=fields, paged=True,
+            embeds="user_collections", tags=collection_tags(username, "subjects"),
+        )
 
     async def get_user_collection_info(
         self, 
         username: str, 
-        subject_id: int
+        subject_id: int,
+        fields: Optional[List[str]] = None
     ) -> tuple[int, Dict[str, Any]]:
         """Get user's collection info for a specific subject.
         
         Args:
             username: Username
             subject_id: Subject ID
+            fields: Fields to keep, such as "subject.name"
         Returns:
             User's collection info for the subject
         """
-        response = await self.client.get(f"/v0/users/{username}/collections/{subject_id}")
-        
-        return response.status_code, response.json()
+        return await self._get(
+            f"/v0/users/{username}/collections/{subject_id}", family="collection", model="UserSubjectCollection",
+            fields=fields, embeds="user_collection", tags=collection_tags(username, f"subject:{subject_id}"),
+        )
 
     async def post_my_collection(
         self, 
@@ -395,13 +1445,14 @@ class BangumiClient:
         Returns:
             Collection result
         """
-        response = await self.client.post(f"/v0/users/-/collections/{subject_id}", json=params)
+        tags = await self._subject_collection_tags(subject_id)
+        response = await self._send_write("POST", f"/v0/users/-/collections/{subject_id}", tags, json=params)
         
 
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
     
     async def patch_my_collection(
         self, 
@@ -416,13 +1467,14 @@ class BangumiClient:
         Returns:
             Updated collection info
         """
-        response = await self.client.patch(f"/v0/users/-/collections/{subject_id}", json=params)
+        tags = await self._subject_collection_tags(subject_id)
+        response = await self._send_write("PATCH", f"/v0/users/-/collections/{subject_id}", tags, json=params)
         
 
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
     
     async def get_my_episode_collections(
         self, 
@@ -442,12 +1494,7 @@ class BangumiClient:
         else:
             raise ValueError("Username must be provided to get episode collections")
 
-        response = await self.client.get(url, params=params)
-        
-        if response.content == b'':
-            return response.status_code, {}
-        else:
-            return response.status_code, response.json()
+        return await self._get(url, params=params, family="collection", tags=collection_tags("-", f"episodes:{subject_id}"))
 
     async def patch_my_episode_collections(
         self, 
@@ -462,13 +1509,81 @@ class BangumiClient:
         Returns:
             Updated episode collection info
         """
-        response = await self.client.patch(f"/v0/users/-/collections/{subject_id}/episodes", json=params)
+        tags = await self._subject_collection_tags(subject_id, (params or {}).get("episode_id") or [])
+        response = await self._send_write(
+            "PATCH", f"/v0/users/-/collections/{subject_id}/episodes", tags, json=params
+        )
         
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
     
+    async def patch_my_episode_progress(
+        self,
+        subject_id: int,
+        type: int,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        episode_type: int = 0,
+    ) -> tuple[int, Dict[str, Any]]:
+        """Update the collection of the episodes of a subject whose sort is in a range.
+
+        The episodes are looked up in the episode listing of the subject, which
+        is usually cached, and updated with one PATCH per EPISODE_BATCH_SIZE
+        episodes.
+
+        Args:
+            subject_id: Subject ID
+            type: Episode collection type: 0 not collected, 1 wish, 2 watched, 3 dropped
+            start: Lowest sort to update, unbounded if None
+            end: Highest sort to update, unbounded if None
+            episode_type: Type of the episodes, 0 for main episodes
+        Returns:
+            Summary with the result of each episode, or the error of the listing
+            if it failed, or of the first update if every update failed. Errors
+            of updates are described as ErrorDetail, see error_detail.
+        """
+        params = {"subject_id": subject_id, "type": episode_type, "limit": 200}
+        status_code, listing = await self.collect(self.get_episodes, params)
+        if status_code >= 400:
+            return status_code, listing
+
+        episodes = sorted(
+            (
+                episode for episode in listing.get("data") or []
+                if (start is None or episode.get("sort", 0) >= start) and (end is None or episode.get("sort", 0) <= end)
+            ),
+            key=lambda episode: episode.get("sort", 0),
+        )
+        results = []
+        failures = []
+        for offset in range(0, len(episodes), self.EPISODE_BATCH_SIZE):
+            batch = episodes[offset:offset + self.EPISODE_BATCH_SIZE]
+            status_code, detail = await self.patch_my_episode_collections(
+                subject_id, {"episode_id": [episode["id"] for episode in batch], "type": type}
+            )
+            if status_code >= 400:
+                detail = error_detail(status_code, detail)
+                failures.append((status_code, detail))
+            for episode in batch:
+                result = {"id": episode["id"], "sort": episode.get("sort"), "name": episode.get("name"), "updated": status_code < 400}
+                if status_code >= 400:
+                    result["error"] = detail
+                results.append(result)
+
+        batches = -(-len(episodes) // self.EPISODE_BATCH_SIZE)
+        if failures and len(failures) == batches:
+            return failures[0]
+        return 200, {
+            "subject_id": subject_id,
+            "type": type,
+            "requests": batches,
+            "updated": sum(1 for result in results if result["updated"]),
+            "failed": sum(1 for result in results if not result["updated"]),
+            "episodes": results,
+        }
+
     async def get_my_episode_collection_info(
         self, 
         episode_id: int
@@ -480,9 +1595,10 @@ class BangumiClient:
         Returns:
             User's episode collection info for the episode
         """
-        response = await self.client.get(f"/v0/users/-/collections/-/episodes/{episode_id}")
-        
-        return response.status_code, response.json()
+        return await self._get(
+            f"/v0/users/-/collections/-/episodes/{episode_id}", family="collection",
+            tags=collection_tags("-", f"episode:{episode_id}"),
+        )
     
     async def put_my_episode_collection_info(
         self, 
@@ -497,13 +1613,14 @@ class BangumiClient:
         Returns:
             Updated episode collection info
         """
-        response = await self.client.put(f"/v0/users/-/collections/-/episodes/{episode_id}", json=params)
+        tags = await self._episode_collection_tags(episode_id)
+        response = await self._send_write("PUT", f"/v0/users/-/collections/-/episodes/{episode_id}", tags, json=params)
         
 
         if response.content == b'':
             return response.status_code, {}
         else:
-            return response.status_code, response.json()
+            return response.status_code, self._decode(response)
 
     async def get_user_character_collections(self, username: str) -> tuple[int, Dict[str, Any]]:
         """Get user's character collections.
@@ -518,9 +1635,7 @@ class BangumiClient:
         else:
             raise ValueError("Username must be provided to get character collections")
 
-        response = await self.client.get(url)
-        
-        return response.status_code, response.json()
+        return await self._get(url, family="collection", tags=collection_tags(username, "characters"))
     
     async def get_user_character_collection_info(
         self, 
@@ -535,9 +1650,10 @@ class BangumiClient:
         Returns:
             User's character collection info for the character
         """
-        response = await self.client.get(f"/v0/users/{username}/collections/-/characters/{character_id}")
-        
-        return response.status_code, response.json()
+        return await self._get(
+            f"/v0/users/{username}/collections/-/characters/{character_id}", family="collection",
+            tags=collection_tags(username, f"character:{character_id}"),
+        )
     
     async def get_user_person_collections(self, username: str) -> tuple[int, Dict[str, Any]]:
         """Get user's person collections.
@@ -552,9 +1668,7 @@ class BangumiClient:
         else:
             raise ValueError("Username must be provided to get person collections")
 
-        response = await self.client.get(url)
-        
-        return response.status_code, response.json()
+        return await self._get(url, family="collection", tags=collection_tags(username, "persons"))
     
     async def get_user_person_collection_info(
         self, 
@@ -569,6 +1683,194 @@ class BangumiClient:
         Returns:
             User's person collection info for the person
         """
-        response = await self.client.get(f"/v0/users/{username}/collections/-/persons/{person_id}")
-        
-        return response.status_code, response.json()
\ No newline at end of file
+        return await self._get(
+            f"/v0/users/{username}/collections/-/persons/{person_id}", family="collection",
+            tags=collection_tags(username, f"person:{person_id}"),
+        )
+
+    async def iter_pages(
+        self,
+        fetch: PageFetcher,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the pages of a paged endpoint.
+
+        The first page is fetched alone to learn the total; after that up to
+        prefetch following pages are fetched concurrently while the current one is
+        consumed. Iteration stops once total or max_items is reached, and pages
+        still in flight are cancelled when the iterator is closed early.
+
+        Args:
+            fetch: Function fetching one page, such as get_subjects.
+            params: Query parameters; limit is used as page size and offset as
+                starting point.
+            max_items: Maximum number of items to fetch.
+            prefetch: Number of pages fetched ahead. Defaults to
+                BANGUMI_PREFETCH_PAGES.
+        Yields:
+            Pages as returned by the endpoint.
+        Raises:
+            BangumiAPIError: If a page request fails.
+        """
+        params = dict(params or {})
+        if prefetch is None:
+            prefetch = self.prefetch_pages
+        start = int(params.get("offset") or 0)
+
+        async def fetch_page(offset: int) -> Dict[str, Any]:
+            status_code, page = await fetch({**params, "offset": offset})
+            if status_code >= 400:
+                raise BangumiAPIError(status_code, page)
+            return page
+
+        first = await fetch_page(start)
+        yield first
+        data = first.get("data") or []
+        step = first.get("limit") or len(data)
+        end = first.get("total", 0)
+        if max_items is not None:
+            end = min(end, start + max_items)
+        if not data or not step:
+            return
+
+        pending: "deque[asyncio.Task[Dict[str, Any]]]" = deque()
+        try:
+            for offset in range(start + step, end, step):
+                pending.append(asyncio.ensure_future(fetch_page(offset)))
+                if len(pending) <= prefetch:
+                    continue
+                page = await pending.popleft()
+                yield page
+                if not page.get("data"):
+                    return
+            while pending:
+                page = await pending.popleft()
+                yield page
+                if not page.get("data"):
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_items(
+        self,
+        fetch: PageFetcher,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the items of a paged endpoint.
+
+        Args:
+            fetch: Function fetching one page, such as get_subjects.
+            params: Query parameters, see iter_pages.
+            max_items: Maximum number of items to yield.
+            prefetch: Number of pages fetched ahead.
+        Yields:
+            Items from the data field of each page.
+        Raises:
+            BangumiAPIError: If a page request fails.
+        """
+        count = 0
+        pages = self.iter_pages(fetch, params, max_items, prefetch)
+        try:
+            async for page in pages:
+                for item in page.get("data") or []:
+                    if max_items is not None and count >= max_items:
+                        return
+                    yield item
+                    count += 1
+        finally:
+            await pages.aclose()
+
+    async def collect(
+        self,
+        fetch: PageFetcher,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> tuple[int, Dict[str, Any]]:
+        """Fetch several pages of a paged endpoint and merge them into one page.
+
+        Args:
+            fetch: Function fetching one page, such as get_subjects.
+            params: Query parameters, see iter_pages.
+            max_items: Maximum number of items to fetch.
+            prefetch: Number of pages fetched ahead.
+            fields: Fields to keep in each item, see _project.
+        Returns:
+            Status code and a page whose data holds all fetched items, or the error
+            of the first failed page request.
+        """
+        total = 0
+        items: List[Dict[str, Any]] = []
+        pages = self.iter_pages(fetch, params, max_items, prefetch)
+        try:
+            async for page in pages:
+                total = page.get("total", total)
+                items.extend(page.get("data") or [])
+        except BangumiAPIError as e:
+            return e.status_code, e.detail
+        finally:
+            await pages.aclose()
+        if max_items is not None:
+            items = items[:max_items]
+        if fields:
+            items = project(items, compile_fields(fields))
+        offset = int((params or {}).get("offset") or 0)
+        return 200, {"total": total, "limit": len(items), "offset": offset, "data": items}
+
+    def iter_subjects(self, params: Optional[Dict[str, Any]] = None, max_items: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over browsed subjects, see get_subjects."""
+        return self.iter_items(self.get_subjects, params, max_items)
+
+    def iter_episodes(self, params: Dict[str, Any], max_items: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the episodes of a subject, see get_episodes."""
+        return self.iter_items(self.get_episodes, params, max_items)
+
+    def iter_search_subjects(self, params: Dict[str, Any], max_items: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over subject search results, see search_subjects."""
+        return self.iter_items(self.search_subjects, params, max_items)
+
+    def iter_search_characters(self, params: Dict[str, Any], max_items: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over character search results, see search_characters."""
+        return self.iter_items(self.search_characters, params, max_items)
+
+    def iter_search_persons(self, params: Dict[str, Any], max_items: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over person search results, see search_persons."""
+        return self.iter_items(self.search_persons, params, max_items)
+
+    def iter_user_collections(
+        self,
+        username: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over a user's collections, see get_user_collections."""
+        return self.iter_items(lambda page: self.get_user_collections(username, page), params, max_items)
+
+
+_client: Optional[BangumiClient] = None
+
+
+def get_client() -> BangumiClient:
+    """Get the shared Bangumi client, creating it on first use.
+
+    Returns:
+        The process-wide BangumiClient.
+    """
+    global _client
+    if _client is None:
+        _client = BangumiClient()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared Bangumi client if it was created."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.close()
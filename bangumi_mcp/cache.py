@@ -0,0 +1,502 @@
+"""Response caches for the Bangumi client."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+def make_key(method: str, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build a normalized cache key for a request.
+
+    Parameters with a value of None are dropped and the rest are sorted, so that
+    equivalent requests map to the same key.
+
+    Args:
+        method: HTTP method.
+        path: Request path relative to the API base URL.
+        params: Query parameters or JSON body.
+    Returns:
+        Cache key string.
+    """
+    key = f"{method.upper()} {path}"
+    if params:
+        normalized = {k: v for k, v in params.items() if v is not None}
+        if normalized:
+            key += "?" + json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return key
+
+
+class CacheEntry:
+    """A single cached response.
+
+    Entries with validators (ETag or Last-Modified) are kept after they expire,
+    until evicted, so that they can be revalidated with a conditional request.
+    Other entries are kept for keep_stale seconds after they expire, so that
+    they can be served stale. Tags name what the entry depends on, so that a
+    write can drop it.
+    """
+
+    __slots__ = (
+        "value", "expires_at", "size", "family", "etag", "last_modified", "decode_time", "keep_stale", "tags"
+    )
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        size: int,
+        family: Optional[str],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        decode_time: float = 0.0,
+        keep_stale: float = 0.0,
+        tags: Tuple[str, ...] = (),
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.family = family
+        self.etag = etag
+        self.last_modified = last_modified
+        self.decode_time = decode_time
+        self.keep_stale = keep_stale
+        self.tags = tags
+
+    @property
+    def revalidatable(self) -> bool:
+        """Whether the entry can be revalidated with a conditional request."""
+        return self.etag is not None or self.last_modified is not None
+
+    def staleness(self) -> float:
+        """Seconds since the entry expired, negative while it is fresh."""
+        return time.monotonic() - self.expires_at
+
+
+class ResponseCache:
+    """Bounded LRU cache with per-entry TTL and byte-size accounting."""
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory.
+            max_bytes: Maximum total size of cached response bodies in bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tagged: Dict[str, Set[str]] = {}
+        self._family_stats: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def _count(self, family: Optional[str], name: str) -> None:
+        if family is None:
+            return
+        stats = self._family_stats.setdefault(family, {"hits": 0, "misses": 0})
+        stats[name] += 1
+
+    def get(self, key: str, family: Optional[str] = None) -> Optional[Any]:
+        """Look up a cached value.
+
+        Args:
+            key: Cache key.
+            family: Endpoint family, used for per-family counters.
+        Returns:
+            The cached value, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            self._count(family, "misses")
+            return None
+        now = time.monotonic()
+        if entry.expires_at <= now:
+            if not entry.revalidatable and entry.expires_at + entry.keep_stale <= now:
+                self._remove(key)
+            self.misses += 1
+            self._count(family, "misses")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._count(family, "hits")
+        return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        size: int = 0,
+        family: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        decode_time: float = 0.0,
+        keep_stale: float = 0.0,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Store a value.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            ttl: Time to live in seconds. Values with a non-positive TTL are not stored.
+            size: Size of the value in bytes, used for the byte budget.
+            family: Endpoint family the value belongs to.
+            etag: ETag of the response, used to revalidate it once expired.
+            last_modified: Last-Modified of the response, used to revalidate it once expired.
+            decode_time: Seconds it took to decode the response, saved by a revalidation.
+            keep_stale: Seconds the value is kept after it expires, to be served stale.
+            tags: Dependency tags, see invalidate.
+        """
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = CacheEntry(
+            value, time.monotonic() + ttl, size, family, etag, last_modified, decode_time, keep_stale, tags
+        )
+        self.current_bytes += size
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry, even an expired one, without counting a lookup.
+
+        Args:
+            key: Cache key.
+        Returns:
+            The entry, or None if missing.
+        """
+        return self._entries.get(key)
+
+    def refresh(self, key: str, ttl: float) -> None:
+        """Extend the lifetime of an entry after it was revalidated.
+
+        Args:
+            key: Cache key.
+            ttl: New time to live in seconds.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + ttl
+            self._entries.move_to_end(key)
+
+    def remaining(self, key: str) -> float:
+        """Get the time a value has left to live.
+
+        Args:
+            key: Cache key.
+        Returns:
+            Remaining TTL in seconds, or 0 if the value is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0.0
+        return max(0.0, entry.expires_at - time.monotonic())
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Remove every value carrying one of the tags.
+
+        Args:
+            tags: Dependency tags.
+        Returns:
+            Number of values removed.
+        """
+        removed = 0
+        for tag in tags:
+            for key in list(self._tagged.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._entries.clear()
+        self._tagged.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters.
+
+        Returns:
+            Dictionary with entry count, byte usage, hit/miss/eviction/invalidation
+            counters and per-family hit/miss counters.
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "families": {name: dict(stats) for name, stats in self._family_stats.items()},
+        }
+
+
+class SQLiteCache:
+    """Persistent response cache backed by SQLite.
+
+    The database runs in WAL mode so that several server processes on the same
+    host can share it: readers never block each other and writers only wait
+    briefly on the database lock. Rows store the raw response body together
+    with its expiry time and validators (ETag and Last-Modified), and the tags
+    table indexes responses by their dependency tags.
+    """
+
+    SCHEMA_VERSION = 3
+    PURGE_INTERVAL = 256
+    # Seconds an expired row with validators is kept for revalidation.
+    STALE_RETENTION = 7 * 86400
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        """Open or create the cache database.
+
+        Args:
+            path: Path to the SQLite database file.
+            timeout: Seconds to wait for the database lock held by another process.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == self.SCHEMA_VERSION:
+            return
+        # The cache is disposable, so an outdated layout is simply rebuilt.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have finished the migration while we waited for the lock.
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] == self.SCHEMA_VERSION:
+                self._conn.execute("COMMIT")
+                return
+            self._conn.execute("DROP TABLE IF EXISTS responses")
+            self._conn.execute("DROP TABLE IF EXISTS tags")
+            self._conn.execute(
+                "CREATE TABLE responses ("
+                "key TEXT PRIMARY KEY, "
+                "status INTEGER NOT NULL, "
+                "body BLOB NOT NULL, "
+                "etag TEXT, "
+                "last_modified TEXT, "
+                "expires_at REAL NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX responses_expires_at ON responses (expires_at)")
+            self._conn.execute(
+                "CREATE TABLE tags (tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX tags_key ON tags (key)")
+            self._conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get(
+        self, key: str, include_stale: bool = False
+    ) -> Optional[Tuple[int, bytes, Optional[str], Optional[str], float]]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key.
+            include_stale: Whether to return an expired response, which counts as a
+                miss, so that it can be revalidated.
+        Returns:
+            Tuple of status code, raw body, ETag, Last-Modified and remaining TTL in
+            seconds, which is not positive for an expired response, or None if
+            missing or expired and include_stale is False.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, body, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        remaining = row[4] - time.time()
+        if remaining <= 0:
+            self.misses += 1
+            if not include_stale:
+                return None
+        else:
+            self.hits += 1
+        return row[0], row[1], row[2], row[3], remaining
+
+    def set(
+        self,
+        key: str,
+        status: int,
+        body: bytes,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Store a response.
+
+        Expired rows with validators are kept for STALE_RETENTION seconds when the
+        table is purged, so that they can be revalidated.
+
+        Args:
+            key: Cache key.
+            status: HTTP status code.
+            body: Raw response body.
+            ttl: Time to live in seconds. Values with a non-positive TTL are not stored.
+            etag: ETag header of the response, if any.
+            last_modified: Last-Modified header of the response, if any.
+            tags: Dependency tags, see invalidate.
+        """
+        if ttl <= 0:
+            return
+        now = time.time()
+        tags = list(tags)
+        with self._lock:
+            if tags:
+                self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, status, body, etag, last_modified, expires_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, status, body, etag, last_modified, now + ttl, now),
+                )
+                if tags:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags]
+                    )
+                    self._conn.execute("COMMIT")
+            except BaseException:
+                if tags:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self.writes += 1
+            if self.writes % self.PURGE_INTERVAL == 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE expires_at <= ? "
+                    "OR (expires_at <= ? AND etag IS NULL AND last_modified IS NULL)",
+                    (now - self.STALE_RETENTION, now),
+                )
+                self._conn.execute("DELETE FROM tags WHERE key NOT IN (SELECT key FROM responses)")
+
+    def refresh(self, key: str, ttl: float) -> None:
+        """Extend the lifetime of a response after it was revalidated.
+
+        Args:
+            key: Cache key.
+            ttl: New time to live in seconds.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, updated_at = ? WHERE key = ?", (now + ttl, now, key)
+            )
+
+    def delete(self, key: str) -> None:
+        """Remove a response if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Remove every response carrying one of the tags.
+
+        Args:
+            tags: Dependency tags.
+        Returns:
+            Number of responses removed.
+        """
+        tags = list(tags)
+        if not tags:
+            return 0
+        marks = ", ".join("?" * len(tags))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._conn.execute(
+                    f"DELETE FROM responses WHERE key IN (SELECT key FROM tags WHERE tag IN ({marks}))", tags
+                ).rowcount
+                self._conn.execute(
+                    f"DELETE FROM tags WHERE key IN (SELECT key FROM tags WHERE tag IN ({marks}))", tags
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return removed
+
+    def clear(self) -> None:
+        """Remove all responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM tags")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters.
+
+        Returns:
+            Dictionary with the database path, row count and hit/miss/write counters.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "writes": self.writes,
+        }
@@ -0,0 +1,232 @@
+"""Generate msgspec Structs from the component schemas in dist.json.
+
+Usage:
+    python -m bangumi_mcp.codegen [dist.json] [-o bangumi_mcp/models.py]
+
+Object schemas become Structs, allOf compositions are flattened into a
+single Struct, and enums become their base type, so values added upstream
+still decode. Optional properties default to None, and the generated base
+class omits default values when encoding, which drops None fields.
+"""
+
+import argparse
+import json
+import keyword
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+HEADER = '''"""Typed models of the Bangumi API responses.
+
+Generated by `python -m bangumi_mcp.codegen` from dist.json, do not edit.
+Requires the optional msgspec dependency.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Union
+
+import msgspec
+
+
+class Model(msgspec.Struct, omit_defaults=True):
+    """Base of the generated models, fields left at their default are omitted when encoding."""
+'''
+
+PRIMITIVES = {"string": "str", "integer": "int", "number": "float", "boolean": "bool"}
+
+# Kinds of JSON values, a msgspec Union may contain at most one type of each kind.
+KINDS = {"string": "str", "integer": "number", "number": "number", "boolean": "bool", "array": "array"}
+
+
+def _camel(name: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in re.split(r"[^0-9A-Za-z]+", name) if part)
+
+
+def _field_name(name: str) -> str:
+    identifier = re.sub(r"\W", "_", name)
+    if identifier[:1].isdigit():
+        identifier = "n" + identifier
+    if keyword.iskeyword(identifier):
+        identifier += "_"
+    return identifier
+
+
+class ModelGenerator:
+    """Translate the component schemas of an OpenAPI document into msgspec Struct source code."""
+
+    def __init__(self, document: Dict[str, Any]):
+        self.components: Dict[str, Any] = document["components"]["schemas"]
+        self.blocks: List[str] = []
+        self._done: Dict[str, str] = {}
+        self._names = set(self.components)
+
+    def generate(self) -> str:
+        """Return the source code of the models module."""
+        for name in self.components:
+            self.component(name)
+        names = ", ".join(f'"{name}"' for name in ["Model"] + list(self._done))
+        return "\n\n\n".join([HEADER.rstrip("\n")] + self.blocks) + f"\n\n\n__all__ = [{names}]\n"
+
+    def component(self, name: str) -> str:
+        """Emit a component once, after the components it depends on, and return its name."""
+        if name in self._done:
+            return self._done[name]
+        # Placeholder for recursive references, Struct annotations are resolved lazily.
+        self._done[name] = name
+        schema = self.components[name]
+        if self._is_struct(schema):
+            self.struct(name, schema)
+        else:
+            expression = self.type_of(schema, name)
+            self.blocks.append(f"{name} = {expression}")
+        return name
+
+    def _resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        while "$ref" in schema:
+            schema = self.components[schema["$ref"].rsplit("/", 1)[-1]]
+        return schema
+
+    def _is_struct(self, schema: Dict[str, Any]) -> bool:
+        schema = self._resolve(schema)
+        if "properties" in schema:
+            return True
+        parts = schema.get("allOf", [])
+        return len(parts) > 1 and all(self._is_struct(part) for part in parts)
+
+    def _merge(self, schema: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        schema = self._resolve(schema)
+        properties = dict(schema.get("properties", {}))
+        required = list(schema.get("required", []))
+        for part in schema.get("allOf", []):
+            part_properties, part_required = self._merge(part)
+            properties.update(part_properties)
+            required.extend(part_required)
+        return properties, required
+
+    def _unique(self, name: str) -> str:
+        candidate, index = name, 2
+        while candidate in self._names:
+            candidate, index = f"{name}{index}", index + 1
+        self._names.add(candidate)
+        return candidate
+
+    def struct(self, name: str, schema: Dict[str, Any]) -> str:
+        """Emit a Struct for an object schema, with inline objects as their own Structs first."""
+        properties, required = self._merge(schema)
+        lines = [f"class {name}(Model, kw_only=True):"]
+        for prop, prop_schema in properties.items():
+            annotation = self.type_of(prop_schema, name + _camel(prop))
+            attribute = _field_name(prop)
+            renamed = attribute != prop
+            if prop in required:
+                value = f" = msgspec.field(name={json.dumps(prop)})" if renamed else ""
+            else:
+                if annotation != "Any":
+                    annotation = f"Optional[{annotation}]"
+                value = f" = msgspec.field(default=None, name={json.dumps(prop)})" if renamed else " = None"
+            lines.append(f"    {attribute}: {annotation}{value}")
+        if len(lines) == 1:
+            lines.append("    pass")
+        self.blocks.append("\n".join(lines))
+        return name
+
+    def type_of(self, schema: Dict[str, Any], context: str) -> str:
+        """Return a type expression for a schema.
+
+        Args:
+            schema: Schema to translate.
+            context: Name given to a Struct generated for an inline object.
+        Returns:
+            Python type expression.
+        """
+        if "$ref" in schema:
+            return self.component(schema["$ref"].rsplit("/", 1)[-1])
+        parts = schema.get("allOf")
+        if parts:
+            if len(parts) == 1:
+                return self.type_of(parts[0], context)
+            if self._is_struct(schema):
+                return self.struct(self._unique(context), schema)
+            return "Any"
+        alternatives = schema.get("anyOf") or schema.get("oneOf")
+        if alternatives:
+            return self.union(alternatives, context)
+        kind = schema.get("type")
+        if kind == "object" or "properties" in schema:
+            if "properties" in schema:
+                return self.struct(self._unique(context), schema)
+            extra = schema.get("additionalProperties")
+            if isinstance(extra, dict):
+                return f"Dict[str, {self.type_of(extra, context + 'Value')}]"
+            return "Dict[str, Any]"
+        if kind == "array":
+            return f"List[{self.type_of(schema.get('items', {}), context + 'Item')}]"
+        return PRIMITIVES.get(kind, "Any")
+
+    def _schema_kind(self, schema: Dict[str, Any]) -> str:
+        schema = self._resolve(schema)
+        parts = schema.get("allOf")
+        if parts:
+            if len(parts) == 1:
+                return self._schema_kind(parts[0])
+            return "object" if self._is_struct(schema) else "any"
+        if schema.get("anyOf") or schema.get("oneOf"):
+            return "any"
+        kind = schema.get("type")
+        if kind == "object" or "properties" in schema:
+            return "object"
+        return KINDS.get(kind, "any")
+
+    def union(self, alternatives: List[Dict[str, Any]], context: str) -> str:
+        """Combine alternatives into a Union msgspec accepts.
+
+        msgspec tells Union members apart by the kind of JSON value, so several
+        alternatives of the same container kind are widened to a plain dict or list.
+        """
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        for alternative in alternatives:
+            by_kind.setdefault(self._schema_kind(alternative), []).append(alternative)
+        if "any" in by_kind:
+            return "Any"
+        types: List[str] = []
+        for kind, schemas in by_kind.items():
+            if len(schemas) > 1 and kind in ("object", "array"):
+                types.append("Dict[str, Any]" if kind == "object" else "List[Any]")
+                continue
+            for schema in schemas:
+                expression = self.type_of(schema, context)
+                if expression not in types:
+                    types.append(expression)
+        if len(types) == 1:
+            return types[0]
+        return f"Union[{', '.join(types)}]"
+
+
+def generate_models(document: Dict[str, Any]) -> str:
+    """Generate the models module for an OpenAPI document.
+
+    Args:
+        document: Decoded OpenAPI document with components/schemas.
+    Returns:
+        Python source code.
+    """
+    return ModelGenerator(document).generate()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    package_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Generate msgspec models from dist.json")
+    parser.add_argument("schema", nargs="?", default=str(package_dir / "dist.json"), help="OpenAPI document")
+    parser.add_argument("-o", "--output", default=str(package_dir / "models.py"), help="Output module")
+    args = parser.parse_args(argv)
+
+    with open(args.schema, encoding="utf-8") as f:
+        document = json.load(f)
+    Path(args.output).write_text(generate_models(document), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Store of entities harvested from the objects other responses embed.
+
+Collections embed subjects, the subject relations and the character and
+person subject lists embed subject summaries, the calendar embeds legacy
+subjects, and the subject character and person lists embed characters and
+persons. Each embedded object is mapped onto the fields of the entity's own
+schema and merged into a per-type store, so that requests for a few fields
+of an entity can be answered without fetching it.
+
+A record knows which fields it covers, which is what decides whether it can
+answer a request. Fields that are missing from a record but covered by it
+were null upstream, just as they would be missing from a full response.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bangumi_mcp.utils import compile_fields, project
+
+
+# Completeness levels of a record, from the source that covers the most fields.
+SUMMARY = 1
+PARTIAL = 2
+
+LEVEL_NAMES = {SUMMARY: "summary", PARTIAL: "partial"}
+
+# Field mappings of each source, from the path in the embedded object to the
+# path in the entity's schema. Only fields with the same meaning on both
+# sides are mapped: SlimSubject.tags holds the top tags only and
+# short_summary is truncated, so they are left out.
+SOURCES: Dict[str, Tuple[str, int, Tuple[Tuple[str, str], ...]]] = {
+    "related_subject": ("subject", SUMMARY, (
+        ("id", "id"), ("type", "type"), ("name", "name"), ("name_cn", "name_cn"),
+    )),
+    "subject_relation": ("subject", PARTIAL, (
+        ("id", "id"), ("type", "type"), ("name", "name"), ("name_cn", "name_cn"), ("images", "images"),
+    )),
+    "slim_subject": ("subject", PARTIAL, (
+        ("id", "id"), ("type", "type"), ("name", "name"), ("name_cn", "name_cn"), ("date", "date"),
+        ("images", "images"), ("volumes", "volumes"), ("eps", "eps"),
+        ("score", "rating.score"), ("rank", "rating.rank"),
+    )),
+    "legacy_subject": ("subject", PARTIAL, (
+        ("id", "id"), ("type", "type"), ("name", "name"), ("name_cn", "name_cn"), ("air_date", "date"),
+        ("images", "images"), ("eps", "eps"), ("rating.total", "rating.total"), ("rating.count", "rating.count"),
+        ("rating.score", "rating.score"), ("rank", "rating.rank"), ("collection", "collection"),
+    )),
+    "related_character": ("character", PARTIAL, (
+        ("id", "id"), ("type", "type"), ("name", "name"), ("images", "images"),
+    )),
+    "related_person": ("person", PARTIAL, (
+        ("id", "id"), ("type", "type"), ("name", "name"), ("career", "career"), ("images", "images"),
+    )),
+}
+
+
+# SOURCES with the paths split, and the fields each source covers.
+_PATHS = {
+    source: tuple((tuple(path.split(".")), tuple(target.split("."))) for path, target in mapping)
+    for source, (_, _, mapping) in SOURCES.items()
+}
+_COVERED = {source: frozenset(target for _, target in mapping) for source, (_, _, mapping) in SOURCES.items()}
+
+
+def _items(data: Any) -> List[Any]:
+    if isinstance(data, dict):
+        data = data.get("data")
+    return data if isinstance(data, list) else []
+
+
+def _calendar_items(data: Any) -> List[Any]:
+    return [item for day in _items(data) if isinstance(day, dict) for item in day.get("items") or []]
+
+
+def _collection_subjects(data: Any) -> List[Any]:
+    return [item.get("subject") for item in _items(data) if isinstance(item, dict)]
+
+
+def _actors(data: Any) -> List[Any]:
+    return [actor for item in _items(data) if isinstance(item, dict) for actor in item.get("actors") or []]
+
+
+# Embedded objects of each endpoint: the source schema and how to find the objects in a response.
+EMBEDS: Dict[str, Tuple[Tuple[str, Callable[[Any], List[Any]]], ...]] = {
+    "calendar": (("legacy_subject", _calendar_items),),
+    "user_collections": (("slim_subject", _collection_subjects),),
+    "user_collection": (("slim_subject", lambda data: [data.get("subject")] if isinstance(data, dict) else []),),
+    "related_subjects": (("related_subject", _items),),
+    "subject_relations": (("subject_relation", _items),),
+    "subject_characters": (("related_character", _items), ("related_person", _actors)),
+    "subject_persons": (("related_person", _items),),
+}
+
+
+def _lookup(obj: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for name in path:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(name)
+    return obj
+
+
+def _assign(obj: Dict[str, Any], path: Tuple[str, ...], value: Any) -> None:
+    for name in path[:-1]:
+        child = obj.get(name)
+        if not isinstance(child, dict):
+            child = obj[name] = {}
+        obj = child
+    obj[path[-1]] = value
+
+
+class EntityRecord:
+    """What is known of one entity: its values, the fields they cover and their completeness level."""
+
+    __slots__ = ("values", "covered", "level", "expires_at")
+
+    def __init__(self, values: Dict[str, Any], covered: frozenset, level: int, expires_at: float):
+        self.values = values
+        self.covered = covered
+        self.level = level
+        self.expires_at = expires_at
+
+    def covers(self, fields: Iterable[str]) -> bool:
+        """Return whether every field, or one of its parents, is covered by the record."""
+        for field in fields:
+            parts = field.split(".")
+            if not any(".".join(parts[:depth]) in self.covered for depth in range(1, len(parts) + 1)):
+                return False
+        return True
+
+
+class EntityStore:
+    """Per-type LRU store of entities harvested from embedded objects."""
+
+    def __init__(self, max_entries: int = 10000):
+        """Initialize the store.
+
+        Args:
+            max_entries: Maximum number of records kept per entity type.
+        """
+        self.max_entries = max_entries
+        self.harvested = 0
+        self.hits = 0
+        self.misses = 0
+        self._records: Dict[str, "OrderedDict[Any, EntityRecord]"] = {}
+
+    def harvest(self, source: str, objects: Iterable[Any], ttl: float) -> None:
+        """Merge embedded objects into the store.
+
+        Values of an existing record are overwritten by the newer ones and its
+        coverage grows, but it keeps its original expiry, so no value outlives
+        the TTL it was stored with.
+
+        Args:
+            source: Name of the embedded schema, a key of SOURCES.
+            objects: Embedded objects, with null items already removed.
+            ttl: Lifetime of new records in seconds. Non-positive values disable harvesting.
+        """
+        if ttl <= 0:
+            return
+        kind, level, _ = SOURCES[source]
+        records = self._records.setdefault(kind, OrderedDict())
+        covered = _COVERED[source]
+        paths = _PATHS[source]
+        now = time.monotonic()
+        for obj in objects:
+            if not isinstance(obj, dict) or obj.get("id") is None:
+                continue
+            record = records.get(obj["id"])
+            if record is None or record.expires_at <= now:
+                record = EntityRecord({}, covered, level, now + ttl)
+                records[obj["id"]] = record
+            else:
+                if not covered <= record.covered:
+                    record.covered |= covered
+                record.level = max(record.level, level)
+                records.move_to_end(obj["id"])
+            values = record.values
+            for source_path, target_path in paths:
+                value = obj.get(source_path[0]) if len(source_path) == 1 else _lookup(obj, source_path)
+                if value is None:
+                    continue
+                if len(target_path) == 1:
+                    values[target_path[0]] = value
+                else:
+                    _assign(values, target_path, value)
+            self.harvested += 1
+        while len(records) > self.max_entries:
+            records.popitem(last=False)
+
+    def harvest_response(self, embeds: str, data: Any, ttls: Dict[str, float]) -> None:
+        """Harvest the objects embedded in a response.
+
+        Args:
+            embeds: Name of the endpoint's embedded objects, a key of EMBEDS.
+            data: Decoded successful response.
+            ttls: Lifetime of new records per entity type in seconds.
+        """
+        for source, extract in EMBEDS[embeds]:
+            self.harvest(source, extract(data), ttls.get(SOURCES[source][0], 0))
+
+    def get(self, kind: str, entity_id: Any, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Answer a request for some fields of an entity.
+
+        Args:
+            kind: Entity type, such as subject.
+            entity_id: Entity ID.
+            fields: Dotted field paths requested.
+        Returns:
+            The entity projected to the fields, or None if no fresh record covers them.
+        """
+        records = self._records.get(kind)
+        record = records.get(entity_id) if records else None
+        if record is not None and record.expires_at <= time.monotonic():
+            del records[entity_id]
+            record = None
+        if record is None or not record.covers(fields):
+            self.misses += 1
+            return None
+        records.move_to_end(entity_id)
+        self.hits += 1
+        return project(record.values, compile_fields(fields))
+
+    def clear(self) -> None:
+        """Remove all records."""
+        self._records.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store counters.
+
+        Returns:
+            Dictionary with the number of harvested objects, hit and miss counters
+            and, per entity type, the number of records at each completeness level.
+        """
+        types: Dict[str, Dict[str, int]] = {}
+        for kind, records in self._records.items():
+            levels = types.setdefault(kind, {name: 0 for name in LEVEL_NAMES.values()})
+            for record in records.values():
+                levels[LEVEL_NAMES[record.level]] += 1
+        total = self.hits + self.misses
+        return {
+            "max_entries": self.max_entries,
+            "harvested": self.harvested,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "types": types,
+        }
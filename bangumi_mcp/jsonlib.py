@@ -0,0 +1,88 @@
+"""JSON backend used for upstream responses and tool results.
+
+The backend is chosen once at import time from BANGUMI_JSON_BACKEND:
+orjson, msgspec, json (the standard library) or auto, which picks the first
+installed of orjson and msgspec and falls back to the standard library.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _orjson() -> Tuple[Callable[[Union[str, bytes]], Any], Callable[[Any], str]]:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    return orjson.loads, dumps
+
+
+def _msgspec() -> Tuple[Callable[[Union[str, bytes]], Any], Callable[[Any], str]]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> str:
+        return msgspec.json.format(encoder.encode(obj), indent=2).decode()
+
+    return decoder.decode, dumps
+
+
+def _stdlib() -> Tuple[Callable[[Union[str, bytes]], Any], Callable[[Any], str]]:
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    return json.loads, dumps
+
+
+_LOADERS = {"orjson": _orjson, "msgspec": _msgspec, "json": _stdlib}
+
+
+def _select(requested: str) -> Tuple[str, Callable[[Union[str, bytes]], Any], Callable[[Any], str]]:
+    if requested not in ("auto",) + BACKENDS:
+        logger.warning(f"Unknown BANGUMI_JSON_BACKEND={requested!r}, using auto")
+        requested = "auto"
+    candidates = BACKENDS if requested == "auto" else (requested, "json")
+    for name in candidates:
+        try:
+            loads, dumps = _LOADERS[name]()
+        except ImportError:
+            if name == requested:
+                logger.warning(f"JSON backend {name} requested but not installed, using the standard library")
+            continue
+        return name, loads, dumps
+    raise AssertionError("the standard library backend is always available")
+
+
+backend, _loads, _dumps = _select((os.getenv("BANGUMI_JSON_BACKEND") or "auto").strip().lower())
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document.
+
+    Args:
+        data: JSON text or UTF-8 encoded bytes.
+    Returns:
+        Decoded object.
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Encode an object as JSON text indented by two spaces, with non-ASCII characters kept as is.
+
+    Args:
+        obj: Object to encode.
+    Returns:
+        JSON text.
+    """
+    return _dumps(obj)
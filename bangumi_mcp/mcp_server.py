@@ -6,21 +6,16 @@ from typing import Any, Dict, List, Optional
 
 import mcp.types as types
 from mcp.server import Server
-from mcp.server.models import InitializationOptions
-from mcp.server.stdio import stdio_server
-from mcp.server.sse import SseServerTransport
-from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
-from mcp.server.streamable_http import StreamableHTTPServerTransport
-from starlette.applications import Starlette
-from starlette.requests import Request
-from starlette.routing import Mount, Route
-from starlette.types import Receive, Scope, Send
 from collections.abc import AsyncIterator
 import contextlib
-import uvicorn
+import httpx
 
-from .tool_list import tool_list  # Import tool list from tool_list.py
-from . import tools  # Import all tools from tools.py
+# Transport modules (stdio, SSE, streamable HTTP, starlette, uvicorn) are
+# imported by the entry point that uses them.
+from . import jsonlib
+from .bangumi_client import close_client, get_client
+from .registry import get_output_policy, get_registry
+from .retry import CircuitOpenError
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -35,44 +30,74 @@ async def handle_list_tools() -> List[types.Tool]:
     Returns:
         List of available tools.
     """
-    return tool_list
+    # Imported on first use: building the list resolves the dist.json schemas.
+    from .tool_list import get_tool_list
 
+    return get_tool_list()
 
-@server.call_tool()
-async def handle_call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> List[types.TextContent]:
+
+def error_result(text: str) -> types.CallToolResult:
+    """
+    Build the result returned for a failed tool call.
+    Args:
+        text: Error message.
+    Returns:
+        CallToolResult flagged as an error.
+    """
+    return types.CallToolResult(
+        content=[types.TextContent(type="text", text=f"Error: {text}")],
+        isError=True
+    )
+
+
+# Arguments are checked against the registry's precompiled validators instead
+# of the SDK's per-call jsonschema.validate.
+@server.call_tool(validate_input=False)
+async def handle_call_tool(name: str, arguments: Optional[Dict[str, Any]]) -> types.CallToolResult:
     """
     Handle tool calls.
     Args:
         name: The name of the tool to call.
         arguments: Arguments for the tool.
     Returns:
-        List of TextContent with the tool's output.
-    Raises:
-        Exception: If the tool does not exist or an error occurs.
+        CallToolResult with the tool's output, or an error result if the tool
+        does not exist, the arguments or output are invalid or an error occurs.
     """
+    entry = get_registry().get(name)
+    if entry is None:
+        return error_result(f"Unknown tool: {name}")
+
+    arguments = arguments or {}
+    problem = entry.check_arguments(arguments)
+    if problem is not None:
+        return error_result(f"Invalid arguments for {name}: {problem}")
 
     try:
-        if hasattr(tools, name):
-            # 如果工具是异步函数，使用 await 调用
-            if asyncio.iscoroutinefunction(getattr(tools, name)):
-                return await getattr(tools, name)(arguments)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Tool function is not async"
-                )]
-        else:
-            return [types.TextContent(
-                type="text",
-                text=f"Unknown tool: {name}"
-            )]
-            
+        result = await entry.handler(arguments)
+
+    except CircuitOpenError as e:
+        logger.warning(f"Tool {name} rejected: {e}")
+        return error_result(f"Bangumi API is temporarily unavailable, retry in {e.retry_after:.0f}s")
+    except httpx.HTTPError as e:
+        logger.error(f"Request failed in tool {name}: {type(e).__name__}: {e}")
+        return error_result(f"request to Bangumi API failed ({type(e).__name__}): {e}")
     except Exception as e:
         logger.error(f"Error in tool {name}: {e}")
-        return [types.TextContent(
-            type="text",
-            text=f"Error: {str(e)}"
-        )]
+        return error_result(str(e))
+
+    # The result is built here rather than by the SDK, whose handler would
+    # validate structured output with jsonschema.validate on every call.
+    if isinstance(result, dict):
+        # Only results trimmed by a fields argument are checked against the relaxed schema.
+        problem = entry.check_output(result, get_output_policy(), projected="fields" in arguments)
+        if problem is not None:
+            return error_result(f"Output validation error: {problem}")
+        return types.CallToolResult(
+            content=[types.TextContent(type="text", text=jsonlib.dumps(result))],
+            structuredContent=result
+        )
+    # Tools with an output schema only return plain content to report errors.
+    return types.CallToolResult(content=list(result), isError=entry.tool.outputSchema is not None)
 
 
 async def stdio():
@@ -81,12 +106,20 @@ async def stdio():
     Initializes the Bangumi client and starts the server.
     This is useful for testing or running in environments where standard input/output is available.
     """
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    from mcp.server.stdio import stdio_server
+
+    # Open upstream connections while the client is still initializing the session.
+    warmup = asyncio.create_task(get_client().warm_up())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        warmup.cancel()
+        await close_client()
 
 
 def sse(host: str = 'localhost', port: int = 18080):
@@ -97,6 +130,12 @@ def sse(host: str = 'localhost', port: int = 18080):
         host: Host to bind to.
         port: Port to listen on.
     """
+    import uvicorn
+    from mcp.server.sse import SseServerTransport
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.routing import Mount, Route
+
     sse = SseServerTransport("/messages/")
 
     async def handle_sse(request: Request) -> None:
@@ -111,12 +150,22 @@ def sse(host: str = 'localhost', port: int = 18080):
                 server.create_initialization_options()
             )
 
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        """Open upstream connections before serving requests and close them on shutdown."""
+        await get_client().warm_up()
+        try:
+            yield
+        finally:
+            await close_client()
+
     starlette_app = Starlette(
         debug=True,
         routes=[
             Route("/sse", endpoint=handle_sse, methods=["GET"]),
             Mount("/messages", app=sse.handle_post_message),
         ],
+        lifespan=lifespan,
     )
     uvicorn.run(starlette_app, host=host, port=port)
 
@@ -129,6 +178,12 @@ def streamableHTTP(host: str = 'localhost', port: int = 18080):
         host: Host to bind to.
         port: Port to listen on.
     """
+    import uvicorn
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+    from starlette.types import Receive, Scope, Send
+
     session_manager = StreamableHTTPSessionManager(
         app=server,
         event_store=None,
@@ -145,12 +200,14 @@ def streamableHTTP(host: str = 'localhost', port: int = 18080):
     async def lifespan(app: Starlette) -> AsyncIterator[None]:
         """Context manager for session manager."""
         async with session_manager.run():
+            await get_client().warm_up()
             print("Application started with StreamableHTTP session manager!")
             try:
                 yield
             
             finally:
                 print("Application shutting down...")
+                await close_client()
 
     # Create an ASGI application using the transport
     starlette_app = Starlette(
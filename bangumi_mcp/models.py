@@ -0,0 +1,964 @@
+"""Typed models of the Bangumi API responses.
+
+Generated by `python -m bangumi_mcp.codegen` from dist.json, do not edit.
+Requires the optional msgspec dependency.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Union
+
+import msgspec
+
+
+class Model(msgspec.Struct, omit_defaults=True):
+    """Base of the generated models, fields left at their default are omitted when encoding."""
+
+
+Legacy_SubjectType = int
+
+
+class Legacy_SubjectSmallImages(Model, kw_only=True):
+    large: Optional[str] = None
+    common: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_SubjectSmallRatingCount(Model, kw_only=True):
+    n1: Optional[int] = msgspec.field(default=None, name="1")
+    n2: Optional[int] = msgspec.field(default=None, name="2")
+    n3: Optional[int] = msgspec.field(default=None, name="3")
+    n4: Optional[int] = msgspec.field(default=None, name="4")
+    n5: Optional[int] = msgspec.field(default=None, name="5")
+    n6: Optional[int] = msgspec.field(default=None, name="6")
+    n7: Optional[int] = msgspec.field(default=None, name="7")
+    n8: Optional[int] = msgspec.field(default=None, name="8")
+    n9: Optional[int] = msgspec.field(default=None, name="9")
+    n10: Optional[int] = msgspec.field(default=None, name="10")
+
+
+class Legacy_SubjectSmallRating(Model, kw_only=True):
+    total: Optional[int] = None
+    count: Optional[Legacy_SubjectSmallRatingCount] = None
+    score: Optional[float] = None
+
+
+class Legacy_SubjectSmallCollection(Model, kw_only=True):
+    wish: Optional[int] = None
+    collect: Optional[int] = None
+    doing: Optional[int] = None
+    on_hold: Optional[int] = None
+    dropped: Optional[int] = None
+
+
+class Legacy_SubjectSmall(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    type: Optional[int] = None
+    name: Optional[str] = None
+    name_cn: Optional[str] = None
+    summary: Optional[str] = None
+    air_date: Optional[str] = None
+    air_weekday: Optional[int] = None
+    images: Optional[Legacy_SubjectSmallImages] = None
+    eps: Optional[int] = None
+    eps_count: Optional[int] = None
+    rating: Optional[Legacy_SubjectSmallRating] = None
+    rank: Optional[int] = None
+    collection: Optional[Legacy_SubjectSmallCollection] = None
+
+
+class Legacy_SubjectMediumImages(Model, kw_only=True):
+    large: Optional[str] = None
+    common: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_SubjectMediumRatingCount(Model, kw_only=True):
+    n1: Optional[int] = msgspec.field(default=None, name="1")
+    n2: Optional[int] = msgspec.field(default=None, name="2")
+    n3: Optional[int] = msgspec.field(default=None, name="3")
+    n4: Optional[int] = msgspec.field(default=None, name="4")
+    n5: Optional[int] = msgspec.field(default=None, name="5")
+    n6: Optional[int] = msgspec.field(default=None, name="6")
+    n7: Optional[int] = msgspec.field(default=None, name="7")
+    n8: Optional[int] = msgspec.field(default=None, name="8")
+    n9: Optional[int] = msgspec.field(default=None, name="9")
+    n10: Optional[int] = msgspec.field(default=None, name="10")
+
+
+class Legacy_SubjectMediumRating(Model, kw_only=True):
+    total: Optional[int] = None
+    count: Optional[Legacy_SubjectMediumRatingCount] = None
+    score: Optional[float] = None
+
+
+class Legacy_SubjectMediumCollection(Model, kw_only=True):
+    wish: Optional[int] = None
+    collect: Optional[int] = None
+    doing: Optional[int] = None
+    on_hold: Optional[int] = None
+    dropped: Optional[int] = None
+
+
+class Legacy_SubjectMediumCrtItemImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_MonoInfoAlias(Model, kw_only=True):
+    jp: Optional[str] = None
+    kana: Optional[str] = None
+    nick: Optional[str] = None
+    romaji: Optional[str] = None
+    zh: Optional[str] = None
+
+
+class Legacy_MonoInfo(Model, kw_only=True):
+    birth: Optional[str] = None
+    height: Optional[str] = None
+    gender: Optional[str] = None
+    alias: Optional[Legacy_MonoInfoAlias] = None
+    source: Optional[Union[str, List[str]]] = None
+    name_cn: Optional[str] = None
+    cv: Optional[str] = None
+
+
+class Legacy_MonoBaseImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_MonoBase(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_MonoBaseImages] = None
+
+
+class Legacy_SubjectMediumCrtItem(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_SubjectMediumCrtItemImages] = None
+    name_cn: Optional[str] = None
+    comment: Optional[int] = None
+    collects: Optional[int] = None
+    info: Optional[Legacy_MonoInfo] = None
+    actors: Optional[List[Legacy_MonoBase]] = None
+    role_name: Optional[str] = None
+
+
+class Legacy_SubjectMediumStaffItemImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_SubjectMediumStaffItem(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_SubjectMediumStaffItemImages] = None
+    name_cn: Optional[str] = None
+    comment: Optional[int] = None
+    collects: Optional[int] = None
+    info: Optional[Legacy_MonoInfo] = None
+    role_name: Optional[str] = None
+    jobs: Optional[List[str]] = None
+
+
+class Legacy_SubjectMedium(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    type: Optional[int] = None
+    name: Optional[str] = None
+    name_cn: Optional[str] = None
+    summary: Optional[str] = None
+    air_date: Optional[str] = None
+    air_weekday: Optional[int] = None
+    images: Optional[Legacy_SubjectMediumImages] = None
+    eps: Optional[int] = None
+    eps_count: Optional[int] = None
+    rating: Optional[Legacy_SubjectMediumRating] = None
+    rank: Optional[int] = None
+    collection: Optional[Legacy_SubjectMediumCollection] = None
+    crt: Optional[List[Legacy_SubjectMediumCrtItem]] = None
+    staff: Optional[List[Legacy_SubjectMediumStaffItem]] = None
+
+
+class Legacy_SubjectLargeImages(Model, kw_only=True):
+    large: Optional[str] = None
+    common: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+Legacy_EpisodeType = int
+
+
+class Legacy_Episode(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    type: Optional[Legacy_EpisodeType] = None
+    sort: Optional[int] = None
+    name: Optional[str] = None
+    name_cn: Optional[str] = None
+    duration: Optional[str] = None
+    airdate: Optional[str] = None
+    comment: Optional[int] = None
+    desc: Optional[str] = None
+    status: Optional[str] = None
+
+
+class Legacy_SubjectLargeRatingCount(Model, kw_only=True):
+    n1: Optional[int] = msgspec.field(default=None, name="1")
+    n2: Optional[int] = msgspec.field(default=None, name="2")
+    n3: Optional[int] = msgspec.field(default=None, name="3")
+    n4: Optional[int] = msgspec.field(default=None, name="4")
+    n5: Optional[int] = msgspec.field(default=None, name="5")
+    n6: Optional[int] = msgspec.field(default=None, name="6")
+    n7: Optional[int] = msgspec.field(default=None, name="7")
+    n8: Optional[int] = msgspec.field(default=None, name="8")
+    n9: Optional[int] = msgspec.field(default=None, name="9")
+    n10: Optional[int] = msgspec.field(default=None, name="10")
+
+
+class Legacy_SubjectLargeRating(Model, kw_only=True):
+    total: Optional[int] = None
+    count: Optional[Legacy_SubjectLargeRatingCount] = None
+    score: Optional[float] = None
+
+
+class Legacy_SubjectLargeCollection(Model, kw_only=True):
+    wish: Optional[int] = None
+    collect: Optional[int] = None
+    doing: Optional[int] = None
+    on_hold: Optional[int] = None
+    dropped: Optional[int] = None
+
+
+class Legacy_SubjectLargeCrtItemImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_SubjectLargeCrtItem(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_SubjectLargeCrtItemImages] = None
+    name_cn: Optional[str] = None
+    comment: Optional[int] = None
+    collects: Optional[int] = None
+    info: Optional[Legacy_MonoInfo] = None
+    actors: Optional[List[Legacy_MonoBase]] = None
+    role_name: Optional[str] = None
+
+
+class Legacy_SubjectLargeStaffItemImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_SubjectLargeStaffItem(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_SubjectLargeStaffItemImages] = None
+    name_cn: Optional[str] = None
+    comment: Optional[int] = None
+    collects: Optional[int] = None
+    info: Optional[Legacy_MonoInfo] = None
+    role_name: Optional[str] = None
+    jobs: Optional[List[str]] = None
+
+
+class Legacy_UserAvatar(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+
+
+Legacy_UserGroup = int
+
+
+class Legacy_User(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    username: Optional[str] = None
+    nickname: Optional[str] = None
+    avatar: Optional[Legacy_UserAvatar] = None
+    sign: Optional[str] = None
+    usergroup: Optional[Legacy_UserGroup] = None
+
+
+class Legacy_Topic(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    title: Optional[str] = None
+    main_id: Optional[int] = None
+    timestamp: Optional[int] = None
+    lastpost: Optional[int] = None
+    replies: Optional[int] = None
+    user: Optional[Legacy_User] = None
+
+
+class Legacy_Blog(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    image: Optional[str] = None
+    replies: Optional[int] = None
+    timestamp: Optional[int] = None
+    dateline: Optional[str] = None
+    user: Optional[Legacy_User] = None
+
+
+class Legacy_SubjectLarge(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    type: Optional[int] = None
+    name: Optional[str] = None
+    name_cn: Optional[str] = None
+    summary: Optional[str] = None
+    air_date: Optional[str] = None
+    air_weekday: Optional[int] = None
+    images: Optional[Legacy_SubjectLargeImages] = None
+    eps: Optional[List[Legacy_Episode]] = None
+    eps_count: Optional[int] = None
+    rating: Optional[Legacy_SubjectLargeRating] = None
+    rank: Optional[int] = None
+    collection: Optional[Legacy_SubjectLargeCollection] = None
+    crt: Optional[List[Legacy_SubjectLargeCrtItem]] = None
+    staff: Optional[List[Legacy_SubjectLargeStaffItem]] = None
+    topic: Optional[List[Legacy_Topic]] = None
+    blog: Optional[List[Legacy_Blog]] = None
+
+
+class Legacy_PersonImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_Person(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_PersonImages] = None
+    name_cn: Optional[str] = None
+    comment: Optional[int] = None
+    collects: Optional[int] = None
+    info: Optional[Legacy_MonoInfo] = None
+
+
+class Legacy_CharacterImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_Character(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_CharacterImages] = None
+    name_cn: Optional[str] = None
+    comment: Optional[int] = None
+    collects: Optional[int] = None
+    info: Optional[Legacy_MonoInfo] = None
+    actors: Optional[List[Legacy_MonoBase]] = None
+
+
+class Legacy_MonoImages(Model, kw_only=True):
+    large: Optional[str] = None
+    medium: Optional[str] = None
+    small: Optional[str] = None
+    grid: Optional[str] = None
+
+
+class Legacy_Mono(Model, kw_only=True):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    name: Optional[str] = None
+    images: Optional[Legacy_MonoImages] = None
+    name_cn: Optional[str] = None
+    comment: Optional[int] = None
+    collects: Optional[int] = None
+
+
+SubjectID = int
+
+
+UserGroup = int
+
+
+class Avatar(Model, kw_only=True):
+    large: str
+    medium: str
+    small: str
+
+
+class User(Model, kw_only=True):
+    id: int
+    username: str
+    nickname: str
+    user_group: UserGroup
+    avatar: Avatar
+    sign: str
+
+
+BloodType = int
+
+
+CharacterType = int
+
+
+class PersonImages(Model, kw_only=True):
+    large: str
+    medium: str
+    small: str
+    grid: str
+
+
+class Stat(Model, kw_only=True):
+    comments: int
+    collects: int
+
+
+class Character(Model, kw_only=True):
+    id: int
+    name: str
+    type: CharacterType
+    images: Optional[PersonImages] = None
+    summary: str
+    locked: bool
+    infobox: Optional[List[Dict[str, Any]]] = None
+    gender: Optional[str] = None
+    blood_type: Optional[BloodType] = None
+    birth_year: Optional[int] = None
+    birth_mon: Optional[int] = None
+    birth_day: Optional[int] = None
+    stat: Stat
+    nsfw: Optional[bool] = None
+
+
+SubjectType = int
+
+
+class CharacterPerson(Model, kw_only=True):
+    id: int
+    name: str
+    type: CharacterType
+    images: Optional[PersonImages] = None
+    subject_id: int
+    subject_type: SubjectType
+    subject_name: str
+    subject_name_cn: str
+    staff: Optional[str] = None
+
+
+SubjectCollectionType = int
+
+
+EpisodeCollectionType = int
+
+
+class Creator(Model, kw_only=True):
+    username: str
+    nickname: str
+
+
+class DetailedRevision(Model, kw_only=True):
+    id: int
+    type: int
+    creator: Optional[Creator] = None
+    summary: str
+    created_at: str
+    data: Optional[Dict[str, Any]] = None
+
+
+class PersonRevisionProfession(Model, kw_only=True):
+    producer: Optional[str] = None
+    mangaka: Optional[str] = None
+    artist: Optional[str] = None
+    seiyu: Optional[str] = None
+    writer: Optional[str] = None
+    illustrator: Optional[str] = None
+    actor: Optional[str] = None
+
+
+class RevisionExtra(Model, kw_only=True):
+    img: Optional[str] = None
+
+
+class PersonRevisionDataItem(Model, kw_only=True):
+    prsn_infobox: str
+    prsn_summary: str
+    profession: PersonRevisionProfession
+    extra: RevisionExtra
+    prsn_name: str
+
+
+class PersonRevision(Model, kw_only=True):
+    id: int
+    type: int
+    creator: Optional[Creator] = None
+    summary: str
+    created_at: str
+    data: Optional[Dict[str, PersonRevisionDataItem]] = None
+
+
+class SubjectRevisionData(Model, kw_only=True):
+    field_eps: int
+    field_infobox: str
+    field_summary: str
+    name: str
+    name_cn: str
+    platform: int
+    subject_id: int
+    type: int
+    type_id: int
+    vote_field: str
+
+
+class SubjectRevision(Model, kw_only=True):
+    id: int
+    type: int
+    creator: Optional[Creator] = None
+    summary: str
+    created_at: str
+    data: Optional[SubjectRevisionData] = None
+
+
+class CharacterRevision(Model, kw_only=True):
+    id: int
+    type: int
+    creator: Optional[Creator] = None
+    summary: str
+    created_at: str
+    data: Any = None
+
+
+class CharacterRevisionDataItem(Model, kw_only=True):
+    infobox: str
+    summary: str
+    name: str
+    extra: RevisionExtra
+
+
+EpType = int
+
+
+class Episode(Model, kw_only=True):
+    id: int
+    type: int
+    name: str
+    name_cn: str
+    sort: float
+    ep: Optional[float] = None
+    airdate: str
+    comment: int
+    duration: str
+    desc: str
+    disc: int
+    duration_seconds: Optional[int] = None
+
+
+class EpisodeDetail(Model, kw_only=True):
+    id: int
+    type: EpType
+    name: str
+    name_cn: str
+    sort: float
+    ep: Optional[float] = None
+    airdate: str
+    comment: int
+    duration: str
+    desc: str
+    disc: int
+    subject_id: int
+
+
+class ErrorDetailDetails(Model, kw_only=True):
+    error: Optional[str] = None
+    path: Optional[str] = None
+
+
+class ErrorDetail(Model, kw_only=True):
+    title: str
+    description: str
+    details: Optional[Union[str, ErrorDetailDetails]] = None
+
+
+class Images(Model, kw_only=True):
+    large: str
+    common: str
+    medium: str
+    small: str
+    grid: str
+
+
+class Index(Model, kw_only=True):
+    id: int
+    title: str
+    desc: str
+    total: Optional[int] = None
+    stat: Stat
+    created_at: str
+    updated_at: str
+    creator: Creator
+    ban: bool
+    nsfw: bool
+
+
+class WikiV0Item(Model, kw_only=True):
+    key: str
+    value: Union[str, List[Dict[str, Any]]]
+
+
+WikiV0 = List[WikiV0Item]
+
+
+class IndexSubject(Model, kw_only=True):
+    id: int
+    type: int
+    name: str
+    images: Optional[Images] = None
+    infobox: Optional[WikiV0] = None
+    date: Optional[str] = None
+    comment: str
+    added_at: str
+
+
+class IndexBasicInfo(Model, kw_only=True):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+
+class IndexSubjectAddInfo(Model, kw_only=True):
+    subject_id: Optional[int] = None
+    sort: Optional[int] = None
+    comment: Optional[str] = None
+
+
+class IndexSubjectEditInfo(Model, kw_only=True):
+    sort: Optional[int] = None
+    comment: Optional[str] = None
+
+
+class Page(Model, kw_only=True):
+    total: int
+    limit: int
+    offset: int
+
+
+class SubjectRatingCount(Model, kw_only=True):
+    n1: Optional[int] = msgspec.field(default=None, name="1")
+    n2: Optional[int] = msgspec.field(default=None, name="2")
+    n3: Optional[int] = msgspec.field(default=None, name="3")
+    n4: Optional[int] = msgspec.field(default=None, name="4")
+    n5: Optional[int] = msgspec.field(default=None, name="5")
+    n6: Optional[int] = msgspec.field(default=None, name="6")
+    n7: Optional[int] = msgspec.field(default=None, name="7")
+    n8: Optional[int] = msgspec.field(default=None, name="8")
+    n9: Optional[int] = msgspec.field(default=None, name="9")
+    n10: Optional[int] = msgspec.field(default=None, name="10")
+
+
+class SubjectRating(Model, kw_only=True):
+    rank: int
+    total: int
+    count: SubjectRatingCount
+    score: float
+
+
+class SubjectCollection(Model, kw_only=True):
+    wish: int
+    collect: int
+    doing: int
+    on_hold: int
+    dropped: int
+
+
+class SubjectTagsItem(Model, kw_only=True):
+    name: str
+    count: int
+
+
+SubjectTags = List[SubjectTagsItem]
+
+
+class Subject(Model, kw_only=True):
+    id: int
+    type: SubjectType
+    name: str
+    name_cn: str
+    summary: str
+    series: bool
+    nsfw: bool
+    locked: bool
+    date: Optional[str] = None
+    platform: str
+    images: Images
+    infobox: Optional[WikiV0] = None
+    volumes: int
+    eps: int
+    total_episodes: Optional[int] = None
+    rating: SubjectRating
+    collection: SubjectCollection
+    meta_tags: List[str]
+    tags: SubjectTags
+
+
+class Paged_Subject(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[Subject]] = None
+
+
+class Paged_Character(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[Character]] = None
+
+
+PersonType = int
+
+
+PersonCareer = str
+
+
+class Person(Model, kw_only=True):
+    id: int
+    name: str
+    type: PersonType
+    career: List[PersonCareer]
+    images: Optional[PersonImages] = None
+    short_summary: Optional[str] = None
+    locked: bool
+
+
+class Paged_Person(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[Person]] = None
+
+
+class Paged_Episode(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[Episode]] = None
+
+
+class Paged_IndexSubject(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[IndexSubject]] = None
+
+
+class Revision(Model, kw_only=True):
+    id: int
+    type: int
+    creator: Optional[Creator] = None
+    summary: str
+    created_at: str
+
+
+class Paged_Revision(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[Revision]] = None
+
+
+class SlimSubject(Model, kw_only=True):
+    id: int
+    type: SubjectType
+    name: str
+    name_cn: str
+    short_summary: str
+    date: Optional[str] = None
+    images: Images
+    volumes: int
+    eps: int
+    collection_total: int
+    score: float
+    rank: int
+    tags: SubjectTags
+
+
+class UserSubjectCollection(Model, kw_only=True):
+    subject_id: int
+    subject_type: SubjectType
+    rate: int
+    type: SubjectCollectionType
+    comment: Optional[str] = None
+    tags: List[str]
+    ep_status: int
+    vol_status: int
+    updated_at: str
+    private: bool
+    subject: Optional[SlimSubject] = None
+
+
+class Paged_UserCollection(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[UserSubjectCollection]] = None
+
+
+class UserCharacterCollection(Model, kw_only=True):
+    id: int
+    name: str
+    type: CharacterType
+    images: Optional[PersonImages] = None
+    created_at: str
+
+
+class Paged_UserCharacterCollection(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[UserCharacterCollection]] = None
+
+
+class UserPersonCollection(Model, kw_only=True):
+    id: int
+    name: str
+    type: PersonType
+    career: List[PersonCareer]
+    images: Optional[PersonImages] = None
+    created_at: str
+
+
+class Paged_UserPersonCollection(Model, kw_only=True):
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    data: Optional[List[UserPersonCollection]] = None
+
+
+class PersonCharacter(Model, kw_only=True):
+    id: int
+    name: str
+    type: CharacterType
+    images: Optional[PersonImages] = None
+    subject_id: int
+    subject_type: SubjectType
+    subject_name: str
+    subject_name_cn: str
+    staff: Optional[str] = None
+
+
+class PersonDetail(Model, kw_only=True):
+    id: int
+    name: str
+    type: PersonType
+    career: List[PersonCareer]
+    images: Optional[PersonImages] = None
+    summary: str
+    locked: bool
+    last_modified: str
+    infobox: Optional[List[Dict[str, Any]]] = None
+    gender: Optional[str] = None
+    blood_type: Optional[BloodType] = None
+    birth_year: Optional[int] = None
+    birth_mon: Optional[int] = None
+    birth_day: Optional[int] = None
+    stat: Stat
+
+
+class RelatedCharacter(Model, kw_only=True):
+    id: int
+    name: str
+    type: CharacterType
+    images: Optional[PersonImages] = None
+    relation: str
+    actors: Optional[List[Person]] = None
+
+
+class RelatedPerson(Model, kw_only=True):
+    id: int
+    name: str
+    type: PersonType
+    career: List[PersonCareer]
+    images: Optional[PersonImages] = None
+    relation: str
+    eps: str
+
+
+SubjectBookCategory = int
+
+
+SubjectAnimeCategory = int
+
+
+SubjectGameCategory = int
+
+
+SubjectRealCategory = int
+
+
+SubjectCategory = Union[SubjectBookCategory, SubjectAnimeCategory, SubjectGameCategory, SubjectRealCategory]
+
+
+class UserSubjectCollectionModifyPayload(Model, kw_only=True):
+    type: Optional[SubjectCollectionType] = None
+    rate: Optional[int] = None
+    ep_status: Optional[int] = None
+    vol_status: Optional[int] = None
+    comment: Optional[str] = None
+    private: Optional[bool] = None
+    tags: Optional[List[str]] = None
+
+
+class UserEpisodeCollection(Model, kw_only=True):
+    episode: Episode
+    type: EpisodeCollectionType
+    updated_at: int
+
+
+class v0_RelatedSubject(Model, kw_only=True):
+    id: int
+    type: SubjectType
+    staff: str
+    name: str
+    name_cn: str
+    image: Optional[str] = None
+
+
+class v0_subject_relation(Model, kw_only=True):
+    id: int
+    type: int
+    name: str
+    name_cn: str
+    images: Optional[Images] = None
+    relation: str
+
+
+__all__ = ["Model", "Legacy_SubjectType", "Legacy_SubjectSmall", "Legacy_SubjectMedium", "Legacy_MonoInfo", "Legacy_MonoBase", "Legacy_SubjectLarge", "Legacy_Episode", "Legacy_EpisodeType", "Legacy_Topic", "Legacy_User", "Legacy_UserGroup", "Legacy_Blog", "Legacy_Person", "Legacy_Character", "Legacy_Mono", "SubjectID", "User", "UserGroup", "Avatar", "BloodType", "Character", "CharacterType", "PersonImages", "Stat", "CharacterPerson", "SubjectType", "SubjectCollectionType", "EpisodeCollectionType", "Creator", "DetailedRevision", "PersonRevision", "PersonRevisionDataItem", "PersonRevisionProfession", "RevisionExtra", "SubjectRevision", "SubjectRevisionData", "CharacterRevision", "CharacterRevisionDataItem", "EpType", "Episode", "EpisodeDetail", "ErrorDetail", "Images", "Index", "IndexSubject", "WikiV0", "IndexBasicInfo", "IndexSubjectAddInfo", "IndexSubjectEditInfo", "Page", "Paged_Subject", "Subject", "SubjectTags", "Paged_Character", "Paged_Person", "Person", "PersonType", "PersonCareer", "Paged_Episode", "Paged_IndexSubject", "Paged_Revision", "Revision", "Paged_UserCollection", "UserSubjectCollection", "SlimSubject", "Paged_UserCharacterCollection", "UserCharacterCollection", "Paged_UserPersonCollection", "UserPersonCollection", "PersonCharacter", "PersonDetail", "RelatedCharacter", "RelatedPerson", "SubjectBookCategory", "SubjectAnimeCategory", "SubjectGameCategory", "SubjectRealCategory", "SubjectCategory", "UserSubjectCollectionModifyPayload", "UserEpisodeCollection", "v0_RelatedSubject", "v0_subject_relation"]
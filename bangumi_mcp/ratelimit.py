@@ -0,0 +1,147 @@
+"""Client-side rate limiting for the Bangumi API."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header.
+
+    Args:
+        value: Header value, either a number of seconds or an HTTP date.
+    Returns:
+        Delay in seconds, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Async token bucket with adaptive backoff on throttling.
+
+    Callers queue on acquire() until a token is available instead of failing.
+    When the server answers 429, the refill rate is halved (down to min_rate)
+    and the bucket is paused for the Retry-After delay; each successful request
+    then raises the rate again by recovery_step until it is back at the
+    configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 10,
+        min_rate: float = 0.5,
+        recovery_step: float = 0.1,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            rate: Sustained request rate in requests per second.
+            burst: Bucket capacity, i.e. the number of requests allowed at once.
+            min_rate: Lower bound of the rate after adaptive backoff.
+            recovery_step: Rate increase per successful request while backed off.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate)
+        self.recovery_step = recovery_step
+        self.current_rate = rate
+        self.waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.current_rate)
+
+    async def acquire(self) -> float:
+        """Wait until a request may be sent.
+
+        Returns:
+            Time spent waiting in seconds.
+        """
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            # asyncio.Lock wakes waiters in FIFO order, so callers are served in turn.
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._blocked_until:
+                        await asyncio.sleep(self._blocked_until - now)
+                        continue
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self._tokens) / self.current_rate)
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def on_success(self) -> None:
+        """Record a request that was not throttled."""
+        if self.current_rate < self.rate:
+            self.current_rate = min(self.rate, self.current_rate + self.recovery_step)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> float:
+        """Record a 429 response and back off.
+
+        Args:
+            retry_after: Delay requested by the server in seconds, if any.
+        Returns:
+            The delay applied before the next request in seconds.
+        """
+        self.throttled += 1
+        self.current_rate = max(self.min_rate, self.current_rate / 2)
+        delay = retry_after if retry_after is not None else 1 / self.current_rate
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + delay)
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limiter counters.
+
+        Returns:
+            Dictionary with configured and current rate, queue depth, wait times
+            and the number of throttled responses.
+        """
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "current_rate": self.current_rate,
+            "queue_depth": self.waiting,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_wait": self.total_wait,
+            "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "max_wait": self.max_wait,
+        }
@@ -0,0 +1,90 @@
+"""Bounded pool of background cache refreshes."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """Run cache refreshes in the background with bounded concurrency.
+
+    A refresh is submitted under its cache key and is dropped if one for the
+    same key is already pending or the queue is full, since a later request
+    will submit it again. Refreshes send their requests through the client,
+    so they wait for the same rate limiter as foreground requests; the worker
+    limit keeps them from using up its tokens.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 64):
+        """Initialize the pool.
+
+        Args:
+            max_workers: Maximum number of refreshes running at once.
+            max_pending: Maximum number of refreshes running or waiting.
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.submitted = 0
+        self.dropped = 0
+        self.failed = 0
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._tasks: Dict[str, "asyncio.Task[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """Schedule a refresh.
+
+        Args:
+            key: Cache key being refreshed.
+            refresh: Coroutine function doing the refresh.
+        Returns:
+            Whether the refresh was scheduled.
+        """
+        if key in self._tasks or len(self._tasks) >= self.max_pending:
+            self.dropped += 1
+            return False
+        task = asyncio.ensure_future(self._run(key, refresh))
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        self.submitted += 1
+        return True
+
+    async def _run(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        async with self._semaphore:
+            try:
+                await refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Background refresh of {key} failed: {type(e).__name__}: {e}")
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    async def close(self) -> None:
+        """Cancel pending refreshes and wait for them to finish."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Return refresh counters.
+
+        Returns:
+            Dictionary with the number of refreshes submitted, dropped, failed and
+            currently pending.
+        """
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "pending": len(self._tasks),
+        }
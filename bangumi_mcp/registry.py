@@ -0,0 +1,248 @@
+"""Tool dispatch registry with precompiled argument and output validators."""
+
+import asyncio
+import functools
+import logging
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import mcp.types as types
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+
+from .utils import env_float
+
+try:
+    import fastjsonschema
+except ImportError:  # optional, install the "validation" extra
+    fastjsonschema = None
+
+
+logger = logging.getLogger(__name__)
+
+ToolHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def describe_error(validator: Draft202012Validator, instance: Any) -> str:
+    """Describe the most relevant validation error of an invalid instance."""
+    error = best_match(validator.iter_errors(instance))
+    location = "/".join(str(part) for part in error.absolute_path)
+    if location:
+        return f"{location}: {error.message}"
+    return error.message
+
+
+class OutputValidationPolicy:
+    """Decide which tool results are validated against their output schema.
+
+    full validates every result and turns a mismatch into an error, sampled
+    validates a random share of results and only logs mismatches, off skips
+    validation.
+    """
+
+    MODES = ("full", "sampled", "off")
+
+    def __init__(self, mode: str = "full", sample_rate: float = 0.1):
+        """Initialize the policy.
+
+        Args:
+            mode: One of full, sampled or off.
+            sample_rate: Share of results validated in sampled mode, from 0 to 1.
+        Raises:
+            ValueError: If mode is unknown.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown output validation mode: {mode}")
+        self.mode = mode
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.validated = 0
+        self.skipped = 0
+        self.failures = 0
+        self.total_time = 0.0
+
+    @classmethod
+    def from_env(cls) -> "OutputValidationPolicy":
+        """Create the policy from BANGUMI_OUTPUT_VALIDATION and BANGUMI_OUTPUT_VALIDATION_SAMPLE_RATE."""
+        mode = (os.getenv("BANGUMI_OUTPUT_VALIDATION") or "full").strip().lower()
+        if mode not in cls.MODES:
+            logger.warning(f"Unknown BANGUMI_OUTPUT_VALIDATION={mode!r}, using full")
+            mode = "full"
+        return cls(mode, env_float("BANGUMI_OUTPUT_VALIDATION_SAMPLE_RATE", 0.1))
+
+    def should_validate(self) -> bool:
+        """Draw whether the next result is validated."""
+        if self.mode == "full" or (self.mode == "sampled" and random.random() < self.sample_rate):
+            return True
+        self.skipped += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return validation counters.
+
+        Returns:
+            Dictionary with the mode, sample rate, number of validated, skipped
+            and failed results and the average validation time in seconds.
+        """
+        return {
+            "mode": self.mode,
+            "sample_rate": self.sample_rate,
+            "validated": self.validated,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "avg_time": self.total_time / self.validated if self.validated else 0.0,
+        }
+
+
+class OutputValidator:
+    """An output schema with its validators, compiled on first use."""
+
+    __slots__ = ("schema", "_validator", "_check")
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self._validator: Optional[Draft202012Validator] = None
+        self._check: Optional[Callable[[Any], bool]] = None
+
+    @property
+    def validator(self) -> Draft202012Validator:
+        """jsonschema validator of the schema, which also describes mismatches."""
+        if self._validator is None:
+            self._validator = Draft202012Validator(self.schema)
+        return self._validator
+
+    def _compile_check(self) -> Callable[[Any], bool]:
+        if fastjsonschema is None:
+            return self.validator.is_valid
+        # Generated Python code validates large results many times faster than
+        # jsonschema. Defaults and formats are left alone to match jsonschema.
+        validate = fastjsonschema.compile(
+            self.schema, use_default=False, use_formats=False, detailed_exceptions=False
+        )
+
+        def is_valid(instance: Any) -> bool:
+            try:
+                validate(instance)
+            except fastjsonschema.JsonSchemaException:
+                return False
+            return True
+
+        return is_valid
+
+    def is_valid(self, instance: Any) -> bool:
+        """Check an instance with the fastest validator available."""
+        if self._check is None:
+            self._check = self._compile_check()
+        return self._check(instance)
+
+
+class ToolEntry:
+    """A registered tool: its definition, handler and compiled validators."""
+
+    __slots__ = ("tool", "handler", "validator", "output", "strict_output")
+
+    def __init__(self, tool: types.Tool, handler: ToolHandler, strict_output_schema: Optional[Dict[str, Any]] = None):
+        """Initialize the entry.
+
+        Args:
+            tool: Tool definition.
+            handler: Coroutine function called with the tool arguments.
+            strict_output_schema: Schema of results not trimmed by a fields
+                argument, if the tool's output schema is relaxed to accept trimmed
+                ones. Defaults to the tool's output schema.
+        """
+        self.tool = tool
+        self.handler = handler
+        Draft202012Validator.check_schema(tool.inputSchema)
+        self.validator = Draft202012Validator(tool.inputSchema)
+        self.output = OutputValidator(tool.outputSchema) if tool.outputSchema is not None else None
+        self.strict_output = OutputValidator(strict_output_schema) if strict_output_schema is not None else self.output
+
+    def check_arguments(self, arguments: Dict[str, Any]) -> Optional[str]:
+        """Validate arguments against the tool's input schema.
+
+        Args:
+            arguments: Tool arguments.
+        Returns:
+            A description of the first problem found, or None if the arguments are valid.
+        """
+        if self.validator.is_valid(arguments):
+            return None
+        return describe_error(self.validator, arguments)
+
+    def check_output(
+        self,
+        result: Dict[str, Any],
+        policy: OutputValidationPolicy,
+        projected: bool = False,
+    ) -> Optional[str]:
+        """Validate a structured result according to the policy.
+
+        Args:
+            result: Structured tool result.
+            policy: Output validation policy.
+            projected: Whether the result was trimmed by a fields argument, in which
+                case it is checked against the relaxed output schema.
+        Returns:
+            A description of the mismatch if the result is invalid and the policy
+            rejects invalid results, otherwise None.
+        """
+        output = self.output if projected else self.strict_output
+        if output is None or not policy.should_validate():
+            return None
+        started = time.perf_counter()
+        valid = output.is_valid(result)
+        policy.validated += 1
+        policy.total_time += time.perf_counter() - started
+        if valid:
+            return None
+        policy.failures += 1
+        # jsonschema reports the most relevant error, the fast path only says whether the result is valid.
+        problem = describe_error(output.validator, result)
+        if policy.mode == "sampled":
+            logger.warning(f"Output of {self.tool.name} does not match its schema: {problem}")
+            return None
+        return problem
+
+
+def build_registry(
+    module: Any,
+    tool_list: list,
+    strict_output_schemas: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, ToolEntry]:
+    """Map each listed tool to its handler in module.
+
+    Args:
+        module: Module holding one coroutine function per tool, named after the tool.
+        tool_list: Tool definitions served by list_tools.
+        strict_output_schemas: Schemas of untrimmed results by tool name, for tools
+            whose listed output schema is relaxed to accept results trimmed by a
+            fields argument.
+    Returns:
+        Dictionary from tool name to ToolEntry.
+    Raises:
+        TypeError: If a listed tool has no coroutine function in module.
+    """
+    registry = {}
+    for tool in tool_list:
+        handler = getattr(module, tool.name, None)
+        if not asyncio.iscoroutinefunction(handler):
+            raise TypeError(f"Tool {tool.name} has no async handler")
+        registry[tool.name] = ToolEntry(tool, handler, (strict_output_schemas or {}).get(tool.name))
+    return registry
+
+
+@functools.lru_cache(maxsize=None)
+def get_output_policy() -> OutputValidationPolicy:
+    """Return the server's output validation policy, read from the environment on first use."""
+    return OutputValidationPolicy.from_env()
+
+
+@functools.lru_cache(maxsize=None)
+def get_registry() -> Dict[str, ToolEntry]:
+    """Return the registry of the server's tools, built on first use."""
+    from . import tools
+    from .tool_list import strict_output_schemas, tool_list
+
+    return build_registry(tools, tool_list, strict_output_schemas)
@@ -0,0 +1,145 @@
+"""Retry policy and circuit breaker for requests to the Bangumi API."""
+
+import random
+import time
+from typing import Any, Dict, Optional
+
+
+# Upstream statuses that indicate a transient failure worth retrying.
+RETRYABLE_STATUS = frozenset({500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit breaker is open."""
+
+    def __init__(self, host: str, retry_after: float):
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"{host} is unavailable, requests are suspended for {retry_after:.0f}s")
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter and an overall deadline."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        deadline: float = 20.0,
+    ):
+        """Initialize the policy.
+
+        Args:
+            max_attempts: Maximum number of attempts per call, including the first one.
+            base_delay: Backoff before the first retry in seconds, doubled on each retry.
+            max_delay: Upper bound of a single backoff in seconds.
+            deadline: Upper bound of the time spent on one call in seconds.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(self, attempt: int) -> float:
+        """Get the delay before a retry.
+
+        Args:
+            attempt: Number of attempts made so far, starting at 1.
+        Returns:
+            Delay in seconds, drawn uniformly from zero to the capped exponential bound.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and requests
+    fail fast with CircuitOpenError. Once recovery_timeout has passed, a single
+    probe request is let through: its success closes the circuit, its failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """Initialize the breaker.
+
+        Args:
+            host: Host the breaker guards, used in error messages.
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_timeout: Seconds to wait before probing an open circuit.
+        """
+        self.host = host
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_request(self) -> None:
+        """Check whether a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe
+                already in flight.
+        """
+        if self.state == self.CLOSED:
+            return
+        remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(self.host, max(remaining, 1.0))
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self.failures = 0
+        self._probing = False
+        self.state = self.CLOSED
+
+    def abandon(self) -> None:
+        """Forget a request that ended without an outcome, such as a cancelled probe."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return breaker state and counters."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+def remaining_time(started: float, deadline: Optional[float]) -> float:
+    """Get the time left before a deadline measured from started.
+
+    Args:
+        started: time.monotonic() value when the call started.
+        deadline: Deadline in seconds, or None for no deadline.
+    Returns:
+        Seconds left, which may be negative; infinity if there is no deadline.
+    """
+    if deadline is None:
+        return float("inf")
+    return started + deadline - time.monotonic()
@@ -0,0 +1,61 @@
+"""Coalescing of identical concurrent requests."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it is still running await the same task. Each caller waits
+    through asyncio.shield, so a caller that is cancelled gives up its own wait
+    without cancelling the shared work for the others.
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.shared = 0
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func once for all concurrent callers with the same key.
+
+        Args:
+            key: Key identifying the call.
+            func: Coroutine function doing the work.
+        Returns:
+            The result of func, shared by all callers.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.started += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Return coalescing counters.
+
+        Returns:
+            Dictionary with the number of calls started, calls that joined an
+            in-flight call, and calls currently in flight.
+        """
+        return {
+            "started": self.started,
+            "shared": self.shared,
+            "in_flight": len(self._calls),
+        }
@@ -1,8 +1,48 @@
+import functools
+from typing import List
+
 import mcp.types as types
-from bangumi_mcp.utils import resolve_json_schema
+from bangumi_mcp.utils import compact_schema, env_bool, partial_schema, resolve_json_schema
 
 json_schema = resolve_json_schema("dist.json")
 
+# 支持字段投影的工具共用的 fields 参数
+fields_property = {
+    "type": "array",
+    "items": {"type": "string"},
+    "minItems": 1,
+    "description": "只返回指定字段以减少数据量，嵌套字段用点分隔，例如 [\"name_cn\", \"rating.score\"]；分页结果作用于 data 中的每一项"
+}
+
+# 支持自动翻页的工具共用的 max_items 参数，上限避免一次调用发出过多请求
+max_items_property = {
+    "type": "integer",
+    "description": "自动翻页获取的最大结果数量，设置后从 offset 开始连续获取多页并合并返回，不设置则只返回一页",
+    "minimum": 1,
+    "maximum": 1000
+}
+
+# 原 schema 对象到其部分字段版本的映射，保持共享的子 schema 仍然共享
+_partial_schemas = {}
+
+
+def projectable(schema):
+    """
+    Output schema of a tool with a fields argument, which also accepts results trimmed to some fields.
+    Only the result is relaxed, an ErrorDetail alternative keeps its required fields.
+    """
+    error_detail = json_schema["components"]["schemas"]["ErrorDetail"]
+    branches = schema.get("oneOf")
+    if branches is None or not any(branch is error_detail for branch in branches):
+        return partial_schema(schema, _partial_schemas)
+    relaxed = {k: v for k, v in schema.items() if k != "oneOf"}
+    # 去掉 required 后结果分支也能匹配错误，因此改为 anyOf
+    relaxed["anyOf"] = [
+        branch if branch is error_detail else partial_schema(branch, _partial_schemas)
+        for branch in branches
+    ]
+    return relaxed
+
 tool_list = [
         types.Tool(
             name="get_current_time",
@@ -137,7 +177,9 @@ tool_list = [
                         "type": "integer",
                         "description": "分页偏移量，默认0",
                         "default": 0
-                    }
+                    },
+                    "max_items": max_items_property,
+                    "fields": fields_property
                 },
                 "required": ["keyword"]
             },
@@ -204,7 +246,9 @@ tool_list = [
                         "type": "integer",
                         "description": "分页偏移量",
                         "default": 0
-                    }
+                    },
+                    "max_items": max_items_property,
+                    "fields": fields_property
                 }
             },
             outputSchema={
@@ -224,7 +268,8 @@ tool_list = [
                     "subject_id": {
                         "type": "integer",
                         "description": "条目ID"
-                    }
+                    },
+                    "fields": fields_property
                 },
                 "required": ["subject_id"]
             },
@@ -236,6 +281,56 @@ tool_list = [
                 ]
             }
         ),
+        types.Tool(
+            name="get_subjects_info_many",
+            description="批量获取多个条目的详细信息，用于一次比较或查看多个条目",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "subject_ids": {
+                        "type": "array",
+                        "description": "条目ID列表，最多50个",
+                        "items": {
+                            "type": "integer"
+                        },
+                        "minItems": 1,
+                        "maxItems": 50
+                    }
+                },
+                "required": ["subject_ids"]
+            },
+            outputSchema={
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "description": "成功获取的条目信息",
+                        "items": json_schema["components"]["schemas"]["Subject"]
+                    },
+                    "errors": {
+                        "type": "array",
+                        "description": "获取失败的条目ID及错误信息",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {
+                                    "type": "integer",
+                                    "description": "条目ID"
+                                },
+                                "status": {
+                                    "type": "integer",
+                                    "description": "HTTP 状态码，未收到响应时不返回"
+                                },
+                                "error": {
+                                    "type": "object",
+                                    "description": "错误信息"
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        ),
         #   types.Tool(
         #       name="get_subject_image",
         #       description="获取条目图片 URL",
@@ -341,6 +436,59 @@ tool_list = [
                 ]
             }
         ),
+        types.Tool(
+            name="get_subject_full",
+            description="一次获取条目详细信息及其相关人物、角色、相关条目和剧集，需要条目的多方面信息时优先使用",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "subject_id": {
+                        "type": "integer",
+                        "description": "条目ID"
+                    },
+                    "sections": {
+                        "type": "array",
+                        "description": "需要获取的部分：subject=条目信息，persons=相关人物，characters=角色，relations=相关条目，episodes=剧集，默认全部",
+                        "items": {
+                            "type": "string",
+                            "enum": ["subject", "persons", "characters", "relations", "episodes"]
+                        }
+                    }
+                },
+                "required": ["subject_id"]
+            },
+            outputSchema={
+                "type": "object",
+                "oneOf": [
+                    json_schema["components"]["schemas"]["ErrorDetail"],
+                    {
+                        "type": "object",
+                        "properties": {
+                            "subject": json_schema["components"]["schemas"]["Subject"],
+                            "persons": {
+                                "type": "array",
+                                "items": json_schema["components"]["schemas"]["RelatedPerson"]
+                            },
+                            "characters": {
+                                "type": "array",
+                                "items": json_schema["components"]["schemas"]["RelatedCharacter"]
+                            },
+                            "relations": {
+                                "type": "array",
+                                "items": json_schema["components"]["schemas"]["v0_subject_relation"]
+                            },
+                            "episodes": json_schema["components"]["schemas"]["Paged_Episode"],
+                            "errors": {
+                                "type": "object",
+                                "description": "获取失败的部分及错误信息"
+                            }
+                        },
+                        # 不允许其他字段，使 ErrorDetail 只匹配错误分支
+                        "additionalProperties": False
+                    }
+                ]
+            }
+        ),
         types.Tool(
             name="get_episodes",
             description="获取条目剧集信息",
@@ -365,7 +513,9 @@ tool_list = [
                         "type": "integer",
                         "description": "分页偏移量",
                         "default": 0
-                    }
+                    },
+                    "max_items": max_items_property,
+                    "fields": fields_property
                 },
                 "required": ["subject_id"]
             },
@@ -386,7 +536,8 @@ tool_list = [
                     "episode_id": {
                         "type": "integer",
                         "description": "剧集ID"
-                    }
+                    },
+                    "fields": fields_property
                 },
                 "required": ["episode_id"]
             },
@@ -429,7 +580,9 @@ tool_list = [
                         "type": "integer",
                         "description": "分页偏移量",
                         "default": 0
-                    }
+                    },
+                    "max_items": max_items_property,
+                    "fields": fields_property
                 },
                 "required": ["keyword"]
             },
@@ -450,7 +603,8 @@ tool_list = [
                     "character_id": {
                         "type": "integer",
                         "description": "角色ID"
-                    }
+                    },
+                    "fields": fields_property
                 },
                 "required": ["character_id"]
             },
@@ -462,6 +616,56 @@ tool_list = [
                 ]
             }
         ),
+        types.Tool(
+            name="get_characters_info_many",
+            description="批量获取多个角色的详细信息，用于一次比较或查看多个角色",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "character_ids": {
+                        "type": "array",
+                        "description": "角色ID列表，最多50个",
+                        "items": {
+                            "type": "integer"
+                        },
+                        "minItems": 1,
+                        "maxItems": 50
+                    }
+                },
+                "required": ["character_ids"]
+            },
+            outputSchema={
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "description": "成功获取的角色信息",
+                        "items": json_schema["components"]["schemas"]["Character"]
+                    },
+                    "errors": {
+                        "type": "array",
+                        "description": "获取失败的角色ID及错误信息",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {
+                                    "type": "integer",
+                                    "description": "角色ID"
+                                },
+                                "status": {
+                                    "type": "integer",
+                                    "description": "HTTP 状态码，未收到响应时不返回"
+                                },
+                                "error": {
+                                    "type": "object",
+                                    "description": "错误信息"
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        ),
         types.Tool(
             name="get_character_subjects",
             description="获取角色相关条目信息列表",
@@ -608,7 +812,9 @@ tool_list = [
                         "type": "integer",
                         "description": "分页偏移量",
                         "default": 0
-                    }
+                    },
+                    "max_items": max_items_property,
+                    "fields": fields_property
                 },
                 "required": ["keyword"]
             },
@@ -623,7 +829,8 @@ tool_list = [
                     "person_id": {
                         "type": "integer",
                         "description": "人物ID"
-                    }
+                    },
+                    "fields": fields_property
                 },
                 "required": ["person_id"]
             },
@@ -635,6 +842,56 @@ tool_list = [
                 ]
             }
         ),
+        types.Tool(
+            name="get_persons_info_many",
+            description="批量获取多个人物的详细信息，用于一次比较或查看多个人物",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "person_ids": {
+                        "type": "array",
+                        "description": "人物ID列表，最多50个",
+                        "items": {
+                            "type": "integer"
+                        },
+                        "minItems": 1,
+                        "maxItems": 50
+                    }
+                },
+                "required": ["person_ids"]
+            },
+            outputSchema={
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "description": "成功获取的人物信息",
+                        "items": json_schema["components"]["schemas"]["PersonDetail"]
+                    },
+                    "errors": {
+                        "type": "array",
+                        "description": "获取失败的人物ID及错误信息",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {
+                                    "type": "integer",
+                                    "description": "人物ID"
+                                },
+                                "status": {
+                                    "type": "integer",
+                                    "description": "HTTP 状态码，未收到响应时不返回"
+                                },
+                                "error": {
+                                    "type": "object",
+                                    "description": "错误信息"
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        ),
         types.Tool(
             name="get_person_subjects",
             description="获取人物相关条目列表",
@@ -822,7 +1079,9 @@ tool_list = [
                             }
                         },
                         "default": {}
-                    }
+                    },
+                    "max_items": max_items_property,
+                    "fields": fields_property
                 },
                 "required": ["username"]
             },
@@ -847,7 +1106,8 @@ tool_list = [
                     "subject_id": {
                         "type": "integer",
                         "description": "条目ID"
-                    }
+                    },
+                    "fields": fields_property
                 },
                 "required": ["username", "subject_id"]
             },
@@ -1064,6 +1324,88 @@ tool_list = [
                 ]
             }
         ),
+        types.Tool(
+            name="patch_my_episode_progress",
+            description="为当前用户按集数范围批量更改剧集收藏状态，例如将前 N 集标记为看过，返回每一集的结果",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "subject_id": {
+                        "type": "integer",
+                        "description": "条目ID"
+                    },
+                    "up_to": {
+                        "type": "number",
+                        "description": "更新 sort 不超过该值的所有剧集，例如 12 表示第 1 至 12 集"
+                    },
+                    "start": {
+                        "type": "number",
+                        "description": "范围起始的 sort（包含），不设置则从第一集开始"
+                    },
+                    "end": {
+                        "type": "number",
+                        "description": "范围结束的 sort（包含），不设置则到最后一集"
+                    },
+                    "episode_type": {
+                        "type": "integer",
+                        "description": "集数类型：0=本篇，1=特别篇，2=OP, 3=ED，4=预告/宣传/广告，5=MAD，6=其他",
+                        "default": 0
+                    },
+                    "type": {
+                        "type": "integer",
+                        "description": "收藏类型：0=未收藏，1=想看，2=看过，3=抛弃",
+                        "default": 2
+                    },
+                },
+                "required": ["subject_id"]
+            },
+            outputSchema={
+                "type": "object",
+                "oneOf": [
+                    json_schema["components"]["schemas"]["ErrorDetail"],
+                    {
+                        "type": "object",
+                        "properties": {
+                            "subject_id": {
+                                "type": "integer",
+                                "description": "条目ID"
+                            },
+                            "type": {
+                                "type": "integer",
+                                "description": "收藏类型"
+                            },
+                            "requests": {
+                                "type": "integer",
+                                "description": "发送的更新请求数"
+                            },
+                            "updated": {
+                                "type": "integer",
+                                "description": "更新成功的剧集数"
+                            },
+                            "failed": {
+                                "type": "integer",
+                                "description": "更新失败的剧集数"
+                            },
+                            "episodes": {
+                                "type": "array",
+                                "description": "每一集的结果，按 sort 排序",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "id": {"type": "integer", "description": "剧集ID"},
+                                        "sort": {"type": "number", "description": "剧集排序"},
+                                        "name": {"type": "string", "description": "剧集名称"},
+                                        "updated": {"type": "boolean", "description": "是否更新成功"},
+                                        "error": json_schema["components"]["schemas"]["ErrorDetail"]
+                                    }
+                                }
+                            }
+                        },
+                        "required": ["subject_id", "type", "requests", "updated", "failed", "episodes"]
+                    }
+                ]
+            }
+        ),
         types.Tool(
             name="get_my_episode_collection_info",
             description="获取当前用户指定剧集收藏条目",
@@ -1215,3 +1557,39 @@ tool_list = [
             }
         )
     ]
+
+# 有 fields 参数的工具列出放宽后的 output schema，以接受只含部分字段的结果；
+# 原 schema 保留在这里，未投影的结果仍按它严格校验
+strict_output_schemas = {}
+for tool in tool_list:
+    if "fields" in tool.inputSchema["properties"] and tool.outputSchema is not None:
+        strict_output_schemas[tool.name] = tool.outputSchema
+        tool.outputSchema = projectable(tool.outputSchema)
+
+
+@functools.lru_cache(maxsize=None)
+def compact_tool_list() -> List[types.Tool]:
+    """
+    tool_list with shared components hoisted into per-tool $defs and example fields removed, built once.
+    """
+    names = {}
+    for name, schema in json_schema["components"]["schemas"].items():
+        names[id(schema)] = name
+        if id(schema) in _partial_schemas:
+            names[id(_partial_schemas[id(schema)])] = f"{name}_Partial"
+    return [
+        tool.model_copy(update={
+            "inputSchema": compact_schema(tool.inputSchema, names),
+            "outputSchema": compact_schema(tool.outputSchema, names) if tool.outputSchema else None,
+        })
+        for tool in tool_list
+    ]
+
+
+def get_tool_list() -> List[types.Tool]:
+    """
+    Tool list served by list_tools, the compact variant if BANGUMI_COMPACT_TOOLS is set.
+    """
+    if env_bool("BANGUMI_COMPACT_TOOLS", False):
+        return compact_tool_list()
+    return tool_list
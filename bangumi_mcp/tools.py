@@ -1,20 +1,28 @@
 import logging
 from datetime import datetime
-from jsonschema import validate
 import mcp.types as types
-from bangumi_mcp.bangumi_client import BangumiClient
-from bangumi_mcp.utils import remove_null_items
+from bangumi_mcp.bangumi_client import get_client
 
 
 logger = logging.getLogger(__name__)
 
 
-# Initialize Bangumi client
-try:
-    bangumi_client = BangumiClient()
-except Exception as e:
-    logger.error(f"Failed to initialize Bangumi client: {e}")
-    raise RuntimeError("Bangumi client initialization failed") from e
+def _batch_results(results):
+    """
+    将批量查询结果整理为成功结果列表和失败列表
+    """
+    found = []
+    errors = []
+    for entity_id, status_code, data in results:
+        if status_code is not None and status_code < 400:
+            found.append(data)
+        else:
+            error = {"id": entity_id, "error": data}
+            if status_code is not None:
+                error["status"] = status_code
+            errors.append(error)
+
+    return {"results": found, "errors": errors}
 
 
 async def get_current_time(arguments):
@@ -32,7 +40,7 @@ async def get_calendar(arguments):
     """
     [GET] /calendar 每日放送
     """
-    status_code, calendar = await bangumi_client.get_calendar()
+    status_code, calendar = await get_client().get_calendar()
 
     return {"calendar": calendar}
 
@@ -40,21 +48,37 @@ async def get_calendar(arguments):
 async def search_subjects(arguments):
     """
     [POST] /v0/search/subjects 搜索条目
+    传入 max_items 时自动翻页并合并结果
     """
-    status_code, results = await bangumi_client.search_subjects(arguments)
+    params = dict(arguments or {})
+    max_items = params.pop("max_items", None)
+    fields = params.pop("fields", None)
+    client = get_client()
 
-    return remove_null_items(results)
+    if max_items:
+        status_code, results = await client.collect(client.search_subjects, params, max_items, fields=fields)
+    else:
+        status_code, results = await client.search_subjects(params, fields=fields)
+
+    return results
 
 
 async def get_subjects(arguments):
     """
     [GET] /v0/subjects 浏览条目
-    通过类型和分页获取条目列表
+    通过类型和分页获取条目列表，传入 max_items 时自动翻页并合并结果
     """
+    params = dict(arguments or {})
+    max_items = params.pop("max_items", None)
+    fields = params.pop("fields", None)
+    client = get_client()
 
-    status_code, results = await bangumi_client.get_subjects(arguments)
+    if max_items:
+        status_code, results = await client.collect(client.get_subjects, params, max_items, fields=fields)
+    else:
+        status_code, results = await client.get_subjects(params, fields=fields)
 
-    return remove_null_items(results)
+    return results
 
 
 async def get_subject_info(arguments):
@@ -69,9 +93,27 @@ async def get_subject_info(arguments):
             text="Error: subject_id parameter is required"
         )]
     
-    status_code, info = await bangumi_client.get_subject_info(subject_id)
+    status_code, info = await get_client().get_subject_info(subject_id, fields=arguments.get("fields"))
+
+    return info
+
+
+async def get_subjects_info_many(arguments):
+    """
+    [GET] /v0/subjects/{subject_id} 批量获取条目详细信息
+    """
+    args = arguments or {}
+    subject_ids = args.get("subject_ids")
+
+    if not subject_ids:
+        return [types.TextContent(
+            type="text",
+            text="Error: subject_ids parameter is required"
+        )]
+
+    results = await get_client().get_subjects_info_many(subject_ids)
 
-    return remove_null_items(info)
+    return _batch_results(results)
 
 async def get_subject_image(arguments):
     """
@@ -91,7 +133,7 @@ async def get_subject_image(arguments):
             text="Error: type parameter must be one of ['small', 'grid', 'large', 'medium', 'common']"
         )]
 
-    status_code, image = await bangumi_client.get_subject_image(subject_id, {"type": type})
+    status_code, image = await get_client().get_subject_image(subject_id, {"type": type})
 
 
     if status_code >= 400:
@@ -113,7 +155,7 @@ async def get_subject_persons(arguments):
             text="Error: subject_id parameter is required"
         )]
     
-    status_code, persons = await bangumi_client.get_subject_persons(subject_id)
+    status_code, persons = await get_client().get_subject_persons(subject_id)
 
     if status_code >= 400:
         return persons
@@ -134,7 +176,7 @@ async def get_subject_characters(arguments):
             text="Error: subject_id parameter is required"
         )]
     
-    status_code, characters = await bangumi_client.get_subject_characters(subject_id)
+    status_code, characters = await get_client().get_subject_characters(subject_id)
 
     if status_code >= 400:
         return characters
@@ -155,7 +197,7 @@ async def get_subject_relations(arguments):
             text="Error: subject_id parameter is required"
         )]
     
-    status_code, relations = await bangumi_client.get_subject_relations(subject_id)
+    status_code, relations = await get_client().get_subject_relations(subject_id)
 
     if status_code >= 400:
         return relations
@@ -163,12 +205,36 @@ async def get_subject_relations(arguments):
         return {"subject_relations": relations}
 
 
+async def get_subject_full(arguments):
+    """
+    并发获取条目详细信息、相关人物、角色、相关条目和剧集，合并为一个结果
+    """
+    args = arguments or {}
+    subject_id = args.get("subject_id")
+    sections = args.get("sections")
+
+    if not subject_id:
+        return [types.TextContent(
+            type="text",
+            text="Error: subject_id parameter is required"
+        )]
+
+    status_code, result = await get_client().get_subject_full(subject_id, sections)
+
+    return result
+
+
 #-------------------------剧集/章节-------------------------
 async def get_episodes(arguments):
     """
     [GET] /v0/episodes 获取条目剧集/章节信息
+    传入 max_items 时自动翻页并合并结果
     """
-    subject_id = arguments.get("subject_id")
+    params = dict(arguments or {})
+    max_items = params.pop("max_items", None)
+    fields = params.pop("fields", None)
+    client = get_client()
+    subject_id = params.get("subject_id")
     
     if not subject_id:
         return [types.TextContent(
@@ -176,9 +242,12 @@ async def get_episodes(arguments):
             text="Error: subject_id parameter is required"
         )]
     
-    status_code, episodes = await bangumi_client.get_episodes(arguments)
+    if max_items:
+        status_code, episodes = await client.collect(client.get_episodes, params, max_items, fields=fields)
+    else:
+        status_code, episodes = await client.get_episodes(params, fields=fields)
 
-    return remove_null_items(episodes)
+    return episodes
 
 
 async def get_episode_info(arguments):
@@ -194,19 +263,28 @@ async def get_episode_info(arguments):
             text="Error: episode_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_episode_info(episode_id)
+    status_code, info = await get_client().get_episode_info(episode_id, fields=arguments.get("fields"))
 
-    return remove_null_items(info)
+    return info
 
 
 #-------------------------角色-------------------------
 async def search_characters(arguments):
     """
     [POST] /v0/search/characters 搜索角色
+    传入 max_items 时自动翻页并合并结果
     """
-    status_code, results = await bangumi_client.search_characters(arguments)
+    params = dict(arguments or {})
+    max_items = params.pop("max_items", None)
+    fields = params.pop("fields", None)
+    client = get_client()
 
-    return remove_null_items(results)
+    if max_items:
+        status_code, results = await client.collect(client.search_characters, params, max_items, fields=fields)
+    else:
+        status_code, results = await client.search_characters(params, fields=fields)
+
+    return results
 
 
 async def get_character_info(arguments):
@@ -222,9 +300,27 @@ async def get_character_info(arguments):
             text="Error: character_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_character_info(character_id)
+    status_code, info = await get_client().get_character_info(character_id, fields=arguments.get("fields"))
+
+    return info
+
+
+async def get_characters_info_many(arguments):
+    """
+    [GET] /v0/characters/{character_id} 批量获取角色详细信息
+    """
+    args = arguments or {}
+    character_ids = args.get("character_ids")
+
+    if not character_ids:
+        return [types.TextContent(
+            type="text",
+            text="Error: character_ids parameter is required"
+        )]
+
+    results = await get_client().get_characters_info_many(character_ids)
 
-    return remove_null_items(info)
+    return _batch_results(results)
 
 
 async def get_character_subjects(arguments):
@@ -240,7 +336,7 @@ async def get_character_subjects(arguments):
             text="Error: character_id parameter is required"
         )]
 
-    status_code, subjects = await bangumi_client.get_character_subjects(character_id)
+    status_code, subjects = await get_client().get_character_subjects(character_id)
 
     if status_code >= 400:
         return subjects
@@ -261,7 +357,7 @@ async def get_character_persons(arguments):
             text="Error: character_id parameter is required"
         )]
 
-    status_code, persons = await bangumi_client.get_character_persons(character_id)
+    status_code, persons = await get_client().get_character_persons(character_id)
 
     if status_code >= 400:
         return persons
@@ -282,7 +378,7 @@ async def post_character_collection(arguments):
             text="Error: character_id parameter is required"
         )]
 
-    status_code, result = await bangumi_client.post_character_collection(character_id)
+    status_code, result = await get_client().post_character_collection(character_id)
 
     if status_code >= 400:
         return result
@@ -303,7 +399,7 @@ async def delete_character_collection(arguments):
             text="Error: character_id parameter is required"
         )]
 
-    status_code, result = await bangumi_client.delete_character_collection(character_id)
+    status_code, result = await get_client().delete_character_collection(character_id)
 
     if status_code >= 400:
         return result
@@ -315,10 +411,19 @@ async def delete_character_collection(arguments):
 async def search_persons(arguments):
     """
     [POST] /v0/search/persons 搜索人物
+    传入 max_items 时自动翻页并合并结果
     """
-    status_code, results = await bangumi_client.search_persons(arguments)
+    params = dict(arguments or {})
+    max_items = params.pop("max_items", None)
+    fields = params.pop("fields", None)
+    client = get_client()
+
+    if max_items:
+        status_code, results = await client.collect(client.search_persons, params, max_items, fields=fields)
+    else:
+        status_code, results = await client.search_persons(params, fields=fields)
 
-    return remove_null_items(results)
+    return results
 
 
 async def get_person_info(arguments):
@@ -333,9 +438,27 @@ async def get_person_info(arguments):
             text="Error: person_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_person_info(person_id)
+    status_code, info = await get_client().get_person_info(person_id, fields=arguments.get("fields"))
+
+    return info
+
+
+async def get_persons_info_many(arguments):
+    """
+    [GET] /v0/persons/{person_id} 批量获取人物详细信息
+    """
+    args = arguments or {}
+    person_ids = args.get("person_ids")
+
+    if not person_ids:
+        return [types.TextContent(
+            type="text",
+            text="Error: person_ids parameter is required"
+        )]
+
+    results = await get_client().get_persons_info_many(person_ids)
 
-    return remove_null_items(info)
+    return _batch_results(results)
 
 
 async def get_person_subjects(arguments):
@@ -350,7 +473,7 @@ async def get_person_subjects(arguments):
             text="Error: person_id parameter is required"
         )]
 
-    status_code, subjects = await bangumi_client.get_person_subjects(person_id)
+    status_code, subjects = await get_client().get_person_subjects(person_id)
 
     if status_code >= 400:
         return subjects
@@ -370,7 +493,7 @@ async def get_person_characters(arguments):
             text="Error: person_id parameter is required"
         )]
 
-    status_code, characters = await bangumi_client.get_person_characters(person_id)
+    status_code, characters = await get_client().get_person_characters(person_id)
 
     if status_code >= 400:
         return characters
@@ -390,7 +513,7 @@ async def post_person_collection(arguments):
             text="Error: person_id parameter is required"
         )]
 
-    status_code, result = await bangumi_client.post_person_collection(person_id)
+    status_code, result = await get_client().post_person_collection(person_id)
 
     if status_code >= 400:
         return result
@@ -410,7 +533,7 @@ async def delete_person_collection(arguments):
             text="Error: person_id parameter is required"
         )]
 
-    status_code, result = await bangumi_client.delete_person_collection(person_id)
+    status_code, result = await get_client().delete_person_collection(person_id)
 
     if status_code >= 400:
         return result
@@ -431,31 +554,47 @@ async def get_user_info(arguments):
             text="Error: username parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_user_info(username)
+    status_code, info = await get_client().get_user_info(username)
 
-    return remove_null_items(info)
+    return info
 
 
 async def get_me_info(arguments):
     """
     [GET] /v0/users/me 获取当前用户信息
     """
-    status_code, info = await bangumi_client.get_me_info()
+    status_code, info = await get_client().get_me_info()
 
-    return remove_null_items(info)
+    return info
 
 
 #-------------------------收藏-------------------------
 async def get_user_collections(arguments):
+    """
+    [GET] /v0/users/{username}/collections 获取用户收藏
+    传入 max_items 时自动翻页并合并结果
+    """
     username = arguments.get("username", "")
     params = arguments.get("params", {})
+    max_items = arguments.get("max_items")
+    fields = arguments.get("fields")
+    client = get_client()
+
+    if max_items:
+        status_code, results = await client.collect(
+            lambda page: client.get_user_collections(username=username, params=page),
+            params,
+            max_items,
+            fields=fields
+        )
+    else:
+        status_code, results = await client.get_user_collections(
+            username=username,
+            params=params,
+            fields=fields
+        )
 
-    status_code, results = await bangumi_client.get_user_collections(
-        username=username,
-        params=params
-    )
-
-    return remove_null_items(results)
+    return results
 
 
 async def get_user_collection_info(arguments):
@@ -477,9 +616,11 @@ async def get_user_collection_info(arguments):
             text="Error: subject_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_user_collection_info(username, subject_id)
+    status_code, info = await get_client().get_user_collection_info(
+        username, subject_id, fields=arguments.get("fields")
+    )
 
-    return remove_null_items(info)
+    return info
 
 
 async def post_my_collection(arguments):
@@ -495,7 +636,7 @@ async def post_my_collection(arguments):
             text="Error: subject_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.post_my_collection(subject_id, params)
+    status_code, info = await get_client().post_my_collection(subject_id, params)
 
     if status_code >= 400:
         return info
@@ -516,7 +657,7 @@ async def patch_my_collection(arguments):
             text="Error: subject_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.patch_my_collection(subject_id, params)
+    status_code, info = await get_client().patch_my_collection(subject_id, params)
 
     if status_code >= 400:
         return info
@@ -537,9 +678,9 @@ async def get_my_episode_collections(arguments):
             text="Error: subject_id parameter is required"
         )]
 
-    status_code, results = await bangumi_client.get_my_episode_collections(subject_id, params)
+    status_code, results = await get_client().get_my_episode_collections(subject_id, params)
 
-    return remove_null_items(results)
+    return results
 
 
 async def patch_my_episode_collections(arguments):
@@ -571,7 +712,7 @@ async def patch_my_episode_collections(arguments):
         "type": type
     }
 
-    status_code, results = await bangumi_client.patch_my_episode_collections(subject_id, params)
+    status_code, results = await get_client().patch_my_episode_collections(subject_id, params)
 
     if status_code >= 400:
         return results
@@ -579,6 +720,43 @@ async def patch_my_episode_collections(arguments):
         return {"info": f"条目 {subject_id} 的剧集/章节 {episode_id} 收藏更新成功!"}
 
 
+async def patch_my_episode_progress(arguments):
+    """
+    [PATCH] /v0/users/-/collections/{subject_id}/episodes 按集数范围批量更新用户剧集/章节收藏
+    传入 up_to 时更新 sort 不超过 up_to 的剧集，或传入 start/end 指定范围
+    """
+    args = arguments or {}
+    subject_id = args.get("subject_id")
+    type = args.get("type", 2)
+    up_to = args.get("up_to")
+    start = args.get("start")
+    end = args.get("end")
+
+    if not subject_id:
+        return [types.TextContent(
+            type="text",
+            text="Error: subject_id parameter is required"
+        )]
+    if type is None:
+        return [types.TextContent(
+            type="text",
+            text="Error: type parameter is required"
+        )]
+    if up_to is None and start is None and end is None:
+        return [types.TextContent(
+            type="text",
+            text="Error: up_to, start or end parameter is required"
+        )]
+    if up_to is not None:
+        end = up_to if end is None else min(end, up_to)
+
+    status_code, results = await get_client().patch_my_episode_progress(
+        subject_id, type, start=start, end=end, episode_type=args.get("episode_type", 0)
+    )
+
+    return results
+
+
 async def get_my_episode_collection_info(arguments):
     """
     [GET] /v0/users/-/collections/-/episodes/{episode_id} 获取用户指定剧集/章节收藏
@@ -591,9 +769,9 @@ async def get_my_episode_collection_info(arguments):
             text="Error: episode_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_my_episode_collection_info(episode_id)
+    status_code, info = await get_client().get_my_episode_collection_info(episode_id)
 
-    return remove_null_items(info)
+    return info
 
 
 async def put_my_episode_collection_info(arguments):
@@ -618,7 +796,7 @@ async def put_my_episode_collection_info(arguments):
         "type": type
     }
 
-    status_code, info = await bangumi_client.put_my_episode_collection_info(episode_id, params)
+    status_code, info = await get_client().put_my_episode_collection_info(episode_id, params)
 
     if status_code >= 400:
         return info
@@ -638,9 +816,9 @@ async def get_user_character_collections(arguments):
             text="Error: username parameter is required"
         )]
 
-    status_code, results = await bangumi_client.get_user_character_collections(username=username)
+    status_code, results = await get_client().get_user_character_collections(username=username)
 
-    return remove_null_items(results)
+    return results
 
 
 async def get_user_character_collection_info(arguments):
@@ -662,9 +840,9 @@ async def get_user_character_collection_info(arguments):
             text="Error: character_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_user_character_collection_info(username, character_id)
+    status_code, info = await get_client().get_user_character_collection_info(username, character_id)
 
-    return remove_null_items(info)
+    return info
 
 
 async def get_user_person_collections(arguments):
@@ -679,9 +857,9 @@ async def get_user_person_collections(arguments):
             text="Error: username parameter is required"
         )]
 
-    status_code, results = await bangumi_client.get_user_person_collections(username=username)
+    status_code, results = await get_client().get_user_person_collections(username=username)
 
-    return remove_null_items(results)
+    return results
 
 
 async def get_user_person_collection_info(arguments):
@@ -703,6 +881,6 @@ async def get_user_person_collection_info(arguments):
             text="Error: person_id parameter is required"
         )]
 
-    status_code, info = await bangumi_client.get_user_person_collection_info(username, person_id)
+    status_code, info = await get_client().get_user_person_collection_info(username, person_id)
 
-    return remove_null_items(info)
\ No newline at end of file
+    return info
\ No newline at end of file
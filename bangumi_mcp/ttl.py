@@ -0,0 +1,202 @@
+"""Cache lifetimes derived from the air status of subjects.
+
+A work that finished airing years ago hardly changes, while the episodes of
+a show on air change every week. The policy classifies subject and episode
+responses as airing or finished from their dates, the number of aired
+episodes and the calendar, and picks a lifetime for each. The calendar
+itself is refreshed at the next day boundary in Japan, when it changes.
+"""
+
+import datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+JST = datetime.timezone(datetime.timedelta(hours=9), "JST")
+
+AIRING = "airing"
+FINISHED = "finished"
+UNKNOWN = "unknown"
+
+
+def _parse_date(value: Any) -> Optional[datetime.date]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def seconds_until_jst_midnight(now: Optional[datetime.datetime] = None) -> float:
+    """Get the seconds left until the next midnight in Japan.
+
+    Args:
+        now: Current time, timezone aware. Defaults to the current time.
+    Returns:
+        Seconds until 00:00 JST, more than 0.
+    """
+    now = (now or datetime.datetime.now(datetime.timezone.utc)).astimezone(JST)
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time(), JST)
+    return max(1.0, (midnight - now).total_seconds())
+
+
+class AirStatusTTL:
+    """Pick cache lifetimes of subjects, episodes and the calendar from the data."""
+
+    def __init__(self, airing_ttl: float = 3600, finished_ttl: float = 7 * 86400, settle_days: int = 30):
+        """Initialize the policy.
+
+        Args:
+            airing_ttl: Upper bound of the lifetime of airing subjects and their
+                episodes in seconds.
+            finished_ttl: Lifetime of finished subjects and their episodes in seconds.
+            settle_days: Days after the last (expected) air date before a work counts as finished.
+        """
+        self.airing_ttl = airing_ttl
+        self.finished_ttl = finished_ttl
+        self.settle_days = settle_days
+        self.decisions = {AIRING: 0, FINISHED: 0, UNKNOWN: 0}
+        self._airing_ids: frozenset = frozenset()
+        self._calendar_day: Optional[datetime.date] = None
+
+    def _today(self) -> datetime.date:
+        return datetime.datetime.now(JST).date()
+
+    def on_calendar(self, calendar: Any) -> None:
+        """Remember which subjects are on the calendar of the current day in Japan.
+
+        Args:
+            calendar: Decoded calendar response, a list of weekdays with their items.
+        """
+        ids = set()
+        for day in calendar if isinstance(calendar, list) else []:
+            for item in (day.get("items") or []) if isinstance(day, dict) else []:
+                if isinstance(item, dict) and item.get("id") is not None:
+                    ids.add(item["id"])
+        self._airing_ids = frozenset(ids)
+        self._calendar_day = self._today()
+
+    def is_on_calendar(self, subject_id: Any) -> bool:
+        """Return whether a subject is on the calendar, which is forgotten at the next day boundary."""
+        return self._calendar_day == self._today() and subject_id in self._airing_ids
+
+    def subject_status(self, subject: Dict[str, Any]) -> str:
+        """Classify a subject from the calendar, its air date and episode count.
+
+        Args:
+            subject: Decoded subject.
+        Returns:
+            airing, finished or unknown.
+        """
+        if self.is_on_calendar(subject.get("id")):
+            return AIRING
+        date = _parse_date(subject.get("date"))
+        if date is None or not subject.get("eps"):
+            # Without an episode count the end cannot be estimated: ongoing
+            # manga and shows whose length is not known yet have none.
+            return UNKNOWN
+        # Series air weekly from their start date, one episode a week.
+        end = date + datetime.timedelta(weeks=subject["eps"])
+        if (self._today() - end).days < self.settle_days:
+            return AIRING
+        return FINISHED
+
+    def episodes_status(
+        self,
+        episodes: Iterable[Dict[str, Any]],
+        subject_id: Any = None,
+        subject: Optional[Dict[str, Any]] = None,
+        last_page: bool = True,
+    ) -> str:
+        """Classify the episodes of a subject from their air dates.
+
+        Args:
+            episodes: Decoded episodes, of one page.
+            subject_id: ID of the subject the episodes belong to.
+            subject: Decoded subject, if known, whose episode count is compared
+                with the number of aired episodes.
+            last_page: Whether the page holds the last episodes. Earlier pages
+                of a long show can have aired long ago while it is still on air,
+                so they are never classified as finished.
+        Returns:
+            airing, finished or unknown.
+        """
+        if self.is_on_calendar(subject_id):
+            return AIRING
+        today = self._today()
+        aired = 0
+        last = None
+        for episode in episodes:
+            if episode.get("type", 0) != 0:
+                continue
+            date = _parse_date(episode.get("airdate"))
+            if date is None or date > today:
+                return AIRING
+            aired += 1
+            last = date if last is None or date > last else last
+        if last is None:
+            return UNKNOWN
+        if (today - last).days < self.settle_days:
+            return AIRING
+        if not last_page:
+            return UNKNOWN
+        if subject is not None and subject.get("eps") and aired < subject["eps"]:
+            # Only part of the episodes are on this page or have aired.
+            return UNKNOWN
+        return FINISHED
+
+    def _pick(self, status: str, default: float) -> float:
+        self.decisions[status] += 1
+        if status == FINISHED:
+            return max(default, self.finished_ttl)
+        if status == AIRING:
+            return min(default, self.airing_ttl)
+        return default
+
+    def subject_ttl(self, subject: Any, default: float) -> float:
+        """Get the lifetime of a subject response.
+
+        Args:
+            subject: Decoded subject.
+            default: Lifetime configured for the endpoint family, 0 disables caching.
+        Returns:
+            Lifetime in seconds.
+        """
+        if default <= 0 or not isinstance(subject, dict):
+            return default
+        return self._pick(self.subject_status(subject), default)
+
+    def episodes_ttl(
+        self, page: Any, default: float, subject_id: Any = None, subject: Optional[Dict[str, Any]] = None
+    ) -> float:
+        """Get the lifetime of a page of episodes.
+
+        Args:
+            page: Decoded page of episodes.
+            default: Lifetime configured for the endpoint family, 0 disables caching.
+            subject_id: ID of the subject the episodes belong to.
+            subject: Decoded subject, if known.
+        Returns:
+            Lifetime in seconds.
+        """
+        if default <= 0 or not isinstance(page, dict):
+            return default
+        data = page.get("data") or []
+        episodes = [episode for episode in data if isinstance(episode, dict)]
+        last_page = (page.get("offset") or 0) + len(data) >= (page.get("total") or 0)
+        return self._pick(self.episodes_status(episodes, subject_id, subject, last_page), default)
+
+    def calendar_ttl(self, default: float) -> float:
+        """Get the lifetime of the calendar: until the next midnight in Japan, unless caching is disabled."""
+        if default <= 0:
+            return default
+        return seconds_until_jst_midnight()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of responses classified as airing, finished and unknown."""
+        return {
+            "airing_ttl": self.airing_ttl,
+            "finished_ttl": self.finished_ttl,
+            "calendar_subjects": len(self._airing_ids) if self._calendar_day == self._today() else 0,
+            "decisions": dict(self.decisions),
+        }
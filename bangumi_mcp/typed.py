@@ -0,0 +1,41 @@
+"""Typed decoding of API responses with the generated msgspec models.
+
+Decoding into a model validates the response and drops None fields in one
+pass in C. Fields that are not in dist.json are dropped as well. Requires
+the optional msgspec dependency; msgspec and the models are imported on
+first use, so the server does not pay for them unless typed decoding is on.
+"""
+
+import functools
+import importlib.util
+from typing import Any
+
+
+def available() -> bool:
+    """Return whether msgspec is installed."""
+    return importlib.util.find_spec("msgspec") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def decoder(model: str) -> Any:
+    """Return a cached msgspec JSON decoder for a model of bangumi_mcp.models by name."""
+    import msgspec
+    from bangumi_mcp import models
+
+    return msgspec.json.Decoder(getattr(models, model))
+
+
+def loads_typed(data: bytes, model: str) -> Any:
+    """Decode and validate a JSON document against a model.
+
+    Args:
+        data: JSON document.
+        model: Name of the model in bangumi_mcp.models.
+    Returns:
+        The document as plain dicts and lists, without None fields.
+    Raises:
+        msgspec.ValidationError: If the document does not match the model, a ValueError.
+    """
+    import msgspec
+
+    return msgspec.to_builtins(decoder(model).decode(data))
@@ -1,45 +1,239 @@
+import hashlib
 import json
-from typing import Dict, Any, Union, List
+import logging
+import marshal
+import tempfile
+from typing import Dict, Any, Optional, Union, List
 import os
 from pathlib import Path
 
+from bangumi_mcp import jsonlib
 
-def resolve_json_schema(path) -> Dict[str, Any]:
-    # Handle both relative and absolute paths
-    if not os.path.isabs(path):
-        # For relative paths, resolve relative to this package
-        package_dir = Path(__file__).parent
-        path = package_dir / path
 
-    schema = json.load(open(path, "r", encoding="utf-8"))
+logger = logging.getLogger(__name__)
+
+
+# Version of the compiled schema artifact format, bump when resolution changes.
+SCHEMA_ARTIFACT_VERSION = 2
+
+# Annotation keywords left out of compact schemas, they do not affect validation.
+ANNOTATION_KEYS = frozenset({"example", "examples", "title"})
+
+
+def schema_cache_dir() -> Path:
+    """
+    Directory holding compiled schema artifacts, BANGUMI_SCHEMA_CACHE_DIR or the user cache directory.
+    """
+    configured = os.getenv("BANGUMI_SCHEMA_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "bangumi-mcp"
+
+
+def resolve_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inline all local $ref in the schema.
+    Every object is resolved once per JSON pointer, so a component is shared by identity between its
+    definition and every place that references it.
+    """
+    resolved: Dict[str, Any] = {}
+
+    def resolve_ref(ref_path: str) -> Any:
+        if ref_path in resolved:
+            return resolved[ref_path]
+        target = schema
+        for part in ref_path[2:].split('/'):
+            target = target[part.replace('~1', '/').replace('~0', '~')]
+        return resolve(target, ref_path)
 
-    def resolve_refs(obj, root_schema) -> Any:
+    def resolve(obj, pointer: str) -> Any:
         if isinstance(obj, dict):
-            if '$ref' in obj:
+            ref_path = obj.get('$ref')
+            if isinstance(ref_path, str):
                 # find and resolve $ref
-                ref_path = obj['$ref']
                 if ref_path.startswith('#/'):
-                    path_parts = ref_path[2:].split('/')
-                    resolved = root_schema
-                    for part in path_parts:
-                        resolved = resolved[part]
-                    return resolve_refs(resolved, root_schema)
+                    return resolve_ref(ref_path)
                 return obj
-            else:
-                # recursively resolve all properties in the object
-                return {k: resolve_refs(v, root_schema) for k, v in obj.items()}
+            if pointer in resolved:
+                return resolved[pointer]
+            # register the result before descending, so that recursive refs terminate
+            result: Dict[str, Any] = {}
+            resolved[pointer] = result
+            for k, v in obj.items():
+                result[k] = resolve(v, f"{pointer}/{k.replace('~', '~0').replace('/', '~1')}")
+            return result
         elif isinstance(obj, list):
             # recursively resolve all items in the list
-            return [resolve_refs(item, root_schema) for item in obj]
+            return [resolve(item, f"{pointer}/{i}") for i, item in enumerate(obj)]
         else:
             return obj
 
     # resolve all $ref in the schema
-    resolved_schema = resolve_refs(schema, schema)
+    resolved_schema = resolve(schema, "#")
     assert isinstance(resolved_schema, dict)
     return resolved_schema
 
 
+def resolve_json_schema(path, cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load a JSON schema with all local $ref inlined.
+    The resolved schema is stored as a marshal artifact keyed by the hash of the source file, so later
+    starts load it directly. Marshal keeps shared sub-schemas shared and, unlike pickle, cannot run code
+    when loading a tampered artifact. Set BANGUMI_SCHEMA_CACHE=0 to disable.
+    """
+    # Handle both relative and absolute paths
+    if not os.path.isabs(path):
+        # For relative paths, resolve relative to this package
+        package_dir = Path(__file__).parent
+        path = package_dir / path
+
+    with open(path, "rb") as f:
+        source = f.read()
+
+    use_artifact = env_bool("BANGUMI_SCHEMA_CACHE", True)
+    artifact = None
+    if use_artifact:
+        digest = hashlib.sha256(source).hexdigest()[:16]
+        artifact = (cache_dir or schema_cache_dir()) / f"{Path(path).stem}.{digest}.v{SCHEMA_ARTIFACT_VERSION}.marshal{marshal.version}"
+        try:
+            with open(artifact, "rb") as f:
+                loaded = marshal.load(f)
+            if not isinstance(loaded, dict):
+                raise ValueError(f"expected a dict, got {type(loaded).__name__}")
+            return loaded
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable schema artifact {artifact}: {e}")
+
+    resolved_schema = resolve_refs(json.loads(source))
+
+    if artifact is not None:
+        try:
+            artifact.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first, so concurrent starts never read a partial artifact
+            fd, tmp_path = tempfile.mkstemp(dir=artifact.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(resolved_schema, f)
+            os.replace(tmp_path, artifact)
+        except OSError as e:
+            logger.warning(f"Failed to write schema artifact {artifact}: {e}")
+
+    return resolved_schema
+
+
+def compact_schema(schema: Dict[str, Any], names: Dict[int, str]) -> Dict[str, Any]:
+    """
+    Rewrite a resolved schema so that named sub-schemas used more than once are stored once under $defs
+    and referenced with local $ref. names maps id() of shared component objects to their names, which
+    works because resolve_refs shares components by identity. Annotations in ANNOTATION_KEYS are dropped.
+    """
+    counts: Dict[int, int] = {}
+
+    def count(obj: Any) -> None:
+        if isinstance(obj, dict):
+            if id(obj) in names:
+                counts[id(obj)] = counts.get(id(obj), 0) + 1
+                # the body of a component is emitted once, so count its children only once
+                if counts[id(obj)] > 1:
+                    return
+            for v in obj.values():
+                count(v)
+        elif isinstance(obj, list):
+            for item in obj:
+                count(item)
+
+    defs: Dict[str, Any] = {}
+
+    def emit(obj: Any, parent_key: Optional[str] = None) -> Any:
+        if isinstance(obj, dict):
+            name = names.get(id(obj))
+            if name is not None and counts.get(id(obj), 0) > 1 and obj is not schema:
+                if name not in defs:
+                    # register before descending, so that recursive components terminate
+                    defs[name] = None
+                    defs[name] = emit_object(obj, parent_key)
+                return {"$ref": f"#/$defs/{name}"}
+            return emit_object(obj, parent_key)
+        elif isinstance(obj, list):
+            return [emit(item) for item in obj]
+        else:
+            return obj
+
+    def emit_object(obj: Dict[str, Any], parent_key: Optional[str]) -> Dict[str, Any]:
+        # under "properties" the keys are property names, not keywords
+        return {
+            k: emit(v, k)
+            for k, v in obj.items()
+            if parent_key == "properties" or k not in ANNOTATION_KEYS
+        }
+
+    count(schema)
+    result = emit(schema)
+    if defs:
+        result["$defs"] = defs
+    return result
+
+
+def partial_schema(schema: Dict[str, Any], memo: Dict[int, Any]) -> Dict[str, Any]:
+    """
+    Copy a resolved schema without required lists and with oneOf relaxed to anyOf, so that it also
+    describes results trimmed to a subset of fields. memo maps id() of original objects to their copies,
+    which keeps shared sub-schemas shared.
+    """
+    def copy(obj: Any, parent_key: Optional[str] = None) -> Any:
+        if isinstance(obj, dict):
+            if id(obj) in memo:
+                return memo[id(obj)]
+            result: Dict[str, Any] = {}
+            memo[id(obj)] = result
+            for k, v in obj.items():
+                if parent_key == "properties":
+                    result[k] = copy(v, k)
+                elif k != "required":
+                    # without required lists the alternatives overlap, so at least one has to match
+                    result["anyOf" if k == "oneOf" else k] = copy(v, k)
+            return result
+        elif isinstance(obj, list):
+            return [copy(item) for item in obj]
+        else:
+            return obj
+
+    return copy(schema)
+
+
+def compile_fields(fields: List[str]) -> Dict[str, Any]:
+    """
+    Turn dotted field paths such as ["name", "rating.score"] into a tree, where None selects the whole value.
+    """
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        *parents, leaf = field.split(".")
+        for part in parents:
+            child = node.setdefault(part, {})
+            if child is None:
+                # an ancestor is already selected as a whole
+                break
+            node = child
+        else:
+            node[leaf] = None
+    return tree
+
+
+def project(obj: Any, tree: Dict[str, Any]) -> Any:
+    """
+    Keep only the fields selected by a compile_fields tree. Lists are projected item by item, and the
+    selected values are shared with obj, not copied.
+    """
+    if isinstance(obj, list):
+        return [project(item, tree) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    return {k: obj[k] if sub is None else project(obj[k], sub) for k, sub in tree.items() if k in obj}
+
+
 def remove_null_items(obj: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str, Any], List[Any]]:
     """
     Recursively remove items with value None from the dictionary.
@@ -50,3 +244,80 @@ def remove_null_items(obj: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str,
         return [remove_null_items(item) for item in obj if item is not None]
     else:
         return obj
+
+
+def remove_null_items_inplace(obj: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str, Any], List[Any]]:
+    """
+    Remove items with value None from the dictionary in place, for objects owned by the caller.
+    Containers are walked once and only rebuilt where a None item is actually found.
+    """
+    if isinstance(obj, dict):
+        nulls = None
+        for k, v in obj.items():
+            if v is None:
+                if nulls is None:
+                    nulls = []
+                nulls.append(k)
+            elif isinstance(v, (dict, list)):
+                remove_null_items_inplace(v)
+        if nulls is not None:
+            for k in nulls:
+                del obj[k]
+    elif isinstance(obj, list):
+        has_null = False
+        for item in obj:
+            if item is None:
+                has_null = True
+            elif isinstance(item, (dict, list)):
+                remove_null_items_inplace(item)
+        if has_null:
+            obj[:] = [item for item in obj if item is not None]
+    return obj
+
+
+def loads_without_nulls(data: Union[str, bytes]) -> Any:
+    """
+    Decode JSON with the configured backend and remove items with value None, equivalent to
+    remove_null_items(json.loads(data)). The freshly decoded document is owned here, so it is stripped
+    in place instead of copied.
+    """
+    result = jsonlib.loads(data)
+    if isinstance(result, (dict, list)):
+        remove_null_items_inplace(result)
+    return result
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Read an integer from the environment, falling back to default if unset or invalid.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """
+    Read a float from the environment, falling back to default if unset or invalid.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """
+    Read a boolean from the environment, falling back to default if unset.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
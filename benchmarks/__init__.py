@@ -0,0 +1 @@
+"""Benchmarks of the hot paths, run as modules from the repository root."""
@@ -0,0 +1,56 @@
+"""Compare the JSON backends of bangumi_mcp.jsonlib on decoding and encoding.
+
+Run from the repository root:
+
+    uv run --all-extras python -m benchmarks.bench_json_backends
+
+Decoding includes stripping null items, as the client does for every
+response body; encoding is the indented output of structured tool results.
+Backends that are not installed are skipped. Times are the best of --repeat
+runs.
+"""
+
+import argparse
+import json
+import timeit
+from typing import Any, Callable
+
+from bangumi_mcp import jsonlib
+from bangumi_mcp.utils import remove_null_items, remove_null_items_inplace
+from benchmarks.fixtures import documents
+
+
+def best(func: Callable[[], Any], repeat: int, number: int) -> float:
+    """Best time of one call in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="Number of timed runs, the best is reported")
+    args = parser.parse_args()
+
+    backends = {}
+    for name in jsonlib.BACKENDS:
+        try:
+            backends[name] = jsonlib._LOADERS[name]()
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    print(f"{'':<30}" + "".join(f"{name + ' decode':>16}{name + ' encode':>16}" for name in backends))
+    for name, doc in documents():
+        body = json.dumps(doc, ensure_ascii=False).encode()
+        stripped = remove_null_items(doc)
+        number = max(1, 2000 // (len(body) // 1024 + 1))
+        row = f"{f'{name} ({len(body) / 1024:.0f} KB)':<30}"
+        for loads, dumps in backends.values():
+            assert remove_null_items_inplace(loads(body)) == stripped
+            assert json.loads(dumps(stripped)) == stripped
+            decode = best(lambda: remove_null_items_inplace(loads(body)), args.repeat, number)
+            encode = best(lambda: dumps(stripped), args.repeat, number)
+            row += f"{decode:13.2f} ms{encode:13.2f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
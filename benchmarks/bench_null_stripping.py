@@ -0,0 +1,57 @@
+"""Compare stripping null items with remove_null_items and with loads_without_nulls.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.bench_null_stripping
+
+Times are the best of --repeat runs, peaks are measured with tracemalloc.
+The JSON backend is the one selected by BANGUMI_JSON_BACKEND.
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from bangumi_mcp import jsonlib
+from bangumi_mcp.utils import loads_without_nulls, remove_null_items
+from benchmarks.fixtures import documents
+
+
+def best(func: Callable[[], Any], repeat: int, number: int) -> float:
+    """Best time of one call in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e3
+
+
+def peak(func: Callable[[], Any]) -> float:
+    """Peak memory allocated by one call in MiB."""
+    tracemalloc.start()
+    func()
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return top / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=15, help="Number of timed runs, the best is reported")
+    args = parser.parse_args()
+
+    print(f"JSON backend: {jsonlib.backend}")
+    for name, doc in documents():
+        body = json.dumps(doc, ensure_ascii=False).encode()
+        assert loads_without_nulls(body) == remove_null_items(jsonlib.loads(body))
+        number = max(1, 2000 // (len(body) // 1024 + 1))
+        variants = {
+            "loads": lambda: jsonlib.loads(body),
+            "loads + remove_null_items": lambda: remove_null_items(jsonlib.loads(body)),
+            "loads_without_nulls": lambda: loads_without_nulls(body),
+        }
+        print(f"{name} ({len(body) / 1024:.0f} KB)")
+        for label, func in variants.items():
+            print(f"  {label:<28}{best(func, args.repeat, number):8.2f} ms  peak {peak(func):6.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
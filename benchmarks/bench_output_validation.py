@@ -0,0 +1,70 @@
+"""Compare the ways structured tool results can be validated against their output schema.
+
+Run from the repository root:
+
+    uv run --extra validation python -m benchmarks.bench_output_validation
+
+Results are validated as handle_call_tool does, after null items are removed,
+against the output schema of get_user_collections and get_subjects. Rows
+cover jsonschema.validate, which rebuilds its validator on every call, a
+compiled Draft202012Validator, fastjsonschema against the strict schema and
+against the relaxed one of calls with a fields argument, and the sampled and
+off policies. The fastjsonschema rows are skipped if it is not installed.
+Times are the best of --repeat runs.
+"""
+
+import argparse
+import timeit
+from typing import Any, Callable
+
+import jsonschema
+from jsonschema import Draft202012Validator
+
+from bangumi_mcp.registry import OutputValidationPolicy, OutputValidator, fastjsonschema, get_registry
+from bangumi_mcp.utils import remove_null_items
+from benchmarks.fixtures import collection, page, subject
+
+
+def best(func: Callable[[], Any], repeat: int) -> float:
+    """Best time of one call in milliseconds, calling it often enough to average sampling."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs, the best is reported")
+    parser.add_argument("--items", type=int, default=100, help="Number of items in each page")
+    args = parser.parse_args()
+
+    registry = get_registry()
+    results = {
+        "get_user_collections": page([collection(i) for i in range(args.items)]),
+        "get_subjects": page([subject(i) for i in range(args.items)]),
+    }
+    for name, doc in results.items():
+        entry = registry[name]
+        result = remove_null_items(doc)
+        assert entry.check_output(result, OutputValidationPolicy("full")) is None
+        schema = entry.strict_output.schema
+        compiled = Draft202012Validator(schema)
+        variants = {
+            "jsonschema.validate": lambda: jsonschema.validate(result, schema, cls=Draft202012Validator),
+            "compiled (jsonschema)": lambda: compiled.is_valid(result),
+        }
+        if fastjsonschema is not None:
+            strict, relaxed = OutputValidator(schema), OutputValidator(entry.tool.outputSchema)
+            variants["compiled (fastjsonschema)"] = lambda: strict.is_valid(result)
+            variants["relaxed, with fields"] = lambda: relaxed.is_valid(result)
+        sampled, off = OutputValidationPolicy("sampled", 0.1), OutputValidationPolicy("off")
+        variants["policy sampled 0.1"] = lambda: entry.check_output(result, sampled)
+        variants["policy off"] = lambda: entry.check_output(result, off)
+
+        print(f"{name}, {args.items} items")
+        for label, func in variants.items():
+            print(f"  {label:<28}{best(func, args.repeat):10.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Synthetic documents shaped like Bangumi API responses, for the benchmarks.
+
+Field names, nesting and string sizes follow dist.json and real responses;
+the null fields are the ones the API leaves empty most often.
+"""
+
+import copy
+from typing import Any, Dict, List, Tuple
+
+IMAGES = {size: f"https://lain.bgm.tv/pic/cover/{size}/ab/cd/1_x.jpg" for size in ("large", "common", "medium", "small", "grid")}
+TAGS = [{"name": f"tag{i}", "count": 100 - i} for i in range(10)]
+
+
+def slim_subject(i: int) -> Dict[str, Any]:
+    return {
+        "id": i, "type": 2, "name": f"Name {i}", "name_cn": f"名字 {i}", "short_summary": "简介" * 40,
+        "date": None, "images": dict(IMAGES), "volumes": 0, "eps": 12, "collection_total": 1234,
+        "score": 7.5, "rank": 0, "tags": copy.deepcopy(TAGS),
+    }
+
+
+def collection(i: int) -> Dict[str, Any]:
+    return {
+        "subject_id": i, "subject_type": 2, "rate": 8, "type": 2, "comment": None, "tags": ["a", "b"],
+        "ep_status": 12, "vol_status": 0, "updated_at": "2022-06-19T18:44:13+08:00", "private": False,
+        "subject": slim_subject(i),
+    }
+
+
+def subject(i: int) -> Dict[str, Any]:
+    return {
+        "id": i, "type": 2, "name": f"Name {i}", "name_cn": f"名字 {i}", "summary": "简介" * 300,
+        "series": False, "nsfw": False, "locked": False, "date": "2020-01-01", "platform": "TV",
+        "images": dict(IMAGES),
+        "infobox": [{"key": "中文名", "value": "x"}, {"key": "别名", "value": [{"v": "a"}, {"k": "b", "v": "c"}]}] * 6,
+        "volumes": 0, "eps": 12, "total_episodes": 12,
+        "rating": {"rank": 10, "total": 1000, "count": {str(k): k * 10 for k in range(1, 11)}, "score": 7.9},
+        "collection": {"wish": 1, "collect": 2, "doing": 3, "on_hold": 4, "dropped": 5},
+        "meta_tags": ["TV"], "tags": copy.deepcopy(TAGS) * 3,
+    }
+
+
+def page(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"total": len(items), "limit": len(items), "offset": 0, "data": items}
+
+
+def documents() -> List[Tuple[str, Any]]:
+    """Return the benchmark documents by name: a large collection list, a page of subjects and one subject."""
+    return [
+        ("collections x1000", page([collection(i) for i in range(1000)])),
+        ("subjects x100", page([subject(i) for i in range(100)])),
+        ("subject", subject(1)),
+    ]
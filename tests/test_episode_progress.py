@@ -0,0 +1,107 @@
+"""Bulk episode progress updates: range filtering, batching and failures."""
+
+import asyncio
+import json
+from typing import List, Optional
+
+import httpx
+
+from bangumi_mcp.bangumi_client import BangumiClient
+from bangumi_mcp.ratelimit import RateLimiter
+from bangumi_mcp.registry import OutputValidationPolicy, get_registry
+
+
+class FakeAPI:
+    """A subject with episodes sorted 1 to count, whose episode collections can be patched."""
+
+    def __init__(self, count: int = 250):
+        self.episodes = [
+            {"id": 1000 + sort, "subject_id": 12, "type": 0, "sort": sort, "ep": sort, "name": f"Episode {sort}"}
+            for sort in range(1, count + 1)
+        ]
+        # Episode IDs of each PATCH.
+        self.patches: List[List[int]] = []
+        # Responses of the PATCH requests in order, 204 once they run out.
+        self.failures: List[Optional[httpx.Response]] = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v0/me":
+            return httpx.Response(200, json={"id": 1, "username": "alice"})
+        if request.method == "GET" and path == "/v0/episodes":
+            offset = int(request.url.params.get("offset", 0))
+            limit = int(request.url.params.get("limit", 100))
+            data = self.episodes[offset:offset + limit]
+            return httpx.Response(200, json={"total": len(self.episodes), "limit": limit, "offset": offset, "data": data})
+        if request.method == "PATCH" and path == "/v0/users/-/collections/12/episodes":
+            self.patches.append(json.loads(request.content)["episode_id"])
+            failure = self.failures.pop(0) if self.failures else None
+            return failure or httpx.Response(204)
+        return httpx.Response(404, json={"title": "Not Found", "description": "not found"})
+
+
+def make_client(api: FakeAPI) -> BangumiClient:
+    client = BangumiClient(token="token", rate_limiter=RateLimiter(rate=1000, burst=1000))
+    client.client = httpx.AsyncClient(
+        base_url=BangumiClient.BASE_URL,
+        headers=client.client.headers,
+        transport=httpx.MockTransport(api.handle),
+    )
+    return client
+
+
+def progress(api: FakeAPI, **kwargs) -> tuple:
+    async def scenario():
+        client = make_client(api)
+        try:
+            return await client.patch_my_episode_progress(12, 2, **kwargs)
+        finally:
+            await client.close()
+
+    return asyncio.run(scenario())
+
+
+def check_output(result: dict) -> Optional[str]:
+    return get_registry()["patch_my_episode_progress"].check_output(result, OutputValidationPolicy("full"))
+
+
+def test_range_is_updated_in_one_request():
+    api = FakeAPI(250)
+    status_code, summary = progress(api, start=10, end=33)
+    assert status_code == 200
+    assert api.patches == [[1000 + sort for sort in range(10, 34)]]
+    assert (summary["requests"], summary["updated"], summary["failed"]) == (1, 24, 0)
+    assert [episode["sort"] for episode in summary["episodes"]] == list(range(10, 34))
+    assert check_output(summary) is None
+
+
+def test_range_is_split_into_batches():
+    api = FakeAPI(250)
+    status_code, summary = progress(api, end=208)
+    assert status_code == 200
+    assert [len(ids) for ids in api.patches] == [BangumiClient.EPISODE_BATCH_SIZE, 8]
+    assert sum(api.patches, []) == [1000 + sort for sort in range(1, 209)]
+    assert (summary["requests"], summary["updated"], summary["failed"]) == (2, 208, 0)
+
+
+def test_failed_batch_is_reported_per_episode():
+    api = FakeAPI(250)
+    api.failures = [None, httpx.Response(400)]
+    status_code, summary = progress(api, end=208)
+    assert status_code == 200
+    assert (summary["requests"], summary["updated"], summary["failed"]) == (2, 200, 8)
+    failed = [episode for episode in summary["episodes"] if not episode["updated"]]
+    assert [episode["sort"] for episode in failed] == list(range(201, 209))
+    # an error without a body is still described as an ErrorDetail
+    assert failed[0]["error"] == {"title": "Bad Request", "description": "HTTP 400"}
+    assert check_output(summary) is None
+
+
+def test_first_error_is_returned_when_every_batch_fails():
+    api = FakeAPI(250)
+    error = {"title": "Not Found", "description": "subject is not collected"}
+    api.failures = [httpx.Response(404, json=error), httpx.Response(400)]
+    status_code, detail = progress(api, end=208)
+    assert status_code == 404
+    assert detail == error
+    assert len(api.patches) == 2
@@ -0,0 +1,55 @@
+"""Cold start: importing the server stays within budget and leaves the heavy parts unloaded."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Seconds importing bangumi_mcp.mcp_server may take on top of the third-party
+# modules it needs, which vary too much between environments to be budgeted.
+BUDGET = float(os.getenv("BANGUMI_IMPORT_BUDGET", "0.3"))
+
+# Modules of this package that only the first tool listing or call needs. The
+# transports are imported by the entry points, but the mcp and mcp.server
+# package __init__ load them anyway, so they are not checked here.
+DEFERRED = (
+    "bangumi_mcp.tool_list",
+    "bangumi_mcp.tools",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import bangumi_mcp.mcp_server
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+# The same, with the third-party modules the server needs imported beforehand.
+DEPENDENCIES = """
+import httpx, jsonschema, mcp.types, mcp.server
+"""
+
+
+def cold_import(setup: str = "") -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", setup + PROBE],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_within_budget():
+    # best of three, to keep a busy machine from failing the check
+    elapsed = min(cold_import(DEPENDENCIES)["elapsed"] for _ in range(3))
+    assert elapsed < BUDGET, f"importing bangumi_mcp.mcp_server took {elapsed:.3f}s beyond its dependencies, budget {BUDGET}s"
+
+
+def test_import_defers_tool_list():
+    modules = cold_import()["modules"]
+    loaded = [name for name in modules if any(name == d or name.startswith(d + ".") for d in DEFERRED)]
+    assert loaded == []
@@ -0,0 +1,35 @@
+"""Output schemas of tools with a fields argument are relaxed only for trimmed results."""
+
+import pytest
+
+from bangumi_mcp.registry import OutputValidationPolicy, get_registry
+
+ERROR = {"title": "Not Found", "description": "not found"}
+
+
+@pytest.fixture
+def policy():
+    return OutputValidationPolicy("full")
+
+
+def test_untrimmed_result_is_checked_strictly(policy):
+    entry = get_registry()["get_subject_info"]
+    assert entry.check_output({"id": "notint"}, policy) is not None
+    assert entry.check_output({}, policy) is not None
+    assert entry.check_output({"id": 1}, policy) is not None
+    assert entry.check_output(ERROR, policy) is None
+
+
+def test_trimmed_result_is_checked_against_relaxed_schema(policy):
+    entry = get_registry()["get_user_collections"]
+    page = {"total": 1, "limit": 30, "offset": 0, "data": [{"subject_id": 1, "type": 2}]}
+    assert entry.check_output(page, policy, projected=True) is None
+    assert entry.check_output(page, policy) is not None
+    page["data"][0]["type"] = "wish"
+    assert entry.check_output(page, policy, projected=True) is not None
+
+
+def test_error_alternative_stays_strict(policy):
+    schema = get_registry()["get_subject_info"].tool.outputSchema
+    error_detail = next(branch for branch in schema["anyOf"] if "title" in branch.get("properties", {}))
+    assert error_detail["required"] == ["title", "description"]
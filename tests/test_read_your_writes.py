@@ -0,0 +1,214 @@
+"""Collection reads see the client's own writes, from every cache layer."""
+
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import httpx
+import pytest
+
+from bangumi_mcp.bangumi_client import BangumiClient
+from bangumi_mcp.cache import SQLiteCache
+from bangumi_mcp.ratelimit import RateLimiter
+
+
+class FakeAPI:
+    """The collection endpoints of the Bangumi API for one user, Alice."""
+
+    def __init__(self, me: str = "alice"):
+        self.me = me
+        self.collections: Dict[int, int] = {12: 1}
+        # Incremented by every write, and sent as the ETag of collection lists.
+        self.version = 0
+        self.calls: List[str] = []
+        # When set, collection list reads wait for it, to hold them in flight.
+        self.gate: Optional[asyncio.Event] = None
+
+    def items(self, token: str) -> List[dict]:
+        items = [{"subject_id": subject_id, "type": type} for subject_id, type in self.collections.items()]
+        if token == "alice-token":
+            items.append({"subject_id": 99, "type": 2, "private": True})
+        return items
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        self.calls.append(f"{request.method} {path}")
+        parts = path.strip("/").split("/")
+        if path == "/v0/me":
+            return httpx.Response(200, json={"id": 1, "username": self.me})
+        if request.method == "PATCH" and parts[:4] == ["v0", "users", "-", "collections"]:
+            self.collections[int(parts[4])] = json.loads(request.content)["type"]
+            self.version += 1
+            return httpx.Response(204)
+        if request.method == "GET" and parts[:2] == ["v0", "users"] and parts[2].casefold() == "alice":
+            if len(parts) == 4:
+                # answer with the state at the time of the request, however long it is held
+                items = self.items(token)
+                etag = f'"v{self.version}"'
+                if self.gate is not None:
+                    await self.gate.wait()
+                if request.headers.get("If-None-Match") == etag:
+                    return httpx.Response(304, headers={"ETag": etag})
+                page = {"total": len(items), "limit": 30, "offset": 0, "data": items}
+                return httpx.Response(200, headers={"ETag": etag}, json=page)
+            subject_id = int(parts[4])
+            if subject_id in self.collections:
+                return httpx.Response(200, json={"subject_id": subject_id, "type": self.collections[subject_id]})
+        return httpx.Response(404, json={"title": "Not Found", "description": "not found"})
+
+
+def make_client(
+    api: FakeAPI,
+    token: str = "alice-token",
+    disk_cache: Optional[SQLiteCache] = None,
+    cache_ttls: Optional[Dict[str, float]] = None,
+) -> BangumiClient:
+    client = BangumiClient(
+        token=token, disk_cache=disk_cache, cache_ttls=cache_ttls, rate_limiter=RateLimiter(rate=1000, burst=1000)
+    )
+    # replace the transport, keeping the headers the client sends
+    client.client = httpx.AsyncClient(
+        base_url=BangumiClient.BASE_URL,
+        headers=client.client.headers,
+        transport=httpx.MockTransport(api.handle),
+    )
+    return client
+
+
+def types_of(result) -> Dict[int, int]:
+    status_code, page = result
+    assert status_code == 200
+    return {item["subject_id"]: item["type"] for item in page["data"]}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_memory_cache_sees_write():
+    api = FakeAPI()
+
+    async def scenario():
+        client = make_client(api)
+        assert types_of(await client.get_user_collections("alice"))[12] == 1
+        assert (await client.get_user_collection_info("alice", 12))[1]["type"] == 1
+        reads = len(api.calls)
+        await client.get_user_collections("alice")
+        await client.get_user_collection_info("alice", 12)
+        assert len(api.calls) == reads
+
+        await client.patch_my_collection(12, {"type": 2})
+        assert types_of(await client.get_user_collections("alice"))[12] == 2
+        assert (await client.get_user_collection_info("alice", 12))[1]["type"] == 2
+        await client.close()
+
+    run(scenario())
+
+
+def test_username_case_does_not_matter():
+    api = FakeAPI(me="Alice")
+
+    async def scenario():
+        client = make_client(api)
+        assert (await client.get_user_collection_info("alice", 12))[1]["type"] == 1
+        assert (await client.get_user_collection_info("ALICE", 12))[1]["type"] == 1
+        await client.patch_my_collection(12, {"type": 3})
+        assert (await client.get_user_collection_info("alice", 12))[1]["type"] == 3
+        assert (await client.get_user_collection_info("ALICE", 12))[1]["type"] == 3
+        await client.close()
+
+    run(scenario())
+
+
+def test_projected_read_sees_write():
+    api = FakeAPI()
+
+    async def scenario():
+        client = make_client(api)
+        assert types_of(await client.get_user_collections("alice", fields=["subject_id", "type"]))[12] == 1
+        await client.patch_my_collection(12, {"type": 2})
+        assert types_of(await client.get_user_collections("alice", fields=["subject_id", "type"]))[12] == 2
+        await client.close()
+
+    run(scenario())
+
+
+def test_disk_cache_sees_write(tmp_path):
+    api = FakeAPI()
+    db = str(tmp_path / "cache.db")
+
+    async def scenario():
+        reader = make_client(api, disk_cache=SQLiteCache(db))
+        assert types_of(await reader.get_user_collections("alice"))[12] == 1
+        await reader.close()
+
+        # another process sharing the database writes
+        writer = make_client(api, disk_cache=SQLiteCache(db))
+        await writer.patch_my_collection(12, {"type": 2})
+        await writer.close()
+
+        # a fresh process misses in memory and must not get the old copy from disk
+        fresh = make_client(api, disk_cache=SQLiteCache(db))
+        assert types_of(await fresh.get_user_collections("alice"))[12] == 2
+        await fresh.close()
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("revalidated", [False, True])
+def test_read_in_flight_during_write_is_not_cached(tmp_path, revalidated):
+    api = FakeAPI()
+    db = str(tmp_path / "cache.db")
+
+    async def scenario():
+        if revalidated:
+            # leave an expired copy with an ETag on disk, so that the read is a conditional one answered by 304
+            seed = make_client(api, disk_cache=SQLiteCache(db), cache_ttls={"collection": 0.01})
+            await seed.get_user_collections("alice")
+            await seed.close()
+            await asyncio.sleep(0.02)
+        client = make_client(api, disk_cache=SQLiteCache(db))
+        api.gate = asyncio.Event()
+        read = asyncio.ensure_future(client.get_user_collections("alice"))
+        await asyncio.sleep(0.01)
+        # the read has been sent but not answered; the write overtakes it
+        await client.patch_my_collection(12, {"type": 2})
+        api.gate.set()
+        assert types_of(await read)[12] == 1
+        assert client.revalidations.get("collection", {}).get("not_modified", 0) == int(revalidated)
+        api.gate = None
+        assert types_of(await client.get_user_collections("alice"))[12] == 2
+        await client.close()
+
+    run(scenario())
+
+
+def test_disk_cache_is_not_shared_between_tokens(tmp_path):
+    api = FakeAPI()
+    db = str(tmp_path / "cache.db")
+
+    async def scenario():
+        owner = make_client(api, disk_cache=SQLiteCache(db))
+        assert 99 in types_of(await owner.get_user_collections("alice"))
+        await owner.close()
+
+        other = make_client(api, token="bob-token", disk_cache=SQLiteCache(db))
+        assert 99 not in types_of(await other.get_user_collections("alice"))
+        await other.close()
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("fields", [None, ["type"]])
+def test_collection_entry_sees_write(fields):
+    api = FakeAPI()
+
+    async def scenario():
+        client = make_client(api)
+        assert (await client.get_user_collection_info("alice", 12, fields=fields))[1]["type"] == 1
+        await client.patch_my_collection(12, {"type": 4})
+        assert (await client.get_user_collection_info("alice", 12, fields=fields))[1]["type"] == 4
+        await client.close()
+
+    run(scenario())
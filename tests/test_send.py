@@ -0,0 +1,174 @@
+"""Retries, throttling and the circuit breaker of BangumiClient._send."""
+
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+import httpx
+import pytest
+
+from bangumi_mcp.bangumi_client import BangumiClient
+from bangumi_mcp.ratelimit import RateLimiter
+from bangumi_mcp.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class FakeAPI:
+    """Answers each request with the next response of a script, then with 200."""
+
+    def __init__(self, *responses: Callable[[], httpx.Response]):
+        self.responses = list(responses)
+        self.calls: List[str] = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(f"{request.method} {request.url.path}")
+        if self.responses:
+            return self.responses.pop(0)()
+        return httpx.Response(200, json={"id": 1})
+
+
+def status(code: int, **headers: str) -> Callable[[], httpx.Response]:
+    return lambda: httpx.Response(code, headers=headers, json={"title": str(code)})
+
+
+def disconnect() -> httpx.Response:
+    raise httpx.ConnectError("connection refused")
+
+
+def make_client(
+    api: FakeAPI,
+    rate_limiter: Optional[RateLimiter] = None,
+    deadline: float = 5.0,
+) -> BangumiClient:
+    client = BangumiClient(
+        token="token",
+        rate_limiter=rate_limiter or RateLimiter(rate=1000, burst=1000),
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0, deadline=deadline),
+    )
+    client.client = httpx.AsyncClient(
+        base_url=BangumiClient.BASE_URL,
+        headers=client.client.headers,
+        transport=httpx.MockTransport(api.handle),
+    )
+    return client
+
+
+def half_open(client: BangumiClient) -> CircuitBreaker:
+    """Open the breaker of the API host with its recovery timeout already over."""
+    breaker = client._breaker("/v0/subjects/1")
+    breaker.state = CircuitBreaker.OPEN
+    breaker._opened_at = time.monotonic() - breaker.recovery_timeout
+    return breaker
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_transient_failures_are_retried_for_reads():
+    api = FakeAPI(status(503), disconnect)
+
+    async def scenario():
+        client = make_client(api)
+        response = await client._send("GET", "/v0/subjects/1")
+        assert response.status_code == 200
+        assert len(api.calls) == 3
+        await client.close()
+
+    run(scenario())
+
+
+def test_writes_are_not_retried():
+    api = FakeAPI(status(503))
+
+    async def scenario():
+        client = make_client(api)
+        response = await client._send("PATCH", "/v0/users/-/collections/1", json={"type": 2})
+        assert response.status_code == 503
+        assert len(api.calls) == 1
+        await client.close()
+
+    run(scenario())
+
+
+def test_throttled_request_is_sent_again_after_retry_after():
+    api = FakeAPI(status(429, **{"Retry-After": "0"}))
+
+    async def scenario():
+        client = make_client(api)
+        response = await client._send("POST", "/v0/search/subjects", json={})
+        assert response.status_code == 200
+        assert len(api.calls) == 2
+        assert client.rate_limiter.throttled == 1
+        await client.close()
+
+    run(scenario())
+
+
+def test_retry_after_beyond_deadline_is_returned_at_once():
+    api = FakeAPI(status(429, **{"Retry-After": "5"}))
+
+    async def scenario():
+        client = make_client(api, deadline=1.0)
+        started = time.monotonic()
+        response = await client._send("GET", "/v0/subjects/1")
+        assert response.status_code == 429
+        assert time.monotonic() - started < 0.5
+        assert client._breaker("/v0/subjects/1").failures == 0
+        await client.close()
+
+    run(scenario())
+
+
+def test_breaker_opens_and_recovers():
+    api = FakeAPI(status(503), status(503), status(503))
+
+    async def scenario():
+        client = make_client(api)
+        client.retry_policy.max_attempts = 1
+        client.breaker_threshold = 2
+        breaker = client._breaker("/v0/subjects/1")
+        for _ in range(2):
+            assert (await client._send("GET", "/v0/subjects/1")).status_code == 503
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            await client._send("GET", "/v0/subjects/1")
+        assert len(api.calls) == 2
+
+        # the probe fails and opens the circuit again
+        half_open(client)
+        assert (await client._send("GET", "/v0/subjects/1")).status_code == 503
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # the next probe succeeds and closes it
+        half_open(client)
+        assert (await client._send("GET", "/v0/subjects/1")).status_code == 200
+        assert breaker.state == CircuitBreaker.CLOSED
+        await client.close()
+
+    run(scenario())
+
+
+def test_probe_cancelled_while_queued_releases_its_slot():
+    api = FakeAPI()
+
+    async def scenario():
+        limiter = RateLimiter(rate=1, burst=1)
+        await limiter.acquire()
+        client = make_client(api, rate_limiter=limiter)
+        breaker = half_open(client)
+
+        probe = asyncio.ensure_future(client._send("GET", "/v0/subjects/1"))
+        await asyncio.sleep(0.01)
+        # the probe holds the slot and waits for a token
+        assert breaker.state == CircuitBreaker.HALF_OPEN and breaker._probing
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert not breaker._probing
+
+        response = await client._send("GET", "/v0/subjects/1")
+        assert response.status_code == 200
+        assert breaker.state == CircuitBreaker.CLOSED
+        await client.close()
+
+    run(scenario())